@@ -1,5 +1,7 @@
 import os
+import csv
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.express as px
@@ -7,6 +9,14 @@ from neo4jdb.Dart import DartExecution
 from neo4jdb.Bus import BusExecution
 from neo4jdb.Luas import LuasExecution
 from utils.visualization import TransportVisualization
+from utils.model import compact_frame
+from utils.aggregates import AggregateStore
+from utils.facilities import FACILITY_BITS, FacilityIndex
+from utils.search import NameIndex
+from utils.network_view import GROUPINGS, LayoutCache, build_network, level_of_detail, to_pyvis_html
+from neo4jdb.watch import read_cache_version
+from neo4jdb.warmup import PathCache, QueryLog, cache_signature, load_warm_cache, read_readiness, shortest_path
+from neo4jdb.analytics import CATEGORY_MEMBERSHIP, fetch_ranked_page, load_routing_index, routing_index_path
 from neo4j import GraphDatabase
 
 # Dynamically locate the dataset paths
@@ -22,12 +32,53 @@ bus_executor = BusExecution(URI, USER, PASSWORD)
 dart_executor = DartExecution(URI, USER, PASSWORD)
 luas_executor = LuasExecution(URI, USER, PASSWORD)
 
-bus_data = pd.read_csv(bus_data_path, encoding="latin1")
-dart_data = pd.read_csv(dart_data_path, encoding="latin1")
-luas_data = pd.read_csv(luas_data_path, encoding="latin1")
+# Repetitive text columns (lines, zones, operators, Yes/No flags) are stored as categoricals
+bus_data = compact_frame(pd.read_csv(bus_data_path, encoding="latin1"))
+dart_data = compact_frame(pd.read_csv(dart_data_path, encoding="latin1"))
+luas_data = compact_frame(pd.read_csv(luas_data_path, encoding="latin1"))
+
+# Chart summaries are precomputed once per dataset version instead of aggregated on every view
+aggregates = AggregateStore(
+    os.path.join(base_path, "data", "aggregates.json"), dart_data_path, luas_data_path, bus_data_path
+).load()
+
+# Routing indexes are loaded once per server process and reloaded when the pipeline rebuilds them
+@st.cache_resource
+def cached_routing_index(category, modified):
+    return load_routing_index(category)
+
+for category, executor in (("DART", dart_executor), ("LUAS", luas_executor)):
+    if os.path.exists(routing_index_path(category)):
+        executor.routing_index = cached_routing_index(category, os.path.getmtime(routing_index_path(category)))
+
+# Bumped by `cli.py watch` after a dataset update; cached resources keyed on it reload
+cache_version = read_cache_version()
+
+# Station, stop and landmark names resolve to the ids the graph is keyed by
+@st.cache_resource
+def station_name_index(version):
+    rows = []
+    for path in (dart_data_path, luas_data_path, bus_data_path):
+        with open(path, mode="r", encoding="latin1") as file:
+            rows.append(list(csv.DictReader(file)))
+    return NameIndex.from_rows(*rows)
+
+name_index = station_name_index(cache_version)
+
+# Ranked pages and frequent shortest paths precomputed by the `cli.py serve` warm-up.
+# Shared by all sessions: a path computed once is served from memory after, and the
+# least recently used paths are dropped so the cache stays at the warm-up size.
+@st.cache_resource
+def warm_results(signature):
+    cache = load_warm_cache(list(signature))
+    cache["paths"] = PathCache(cache["paths"])
+    return cache
+
+warm_cache = warm_results(tuple(cache_signature()))
+query_log = QueryLog()
 
 # Initialize the visualization class
-visualization = TransportVisualization(bus_data, dart_data, luas_data)
+visualization = TransportVisualization(bus_data, dart_data, luas_data, aggregates)
 
 # Centrality Visualization Class
 class CentralityVisualizationApp:
@@ -42,24 +93,78 @@ class CentralityVisualizationApp:
             result = session.run(query, parameters)
             return [record for record in result]
 
-    def fetch_degree_centrality(self, category):
+    def fetch_ranked_page(self, category, prop, limit, cursor=None):
+        # `degree` and `rank` are kept current by the pipeline's incremental analytics
+        return fetch_ranked_page(self, category, prop, limit, cursor)
+
+    def fetch_path_centrality(self, category):
         query = f"""
-        MATCH (s:Station)-[r:CONNECTED_BY_ROUTE]-(t:Station)
-        WHERE EXISTS {{ MATCH (category:Category {{name: '{category}'}})-[:HAS_STATION]->(s) }}
-        RETURN s.name AS station, COUNT(r) AS DegreeCentrality
-        ORDER BY DegreeCentrality DESC
+        MATCH (:Category {{name: $category}})-[:{CATEGORY_MEMBERSHIP[category]}]->(n)
+        WHERE n.betweenness IS NOT NULL
+        RETURN n.name AS name, n.betweenness AS betweenness, n.closeness AS closeness
+        ORDER BY betweenness DESC
         """
-        return self.execute_query(query)
+        return self.execute_query(query, {"category": category})
 
 centrality_app = CentralityVisualizationApp(URI, USER, PASSWORD)
 
+
+def show_ranked_page(category, prop, column, page_size):
+    """
+    Render one keyset page of nodes ranked by `prop`, with Previous/Next controls.
+    The cursors of the pages already visited are kept in the session state.
+    """
+    key = f"{category}_{prop}_pages"
+    pages = st.session_state.setdefault(key, [None])
+    if pages[-1] is None and (category, prop, page_size) in warm_cache["pages"]:
+        rows, next_cursor = warm_cache["pages"][(category, prop, page_size)]
+    else:
+        rows, next_cursor = centrality_app.fetch_ranked_page(category, prop, page_size, pages[-1])
+
+    df = pd.DataFrame(rows, columns=["id", "name", "score"]).drop(columns="id")
+    df.columns = ["Name", column]
+    st.caption(f"Page {len(pages)}")
+    st.dataframe(df)
+
+    previous_col, next_col = st.columns(2)
+    if previous_col.button("Previous", key=f"{key}_previous", disabled=len(pages) == 1):
+        pages.pop()
+        st.rerun()
+    if next_col.button("Next", key=f"{key}_next", disabled=next_cursor is None):
+        pages.append(next_cursor)
+        st.rerun()
+    return df
+
+
+def pick_station(label, network):
+    """
+    Free-text station entry with ranked fuzzy suggestions. Returns the canonical id of
+    the chosen match, or None so unmatched names never reach the database.
+    """
+    query = st.text_input(f"Enter {label} Station")
+    if not query:
+        return None
+    matches = name_index.search(query, network, limit=8)
+    if not matches:
+        st.warning(f"No {network} station or stop matches '{query}'.")
+        return None
+    choice = st.selectbox(
+        f"{label} station", matches,
+        format_func=lambda match: match["label"] if match["label"] == match["id"] else f"{match['label']} ({match['id']})",
+        key=f"{label}_{network}_match",
+    )
+    return choice["id"]
+
+
 # Streamlit App UI
 st.title("Irish Transport System - Data Visualization")
 
 # Sidebar Options
 st.sidebar.header("Transport Selection")
+if not read_readiness().get("ready"):
+    st.sidebar.info("Caches are still warming up; the first queries may be slower.")
 transport_option = st.sidebar.selectbox("Select a Transport Type", ["DART", "LUAS", "BUS"])
-analysis_option = st.sidebar.selectbox("Select Analysis Type", ["Degree Centrality", "Shortest Path", "PageRank"])
+analysis_option = st.sidebar.selectbox("Select Analysis Type", ["Degree Centrality", "Betweenness & Closeness", "Shortest Path", "PageRank", "Communities", "Network View"])
 
 # Display graphs for the selected transport type
 if transport_option == "BUS":
@@ -75,6 +180,12 @@ elif transport_option == "DART":
     visualization.plot_routes_serviced_per_station()
     visualization.plot_treemap_facilities()
 
+    st.subheader("Find DART Stations by Facility")
+    required = st.multiselect("Required facilities", list(FACILITY_BITS), default=["weekend_working", "atm"])
+    ranking = FacilityIndex.from_frame(dart_data).rank(centrality=aggregates["degree"]["DART"], required=required, top=20)
+    st.write(f"{len(ranking)} matching stations, ranked by facilities and degree centrality")
+    st.dataframe(ranking)
+
 elif transport_option == "LUAS":
     st.subheader("LUAS Dataset Visualizations")
     visualization.plot_footfall_by_line()
@@ -85,89 +196,178 @@ elif transport_option == "LUAS":
     visualization.plot_station_zone_relationship()
     # visualization.plot_accessibility_sunburst()
 
+    st.subheader("Nearest LUAS Stations")
+    latitude = st.number_input("Latitude", value=53.349, format="%.5f")
+    longitude = st.number_input("Longitude", value=-6.260, format="%.5f")
+    radius_km = st.slider("Radius (km)", 0.5, 10.0, 1.0)
+    luas_executor.build_spatial_index(luas_data_path)
+    nearby = luas_executor.find_stations_within(latitude, longitude, radius_km)
+    if not nearby:
+        nearby = luas_executor.find_nearest_stations(latitude, longitude, 3)
+    st.dataframe(pd.DataFrame(nearby, columns=["Station", "Distance (km)"]))
+
 results = None  # Initialize results to ensure it's always defined
 
 # Degree Centrality Analysis
 if analysis_option == "Degree Centrality":
     st.subheader(f"Degree Centrality for {transport_option}")
 
-    # Fetch centrality data using the new class
-    centrality_data = centrality_app.fetch_degree_centrality(transport_option)
+    page_size = st.selectbox("Rows per page", [25, 50, 100], key="degree_page_size")
+    df = show_ranked_page(transport_option, "degree", "Degree Centrality", page_size)
+    if df.empty and st.session_state[f"{transport_option}_degree_pages"] == [None]:
+        # Fall back to the local aggregate store when the graph has not been analysed yet
+        df = pd.DataFrame(list(aggregates["degree"][transport_option].items())[:page_size], columns=["Name", "Degree Centrality"])
+        st.dataframe(df)
 
-    if centrality_data:
+    if not df.empty:
         try:
-            # Convert results to DataFrame
-            df = pd.DataFrame(centrality_data)
-            df.columns = ["Station", "Degree Centrality"]
+            fig = px.bar(df, x="Name", y="Degree Centrality", title=f"{transport_option} Station Degree Centrality", labels={"Degree Centrality": "Degree Centrality"})
+            st.plotly_chart(fig)
 
-            # Display data and plot bar chart
-            st.dataframe(df)
-            fig = px.bar(df, x="Station", y="Degree Centrality", title=f"{transport_option} Station Degree Centrality", labels={"Degree Centrality": "Degree Centrality"})
+            distribution = aggregates["degree_distribution"][transport_option]
+            fig = px.bar(x=list(distribution), y=list(distribution.values()), title=f"{transport_option} Degree Distribution", labels={"x": "Degree", "y": "Count"})
             st.plotly_chart(fig)
         except Exception as e:
             st.error(f"An error occurred while processing the results: {e}")
     else:
         st.warning("No results were returned from the centrality calculation.")
 
+# Betweenness and Closeness Analysis
+elif analysis_option == "Betweenness & Closeness":
+    st.subheader(f"Betweenness & Closeness Centrality for {transport_option}")
+
+    centrality_data = centrality_app.fetch_path_centrality(transport_option)
+
+    if centrality_data:
+        df = pd.DataFrame(centrality_data, columns=["Name", "Betweenness", "Closeness"])
+        st.dataframe(df)
+        fig = px.bar(df.head(20), x="Name", y="Betweenness", title=f"{transport_option} Bottlenecks by Betweenness Centrality")
+        st.plotly_chart(fig)
+    else:
+        st.warning("No betweenness scores found. Run calculate_path_centrality for this network first.")
+
 # Shortest Path Analysis
 elif analysis_option == "Shortest Path":
     st.subheader(f"Shortest Path for {transport_option}")
 
-    start_station = st.text_input("Enter Start Station")
-    end_station = st.text_input("Enter End Station")
+    start_station = pick_station("Start", transport_option)
+    end_station = pick_station("End", transport_option)
 
-    if st.button("Calculate Shortest Path"):
-     try:
+    # Component membership comes from the reachability index built at import time
+    if start_station and end_station:
         if transport_option == "BUS":
-            results = bus_executor.find_shortest_path(start_station, end_station)
+            reachable = bus_executor.is_reachable(start_station, end_station)
+            index = bus_executor.reachability
+            keys = (start_station, end_station)
         elif transport_option == "DART":
-             results = dart_executor.calculate_shortest_path(start_station, end_station)
-        elif transport_option == "LUAS":
-             results = luas_executor.calculate_shortest_path(start_station, end_station)
+            reachable = dart_executor.is_reachable(start_station, end_station)
+            index = dart_executor.reachability
+            keys = (start_station, end_station)
+        else:
+            reachable = luas_executor.is_reachable(start_station, end_station, interchanges=True)
+            index = luas_executor.reachability.get("LUAS_GEO")
+            keys = (start_station, end_station)
+        if index is not None:
+            components = [index.component_of(key) for key in keys]
+            st.caption(f"Components: {start_station} -> {components[0]}, {end_station} -> {components[1]}")
+        if not reachable:
+            st.warning(f"{start_station} and {end_station} are not connected in the {transport_option} network.")
+
+    if st.button("Calculate Shortest Path", disabled=not (start_station and end_station)):
+     try:
+        # Logged pairs are what the next warm-up precomputes
+        query_log.record(transport_option, start_station, end_station)
+        key = (transport_option, start_station, end_station)
+        results = warm_cache["paths"].get(key)
+        if results is None:
+            if transport_option == "LUAS":
+                luas_executor.build_spatial_index(luas_data_path)
+            results = shortest_path(
+                {"BUS": bus_executor, "DART": dart_executor, "LUAS": luas_executor},
+                transport_option, start_station, end_station,
+            )
+            warm_cache["paths"].put(key, results)
 
         if results:
             for record in results:
                     st.write(f"Path: {' -> '.join(record['path'])}")
-                    st.write(f"Total Distance: {record['totalDistance']} km")
+                    if "totalDuration" in record:
+                        # Each route is listed once, in the order it is boarded
+                        st.write(f"Routes: {' then '.join(dict.fromkeys(record['routes']))}")
+                        st.write(f"Total Duration: {record['totalDuration']} mins")
+                    else:
+                        st.write(f"Total Distance: {record['totalDistance']} km")
             else:
                 st.warning("Shortest Path Calculated")
      except Exception as e:
             st.error(f"An error occurred while calculating the shortest path: {e}")
 
+    if transport_option in ("LUAS", "BUS"):
+        departure_time = st.text_input("Departure Time", value="8:00 am")
+        if st.button("Find Earliest Arrival", disabled=not (start_station and end_station)):
+            if transport_option == "LUAS":
+                luas_executor.build_timetable(luas_data_path)
+                journey = luas_executor.calculate_earliest_arrival(start_station, end_station, departure_time)
+            else:
+                bus_executor.build_timetable(bus_data_path)
+                journey = bus_executor.calculate_earliest_arrival(start_station, end_station, departure_time)
+
+            if journey:
+                st.write(f"Depart {journey['departure']}, arrive {journey['arrival']} ({journey['duration']} mins)")
+                for leg in journey["legs"]:
+                    st.write(f"{leg['depart']} {leg['route']}: {' -> '.join(leg['stops'])} (arrive {leg['arrive']})")
+            else:
+                st.warning("No service found for this journey at the selected time.")
+
 # PageRank Analysis
 elif analysis_option == "PageRank":
     st.subheader(f"PageRank for {transport_option}")
 
-    if transport_option == "BUS":
-        node_label = "Route"
-        relationship_type = "CONNECTED_TO"
-        bus_executor.calculate_pagerank(node_label, relationship_type)
-    elif transport_option == "DART":
-        node_label = "Station"
-        relationship_type = "CONNECTED_BY_ROUTE"
-        dart_executor.calculate_pagerank(node_label, relationship_type)
-    elif transport_option == "LUAS":
-        node_label = "Station"
-        relationship_type = "CONNECTED_BY_LINE"
-        # luas_executor.calculate_pagerank(node_label, relationship_type)
-
-    results_query = f"""
-    MATCH (n:{node_label})
-    RETURN n.name AS Name, n.rank AS PageRank
-    ORDER BY PageRank DESC
-    """
-    if transport_option == "BUS":
-        results = bus_executor.execute_query(results_query)
-    elif transport_option == "DART":
-        results = dart_executor.execute_query(results_query)
-    elif transport_option == "LUAS":
-        results = luas_executor.execute_query(results_query)
-
-    if results:
-        df = pd.DataFrame(results)
-        st.dataframe(df)
+    # Ranks are kept current by the pipeline's incremental PageRank; the view only reads them
+    page_size = st.selectbox("Rows per page", [25, 50, 100], key="rank_page_size")
+    df = show_ranked_page(transport_option, "rank", "PageRank", page_size)
+    if not df.empty:
         st.bar_chart(df.set_index("Name")[["PageRank"]])
 
+# Community Analysis
+elif analysis_option == "Communities":
+    st.subheader(f"Route Communities for {transport_option}")
+
+    if transport_option == "BUS":
+        communities = bus_executor.fetch_community_summary()
+        if communities:
+            df = pd.DataFrame(communities, columns=["Community", "Routes", "Route Numbers", "Areas Served"])
+            st.bar_chart(df.set_index("Community")[["Routes"]])
+            for record in communities:
+                with st.expander(f"Community {record['community']} ({record['routeCount']} routes)"):
+                    st.write(f"Routes: {', '.join(record['routeNumbers'])}")
+                    st.write(f"Areas Served: {', '.join(record['areas'])}")
+        else:
+            st.warning("No communities found. Run detect_communities for BUS first.")
+    else:
+        st.info("Community detection is available for the BUS route graph.")
+
+# Network View
+elif analysis_option == "Network View":
+    st.subheader(f"{transport_option} Network")
+
+    max_nodes = st.slider("Maximum visible nodes", 10, 500, 150)
+    metric = st.selectbox("Keep the most central nodes by", ["degree", "pagerank"])
+    group_by = st.selectbox("Cluster the remaining nodes by", GROUPINGS[transport_option] + ["(hide them)"])
+    group_by = None if group_by == "(hide them)" else group_by
+
+    nodes, edges = build_network(
+        transport_option,
+        dart_data.astype(str).to_dict("records") if transport_option == "DART" else (),
+        luas_data.astype(str).to_dict("records") if transport_option == "LUAS" else (),
+        bus_data.astype(str).to_dict("records") if transport_option == "BUS" else (),
+    )
+    # Positions are precomputed by the layouts pipeline stage; a cache miss lays the graph out once
+    positions = LayoutCache(os.path.join(base_path, "data", "layouts")).get(transport_option, nodes, edges)
+    visible, bundled = level_of_detail(nodes, edges, positions, max_nodes, metric, group_by)
+    st.caption(f"Showing {len(visible)} of {len(nodes)} nodes and {len(bundled)} bundled edges")
+    components.html(to_pyvis_html(visible, bundled, group_by), height=680)
+
 # Close Neo4j connections
 bus_executor.close()
 dart_executor.close()
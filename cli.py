@@ -0,0 +1,299 @@
+# cli.py
+"""
+Headless command line entry point for the Irish transport graph.
+
+    python cli.py import  [--force]                 build nodes and relationships
+    python cli.py analyze [--network BUS] [--force] run analytics (imports first if needed)
+    python cli.py serve   [--port 8501]             warm caches, then launch the Streamlit dashboard
+    python cli.py ready                             exit 0 once the served dashboard is warmed up
+    python cli.py bench   [--repeat 5]              time cold start and core queries
+    python cli.py export  [--output DIR]            write neo4j-admin import CSVs
+    python cli.py loadtest [--sessions 20] [--local] simulate concurrent dashboard users
+    python cli.py watch   [--interval 2]            re-import datasets as they change
+
+Heavy modules (streamlit, pandas, matplotlib, seaborn) are only imported by the
+subcommands that need them.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from config import get_neo4j_config
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_STAGES = ["dart_import", "luas_relationships", "bus_relationships"]
+ANALYTICS_STAGES = {
+    "DART": ["dart_analytics"],
+    "LUAS": ["luas_analytics"],
+    "BUS": ["bus_analytics"],
+}
+# Stages that bring the dashboard up to date after one dataset changes; their unchanged
+# dependencies (other networks) are skipped by the pipeline fingerprints
+WATCH_STAGES = {
+    "DART_Dataset.csv": ["dart_analytics", "aggregates", "layouts", "pagerank"],
+    "LUAS_Dataset.csv": ["luas_analytics", "aggregates", "layouts", "pagerank"],
+    "BUS_Dataset.csv": ["bus_analytics", "aggregates", "layouts", "pagerank"],
+}
+
+
+def _credentials(args):
+    config = get_neo4j_config()
+    return (
+        args.uri or config["uri"],
+        args.user or config["username"],
+        args.password or config["password"],
+    )
+
+
+def _run_pipeline(args, stages):
+    from neo4jdb.queries import build_pipeline
+
+    runner, executors = build_pipeline(*_credentials(args), max_workers=args.workers)
+    try:
+        outcome = runner.run(only=stages, force=args.force)
+        runner.report()
+    finally:
+        for executor in executors:
+            executor.close()
+    return 1 if any(status in ("failed", "blocked") for status in outcome.values()) else 0
+
+
+def command_import(args):
+    return _run_pipeline(args, IMPORT_STAGES)
+
+
+def command_analyze(args):
+    if args.network:
+        stages = ANALYTICS_STAGES[args.network]
+    else:
+        stages = ["snapshot"]
+    return _run_pipeline(args, stages)
+
+
+def _warm_up(credentials, top_pairs):
+    from neo4jdb.Dart import DartExecution
+    from neo4jdb.Luas import LuasExecution
+    from neo4jdb.Bus import BusExecution
+    from neo4jdb.warmup import warm_up
+
+    executors = {"DART": DartExecution(*credentials), "LUAS": LuasExecution(*credentials), "BUS": BusExecution(*credentials)}
+    try:
+        state = warm_up(executors, os.path.join(PROJECT_ROOT, "data", "LUAS_Dataset.csv"), top_pairs=top_pairs)
+    finally:
+        for executor in executors.values():
+            executor.close()
+    for name, seconds in state["timings"].items():
+        print(f"[warm-up] {name:<40} {seconds * 1000:>10.1f} ms")
+
+
+def command_serve(args):
+    from neo4jdb.queries import Neo4jExecution
+    from neo4jdb.warmup import write_readiness
+
+    credentials = _credentials(args)
+    neo4j_exec = Neo4jExecution(*credentials)
+    try:
+        neo4j_exec.iconnect()
+    finally:
+        neo4j_exec.close()
+    # The dashboard only starts accepting sessions once the caches are warm
+    if args.no_warmup:
+        write_readiness(True, phase="warm-up skipped")
+    else:
+        _warm_up(credentials, args.top_pairs)
+    try:
+        result = neo4j_exec.run_streamlit_app(headless=True, port=args.port, wait=True)
+    finally:
+        write_readiness(False, phase="stopped")
+    return result if isinstance(result, int) else 1
+
+
+def command_ready(args):
+    from neo4jdb.warmup import read_readiness
+
+    state = read_readiness()
+    print("ready" if state.get("ready") else f"not ready ({state.get('phase', 'not started')})")
+    return 0 if state.get("ready") else 1
+
+
+def _timed(action, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def command_bench(args):
+    start = time.perf_counter()
+    from neo4jdb.Dart import DartExecution
+    from neo4jdb.Luas import LuasExecution
+    from neo4jdb.Bus import BusExecution
+    print(f"{'module import':<32} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+
+    credentials = _credentials(args)
+    dart, luas, bus = DartExecution(*credentials), LuasExecution(*credentials), BusExecution(*credentials)
+    benchmarks = [
+        ("DART degree centrality", dart.calculate_degree_centrality),
+        ("LUAS degree centrality", luas.calculate_degree_centrality),
+        ("DART shortest path", lambda: dart.calculate_shortest_path("Adamstown", "Ballybrophy")),
+        ("LUAS shortest path", lambda: luas.calculate_shortest_path("Tallaght", "Belgard")),
+        ("BUS route graph read", lambda: bus.execute_query("MATCH (r:Route)-[c:CONNECTED_TO]->() RETURN count(c)")),
+    ]
+    try:
+        for name, action in benchmarks:
+            timings = _timed(action, args.repeat)
+            print(f"{name:<32} {statistics.median(timings):>10.1f} ms (min {min(timings):.1f}, n={len(timings)})")
+    finally:
+        for executor in (dart, luas, bus):
+            executor.close()
+    return 0
+
+
+def command_export(args):
+    from neo4jdb.bulk_export import AdminCsvExporter
+
+    data_dir = os.path.join(PROJECT_ROOT, "data")
+    exporter = AdminCsvExporter(
+        os.path.join(data_dir, "DART_Dataset.csv"),
+        os.path.join(data_dir, "LUAS_Dataset.csv"),
+        os.path.join(data_dir, "BUS_Dataset.csv"),
+    )
+    for name, count in exporter.export(args.output).items():
+        print(f"{name:<24} {count:>8} rows")
+    print("Stop Neo4j, then run:")
+    print(exporter.import_command(args.output, args.database))
+    return 0
+
+
+def command_loadtest(args):
+    from neo4jdb.loadtest import LoadTest, Neo4jTarget, local_target, station_names
+
+    data_dir = os.path.join(PROJECT_ROOT, "data")
+    dart_csv = os.path.join(data_dir, "DART_Dataset.csv")
+    luas_csv = os.path.join(data_dir, "LUAS_Dataset.csv")
+    bus_csv = os.path.join(data_dir, "BUS_Dataset.csv")
+    if args.local:
+        target = local_target(dart_csv, luas_csv, bus_csv, os.path.join(data_dir, "aggregates.json"))
+    else:
+        target = Neo4jTarget(*_credentials(args), luas_csv, pool_size=args.pool_size)
+    try:
+        test = LoadTest(
+            target, station_names(dart_csv, luas_csv, bus_csv), sessions=args.sessions, duration=args.duration,
+            pool_size=args.pool_size, think_ms=args.think_ms, page_size=args.page_size, seed=args.seed,
+        )
+        report = test.run()
+    finally:
+        target.close()
+    LoadTest.print_report(report)
+    if args.json:
+        import json
+
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    return 1 if report["overall"]["errors"] else 0
+
+
+def command_watch(args):
+    from neo4jdb.queries import build_pipeline
+    from neo4jdb.watch import DatasetWatcher, bump_cache_version
+
+    data_dir = os.path.join(PROJECT_ROOT, "data")
+    runner, executors = build_pipeline(*_credentials(args), max_workers=args.workers)
+
+    def refresh(changed):
+        stages = sorted({stage for path in changed for stage in WATCH_STAGES[os.path.basename(path)]})
+        print(f"[watch] {', '.join(os.path.basename(path) for path in changed)}: running {', '.join(stages)}")
+        start = time.perf_counter()
+        outcome = runner.run(only=stages)
+        if any(status in ("failed", "blocked") for status in outcome.values()):
+            print("[watch] update failed; the dashboard keeps its current data")
+            return
+        if "ran" not in outcome.values():
+            print("[watch] already up to date")
+            return
+        version = bump_cache_version(changed)
+        print(f"[watch] live in {time.perf_counter() - start:.1f}s (cache version {version})")
+
+    watcher = DatasetWatcher(
+        [os.path.join(data_dir, name) for name in WATCH_STAGES], interval=args.interval, settle=args.settle
+    )
+    try:
+        # Catch up on edits made while nothing was watching; unchanged stages are skipped
+        refresh(watcher.paths)
+        print(f"[watch] watching {data_dir} every {args.interval:g}s (Ctrl+C to stop)")
+        watcher.watch(refresh)
+    except KeyboardInterrupt:
+        print("[watch] stopped")
+    finally:
+        for executor in executors:
+            executor.close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Irish transport graph tools")
+    parser.add_argument("--uri", help="Neo4j URI (defaults to config.py)")
+    parser.add_argument("--user", help="Neo4j username (defaults to config.py)")
+    parser.add_argument("--password", help="Neo4j password (defaults to config.py)")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subcommands.add_parser("import", help="import datasets and build relationships")
+    import_parser.add_argument("--force", action="store_true", help="rerun stages even if inputs are unchanged")
+    import_parser.add_argument("--workers", type=int, default=3, help="parallel pipeline stages")
+    import_parser.set_defaults(handler=command_import)
+
+    analyze_parser = subcommands.add_parser("analyze", help="run centrality, paths, PageRank and snapshot")
+    analyze_parser.add_argument("--network", choices=sorted(ANALYTICS_STAGES), help="limit to one network")
+    analyze_parser.add_argument("--force", action="store_true", help="rerun stages even if inputs are unchanged")
+    analyze_parser.add_argument("--workers", type=int, default=3, help="parallel pipeline stages")
+    analyze_parser.set_defaults(handler=command_analyze)
+
+    serve_parser = subcommands.add_parser("serve", help="launch the dashboard headless")
+    serve_parser.add_argument("--port", type=int, default=8501)
+    serve_parser.add_argument("--top-pairs", type=int, default=10, help="most frequent logged paths to precompute per network")
+    serve_parser.add_argument("--no-warmup", action="store_true", help="start without warming caches")
+    serve_parser.set_defaults(handler=command_serve)
+
+    ready_parser = subcommands.add_parser("ready", help="report whether the dashboard finished warming up")
+    ready_parser.set_defaults(handler=command_ready)
+
+    bench_parser = subcommands.add_parser("bench", help="time module import and core queries")
+    bench_parser.add_argument("--repeat", type=int, default=5)
+    bench_parser.set_defaults(handler=command_bench)
+
+    export_parser = subcommands.add_parser("export", help="write CSVs for neo4j-admin database import")
+    export_parser.add_argument("--output", default=os.path.join(PROJECT_ROOT, "data", "admin_import"))
+    export_parser.add_argument("--database", default="neo4j")
+    export_parser.set_defaults(handler=command_export)
+
+    loadtest_parser = subcommands.add_parser("loadtest", help="simulate concurrent dashboard sessions")
+    loadtest_parser.add_argument("--sessions", type=int, default=20, help="concurrent simulated users")
+    loadtest_parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    loadtest_parser.add_argument("--pool-size", type=int, default=10, help="connection pool size")
+    loadtest_parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause between requests")
+    loadtest_parser.add_argument("--page-size", type=int, default=25)
+    loadtest_parser.add_argument("--seed", type=int)
+    loadtest_parser.add_argument("--local", action="store_true", help="use the in-process stand-in instead of Neo4j")
+    loadtest_parser.add_argument("--json", help="also write the report to this file")
+    loadtest_parser.set_defaults(handler=command_loadtest)
+
+    watch_parser = subcommands.add_parser("watch", help="re-run the affected stages when a dataset changes")
+    watch_parser.add_argument("--interval", type=float, default=2.0, help="seconds between checks")
+    watch_parser.add_argument("--settle", type=float, default=1.0, help="seconds a file must be unchanged")
+    watch_parser.add_argument("--workers", type=int, default=3, help="parallel pipeline stages")
+    watch_parser.set_defaults(handler=command_watch)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,98 @@
 from neo4j import GraphDatabase
+from neo4jdb.resilient import ResilientWriter, rows_fingerprint
+from neo4jdb.ingest import read_rows, validate_rows, batch_stream, prefetch, csv_fingerprint
+from neo4jdb.analytics import (
+    run_path_centrality, run_community_detection, build_reachability_index, load_reachability_index,
+)
+from utils.components import ReachabilityIndex
+from utils.timetable import TimetableModel, parse_clock
+from utils.network_rows import bus_route_stops, bus_stop_edges, canonical_route_edges
+from utils.routing import bidirectional_dijkstra
+from utils.model import Route, intern_list
 import os
 import csv
 
+
+def bus_route_properties(row):
+    """Map a BUS CSV row to the Route node properties."""
+    return {
+        "Route Number": row["Route Number"],
+        "From": row["From"],
+        "To": row["To"],
+        "Route Type": row["Route Type"],
+        "Frequency": row["Frequency"],
+        "Duration": row["Duration"],
+        "Key Landmarks": row["Key Landmarks"],
+        "Peak Hours": row["Peak Hours"],
+        "Operator": row["Operator"],
+        "Primary Areas Served": row["Primary Areas Served"],
+    }
+
+
+def bus_row_stream(rows):
+    """
+    Single pass over BUS rows: yields ("route", properties) for every row, ("stop", stop)
+    for each stop not seen before and ("edge", edge) for its stop-to-stop segments.
+    """
+    seen = set()
+    for row in rows:
+        yield "route", bus_route_properties(row)
+        for stop in bus_route_stops(row):
+            if stop not in seen:
+                seen.add(stop)
+                yield "stop", {"name": stop}
+        for edge in bus_stop_edges(row):
+            yield "edge", edge
+
+
+def stop_graph(edges):
+    """
+    Undirected stop adjacency {stop: {stop: minutes}} keeping the fastest route of each
+    pair, and {(stop, stop): route} naming it in both directions.
+    """
+    adjacency, routes = {}, {}
+    for edge in edges:
+        source, target, duration = edge["source"], edge["target"], edge["duration"]
+        adjacency.setdefault(source, {})
+        adjacency.setdefault(target, {})
+        if source == target or duration >= adjacency[source].get(target, float("inf")):
+            continue
+        adjacency[source][target] = adjacency[target][source] = duration
+        routes[(source, target)] = routes[(target, source)] = edge["route"]
+    return adjacency, routes
+
+
+ROUTE_QUERY = """
+MATCH (category:Category {name: 'BUS'})
+UNWIND $rows AS props
+MERGE (category)-[:HAS_ROUTE]->(route:Route {`Route Number`: props.`Route Number`})
+SET route += props
+"""
+STOP_QUERY = """
+MATCH (category:Category {name: 'BUS'})
+UNWIND $rows AS props
+MERGE (category)-[:HAS_STOP]->(:Stop {name: props.name})
+"""
+CONNECTS_QUERY = """
+MATCH (category:Category {name: 'BUS'})
+UNWIND $rows AS edge
+MATCH (category)-[:HAS_STOP]->(stop1:Stop {name: edge.source}),
+      (category)-[:HAS_STOP]->(stop2:Stop {name: edge.target})
+MERGE (stop1)-[r:CONNECTS {route: edge.route}]->(stop2)
+SET r.duration_mins = edge.duration
+"""
+
+
 class BusExecution:
-    def __init__(self, uri, user, password):
-        """Initialize the Neo4j connection"""
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri, user, password, driver=None):
+        """Initialize the Neo4j connection, or share an existing `driver` and its pool"""
+        self.driver = driver or GraphDatabase.driver(uri, auth=(user, password))
+        self.writer = ResilientWriter(self.driver)
+        self.timetable = None
+        self.timetable_reachability = None
+        self.reachability = None
+        self.stop_adjacency = None
+        self.stop_routes = None
 
     def close(self):
         """Close the Neo4j connection"""
@@ -21,85 +108,85 @@ class BusExecution:
             except Exception as e:
                 print(f"Query execution failed: {e}")
 
-    def import_bus_data(self, csv_file_path):
+    def clear_bus_data(self):
+        """
+        Remove all BUS routes and stops and their relationships so the network can be re-imported.
+        """
+        self.execute_query("""
+        MATCH (:Category {name: 'BUS'})-[:HAS_ROUTE|HAS_STOP]->(node)
+        DETACH DELETE node
+        """)
+
+    def import_bus_data(self, csv_file_path, batch_size=500):
         """
-        Import station data for the DART node from a CSV file.
+        Import the BUS network from a CSV file in one pass: Route nodes merged on their
+        Route Number, Stop nodes for the Primary Areas Served and route-tagged CONNECTS
+        edges between consecutive stops. Rows are written as they are read, in
+        checkpointed batches, so memory stays bounded by the batch size.
         """
         if not os.path.exists(csv_file_path):
             print(f"CSV file not found at path: {csv_file_path}")
             return
 
-        with open(csv_file_path, mode='r', encoding='latin1') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                query = """
-                        MATCH (category:Category {name: 'BUS'})
-                        CREATE (route:Route {
-                            `Route Number`: $Route_Number,
-                             From: $From,
-                             To: $To,
-                            `Route Type`: $Route_Type,
-                            Frequency: $Frequency,
-                            Duration: $Duration,
-                            `Key Landmarks`: $Key_Landmarks,
-                            `Peak Hours`: $Peak_Hours,
-                            Operator: $Operator,
-                            `Primary Areas Served`: $Primary_Areas_Served
-                        })
-                        CREATE (category)-[:HAS_ROUTE]->(route)
-                        """
-
-                # Map CSV columns to query parameters
-                self.execute_query(
-                    query,
-                    parameters={
-                        "Route_Number": row["Route Number"],
-                        "From": row["From"],
-                        "To": row["To"],
-                        "Route_Type": row["Route Type"],
-                        "Frequency": row["Frequency"],
-                        "Duration": row["Duration"],
-                        "Key_Landmarks": row["Key Landmarks"],
-                        "Peak_Hours": row["Peak Hours"],
-                        "Operator": row["Operator"],
-                        "Primary_Areas_Served": row["Primary Areas Served"],
-                    },
-                )
-        print("BUS imported successfully")
-
-    def create_route_relationships(self):
-        """
-        Create relationships between bus routes based on shared areas and landmarks.
-        """
-        query = """
-           MATCH (route1:Route), (route2:Route)
-           WHERE route1 <> route2
-           AND ANY(landmark IN split(route1.`Key Landmarks`, ', ') 
-                   WHERE landmark IN split(route2.`Key Landmarks`, ', '))
-           CREATE (route1)-[:SHARES_LANDMARK]->(route2)
-           """
-        self.execute_query(query)
-        print("Relationships based on shared landmarks created.")
+        rejected = {}
+        rows = validate_rows(read_rows(csv_file_path), required=["Route Number", "Primary Areas Served"], rejected=rejected)
+        batches = prefetch(batch_stream(bus_row_stream(rows), batch_size))
+        written = self.writer.write_stream(
+            "bus_routes", {"route": ROUTE_QUERY, "stop": STOP_QUERY, "edge": CONNECTS_QUERY}, batches,
+            csv_fingerprint(csv_file_path, batch_size),
+        )
+        print(f"BUS imported successfully! {written} routes, stops and segments written, {sum(rejected.values())} rows rejected.")
 
-    def create_route_connections(self):
+    def create_route_relationships(self, batch_size=500):
         """
-        Create relationships between bus routes that share starting or ending points.
+        Create one weighted, undirected CONNECTED_TO edge per pair of related bus routes.
+        Pairs are related when they share a landmark or a terminus; the edge stores the
+        shared landmark count, shared termini and Primary Areas Served overlap.
         """
+        routes = self.execute_query(
+            """
+            MATCH (:Category {name: 'BUS'})-[:HAS_ROUTE]->(route:Route)
+            RETURN route.`Route Number` AS route_number, route.From AS start, route.To AS end,
+                   route.`Key Landmarks` AS landmarks, route.`Primary Areas Served` AS areas
+            """
+        ) or []
+        edges = canonical_route_edges([
+            Route(
+                record["route_number"], record["start"], record["end"],
+                landmarks=intern_list(record["landmarks"]),
+                areas=intern_list(record["areas"]),
+            )
+            for record in routes
+        ])
+
+        # Drop legacy directed pair duplicates before writing the canonical edges,
+        # unless an interrupted run is resuming on top of its committed batches
+        if not self.writer.pending("bus_connections", rows_fingerprint(edges)):
+            self.execute_query(
+                """
+                MATCH (:Route)-[r:SHARES_LANDMARK|CONNECTED_TO]->(:Route)
+                DELETE r
+                """
+            )
         query = """
-           MATCH (route1:Route), (route2:Route)
-           WHERE route1 <> route2
-           AND (route1.From = route2.From OR route1.To = route2.To)
-           CREATE (route1)-[:CONNECTED_TO]->(route2)
-           """
-        self.execute_query(query)
-        print("Route connections created based on shared start or end points.")
+        UNWIND $rows AS row
+        MATCH (route1:Route {`Route Number`: row.source}), (route2:Route {`Route Number`: row.target})
+        MERGE (route1)-[r:CONNECTED_TO]->(route2)
+        SET r.shared_landmarks = row.shared_landmarks,
+            r.shared_termini = row.shared_termini,
+            r.area_overlap = row.area_overlap,
+            r.weight = row.weight
+        """
+        self.writer.write_batches("bus_connections", query, edges, batch_size)
+        print(f"{len(edges)} weighted route connections created.")
 
     def calculate_degree_centrality(self):
         """
         Calculate degree centrality for all stops using plain Cypher queries.
+        Every route segment at a stop counts, so stops shared by many routes rank first.
         """
         degree_centrality_query = """
-        MATCH (s:Stop)-[r:CONNECTS]-(t:Stop)
+        MATCH (:Category {name: 'BUS'})-[:HAS_STOP]->(s:Stop)-[r:CONNECTS]-(:Stop)
         RETURN s.name AS stop, COUNT(r) AS DegreeCentrality
         ORDER BY DegreeCentrality DESC
         """
@@ -108,29 +195,158 @@ class BusExecution:
             print("Degree centrality calculated successfully.")
             for record in result:
                 print(f"Stop: {record['stop']}, Centrality: {record['DegreeCentrality']}")
+            return result
         except Exception as e:
             print(f"Degree centrality calculation failed: {e}")
 
-    def find_shortest_path(self, start_stop, end_stop):
+    def calculate_path_centrality(self, sample_size=None, workers=None):
         """
-        Calculate the shortest path between two stops using plain Cypher queries.
+        Calculate betweenness and closeness centrality for BUS stops using Brandes' algorithm,
+        weighted by segment minutes. Pass sample_size to approximate from k random sources
+        and workers to size the process pool.
         """
-        shortest_path_query = """
-        MATCH (start:Route {From: $StartStop}), (end:Route {To: $EndStop})
-        MATCH p = shortestPath((start)-[:CONNECTED_TO*]-(end))
-        RETURN [node IN nodes(p) | node.`Route Number`] AS path, 
-               reduce(totalDistance = 0, r IN relationships(p) | totalDistance + r.distance_kms) AS totalDistance
+        node_query = """
+        MATCH (:Category {name: 'BUS'})-[:HAS_STOP]->(s:Stop)
+        RETURN elementId(s) AS id
+        """
+        edge_query = """
+        MATCH (:Category {name: 'BUS'})-[:HAS_STOP]->(s:Stop)-[r:CONNECTS]->(t:Stop)
+        RETURN elementId(s) AS source, elementId(t) AS target, r.duration_mins AS weight
         """
         try:
-            result = self.execute_query(shortest_path_query, {
-                "StartStop": start_stop,
-                "EndStop": end_stop
-            })
-            print("Shortest path calculation successful.")
-            for record in result:
-                print(f"Path: {record['path']}, Total Distance: {record['totalDistance']}")
+            result = run_path_centrality(self, node_query, edge_query, sample_size, workers, weighted=True)
+            print("Betweenness and closeness centrality calculated successfully.")
+            return result
+        except Exception as e:
+            print(f"Path centrality calculation failed: {e}")
+
+    def detect_communities(self, resolution=1.0, seed=None):
+        """
+        Group bus routes into corridors with Louvain community detection over the
+        weighted CONNECTED_TO graph, storing a `community` property on each route.
+        """
+        node_query = """
+        MATCH (:Category {name: 'BUS'})-[:HAS_ROUTE]->(s:Route)
+        RETURN elementId(s) AS id
+        """
+        edge_query = """
+        MATCH (s:Route)-[r:CONNECTED_TO]->(t:Route)
+        RETURN elementId(s) AS source, elementId(t) AS target, coalesce(r.weight, 1.0) AS weight
+        """
+        try:
+            communities, score = run_community_detection(self, node_query, edge_query, resolution, seed)
+            print(f"Detected {len(set(communities.values()))} route communities (modularity {score:.3f}).")
+            return communities
         except Exception as e:
-            print(f"Shortest path calculation failed: {e}")
+            print(f"Community detection failed: {e}")
+
+    def fetch_community_summary(self):
+        """
+        Summarise each route community: size, member routes and the areas it serves.
+        """
+        query = """
+        MATCH (:Category {name: 'BUS'})-[:HAS_ROUTE]->(route:Route)
+        WHERE route.community IS NOT NULL
+        UNWIND split(route.`Primary Areas Served`, ', ') AS area
+        WITH route.community AS community,
+             collect(DISTINCT route.`Route Number`) AS routeNumbers,
+             collect(DISTINCT area) AS areas
+        RETURN community, size(routeNumbers) AS routeCount, routeNumbers, areas
+        ORDER BY routeCount DESC
+        """
+        return self.execute_query(query)
+
+    def build_reachability_index(self):
+        """
+        Label connected components of the stop graph, stored on disk and as the
+        `component` property of each stop.
+        """
+        node_query = """
+        MATCH (:Category {name: 'BUS'})-[:HAS_STOP]->(stop:Stop)
+        RETURN stop.name AS id, elementId(stop) AS element_id
+        """
+        edge_query = """
+        MATCH (:Category {name: 'BUS'})-[:HAS_STOP]->(stop1:Stop)-[:CONNECTS]->(stop2:Stop)
+        RETURN stop1.name AS source, stop2.name AS target
+        """
+        try:
+            self.reachability = build_reachability_index(self, "BUS", node_query, edge_query)
+            print(f"BUS reachability index built: {len(self.reachability.sizes())} components.")
+            return self.reachability
+        except Exception as e:
+            print(f"Reachability index build failed: {e}")
+
+    def is_reachable(self, start_stop, end_stop):
+        """O(1) check against the reachability index; True when no index has been built."""
+        if self.reachability is None:
+            self.reachability = load_reachability_index("BUS")
+        return self.reachability is None or self.reachability.reachable(start_stop, end_stop)
+
+    def load_stop_graph(self):
+        """Read the CONNECTS segments into the in-memory stop adjacency used for routing."""
+        edges = self.execute_query(
+            """
+            MATCH (:Category {name: 'BUS'})-[:HAS_STOP]->(stop1:Stop)-[r:CONNECTS]->(stop2:Stop)
+            RETURN stop1.name AS source, stop2.name AS target, r.route AS route, r.duration_mins AS duration
+            """
+        ) or []
+        self.stop_adjacency, self.stop_routes = stop_graph(edges)
+        return self.stop_adjacency
+
+    def find_shortest_path(self, start_stop, end_stop):
+        """
+        Fastest stop-to-stop journey by bidirectional Dijkstra over the stop graph,
+        weighted by estimated segment minutes. Returns [{"path", "routes", "totalDuration"}]
+        where routes[i] is the route taken from path[i] to path[i + 1]; pairs in different
+        components are rejected before the search.
+        """
+        if not self.is_reachable(start_stop, end_stop):
+            print(f"No path: {start_stop} and {end_stop} are not connected.")
+            return []
+        if self.stop_adjacency is None:
+            self.load_stop_graph()
+        path, duration = bidirectional_dijkstra(self.stop_adjacency, start_stop, end_stop)
+        if path is None:
+            print(f"No path found between {start_stop} and {end_stop}.")
+            return []
+        routes = [self.stop_routes[pair] for pair in zip(path, path[1:])]
+        print(f"Path: {path}, Routes: {routes}, Total Duration: {duration:.1f} mins")
+        return [{"path": path, "routes": routes, "totalDuration": round(duration, 1)}]
+
+    def build_timetable(self, csv_file_path):
+        """
+        Expand Frequency, Peak Hours and Duration into per-edge service windows and headways.
+        """
+        if not os.path.exists(csv_file_path):
+            print(f"CSV file not found at path: {csv_file_path}")
+            return
+
+        with open(csv_file_path, mode='r', encoding='latin1') as file:
+            self.timetable = TimetableModel.from_bus_rows(csv.DictReader(file))
+        self.timetable_reachability = ReachabilityIndex.from_edges(
+            self.timetable.edges,
+            ((stop, edge.target) for stop, edges in self.timetable.edges.items() for edge in edges),
+            directed=True,
+        )
+        return self.timetable
+
+    def calculate_earliest_arrival(self, start_stop, end_stop, departure_time):
+        """
+        Find the earliest bus arrival between two areas when leaving at departure_time.
+        """
+        if self.timetable is None:
+            print("Timetable not built. Use build_timetable() first.")
+            return None
+        departure = parse_clock(departure_time)
+        if departure is None:
+            print(f"Could not parse departure time: {departure_time}")
+            return None
+        if not self.timetable_reachability.reachable(start_stop, end_stop):
+            print(f"No service: {end_stop} cannot be reached from {start_stop}.")
+            return None
+        journey = self.timetable.earliest_arrival(start_stop, end_stop, departure)
+        print("Earliest arrival calculation successful.")
+        return journey
 
     def calculate_pagerank(self, node_label, relationship_type):
         """
@@ -1,15 +1,39 @@
-
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 from neo4j import GraphDatabase
+from neo4jdb.resilient import ResilientWriter
+from neo4jdb.ingest import read_rows, validate_rows, batch_stream, prefetch, csv_fingerprint
+from neo4jdb.analytics import (
+    run_path_centrality, build_routing_index, load_routing_index,
+    build_reachability_index, load_reachability_index,
+)
+from utils.network_rows import dart_row_stream
 import os
-import csv
+
+
+STATION_QUERY = """
+MATCH (dart:Category {name: 'DART'})
+UNWIND $rows AS props
+MERGE (dart)-[:HAS_STATION]->(station:Station {name: props.name})
+SET station += props
+"""
+ROUTE_QUERY = """
+MATCH (dart:Category {name: 'DART'})
+UNWIND $rows AS edge
+MATCH (dart)-[:HAS_STATION]->(station1:Station {name: edge.Station1}),
+      (dart)-[:HAS_STATION]->(station2:Station {name: edge.Station2})
+MERGE (station1)-[r:CONNECTED_BY_ROUTE {
+    route: edge.Route,
+    distance_km: edge.Distance
+}]->(station2)
+"""
+
 
 class DartExecution:
-    def __init__(self, uri, user, password):
-        """Initialize the Neo4j connection"""
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri, user, password, driver=None):
+        """Initialize the Neo4j connection, or share an existing `driver` and its pool"""
+        self.driver = driver or GraphDatabase.driver(uri, auth=(user, password))
+        self.writer = ResilientWriter(self.driver)
+        self.routing_index = None
+        self.reachability = None
         PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         DART_CSV_FILE_PATH = os.path.join(PROJECT_ROOT, "data","DART_Dataset.csv")
     def close(self):
@@ -26,104 +50,50 @@ class DartExecution:
             except Exception as e:
                 print(f"Query execution failed: {e}")
 
-    def import_station_data(self, csv_file_path):
+    def clear_station_data(self):
         """
-        Import station data for the DART node from a CSV file.
+        Remove all DART stations and their relationships so the network can be re-imported.
+        """
+        self.execute_query("""
+        MATCH (:Category {name: 'DART'})-[:HAS_STATION]->(station:Station)
+        DETACH DELETE station
+        """)
+
+    def _csv_stream(self, csv_file_path, batch_size, kinds):
+        """Validated rows of the CSV, streamed once into prefetched batches of the given kinds."""
+        rejected = {}
+        rows = validate_rows(read_rows(csv_file_path), required=["StationName"], numeric=["Distance_km"], rejected=rejected)
+        items = ((kind, row) for kind, row in dart_row_stream(rows) if kind in kinds)
+        return prefetch(batch_stream(items, batch_size)), rejected
+
+    def import_station_data(self, csv_file_path, batch_size=500):
+        """
+        Import DART stations and their CONNECTED_BY_ROUTE relationships in one pass over
+        the CSV. Rows are validated and written as they are read, in checkpointed batches,
+        so memory stays bounded by the batch size whatever the file size.
         """
         if not os.path.exists(csv_file_path):
             print(f"CSV file not found at path: {csv_file_path}")
             return
 
-        with open(csv_file_path, mode='r', encoding='latin1') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                query = """
-                MATCH (dart:Category {name: 'DART'})
-                CREATE (station:Station {
-                    name: $StationName,
-                    operational: $Operational,
-                    location: $Location,
-                    address: $StationAddress,
-                    eircode: $Eircode,
-                    atm: $ATM,
-                    weekend_working: $WeekendWorking,
-                    wifi: $WiFiAccess,
-                    refreshments: $Refreshments,
-                    phone_charging: $PhoneCharging,
-                    ticket_machine: $TicketVendingMachine,
-                    smart_card_enabled: $SmartCardEnabled,
-                    routes_serviced: $RoutesServiced
-                })
-                CREATE (dart)-[:HAS_STATION]->(station)
-                """
-                self.execute_query(
-                    query,
-                    parameters={
-                        "StationName": row["StationName"],
-                        "Operational": row["Operational"],
-                        "Location": row["Location"],
-                        "StationAddress": row["Station Address"],
-                        "Eircode": row["Eircode"],
-                        "ATM": row["ATM"],
-                        "WeekendWorking": row["Weekend Working"],
-                        "WiFiAccess": row["Wi-Fi & Internet Access"],
-                        "Refreshments": row["Refreshments"],
-                        "PhoneCharging": row["Phone Charging"],
-                        "TicketVendingMachine": row["Ticket Vending Machine"],
-                        "SmartCardEnabled": row["Smart Card Enabled"],
-                        "RoutesServiced": row["Routes Serviced"],
-                    },
-                )
-        print("DART imported successfully!")
-
-    def create_custom_relationships_from_csv(self, csv_file_path):
+        batches, rejected = self._csv_stream(csv_file_path, batch_size, ("station", "edge"))
+        written = self.writer.write_stream(
+            "dart_stations", {"station": STATION_QUERY, "edge": ROUTE_QUERY}, batches,
+            csv_fingerprint(csv_file_path, batch_size),
+        )
+        print(f"DART imported successfully! {written} stations and routes written, {sum(rejected.values())} rows rejected.")
+
+    def create_custom_relationships_from_csv(self, csv_file_path, batch_size=500):
         """
         Create relationships based on routes serviced, customized for shortest path and centrality analysis.
+        import_station_data already creates them; this rebuilds only the relationships.
         """
         if not os.path.exists(csv_file_path):
             print(f"CSV file not found at path: {csv_file_path}")
             return
 
-        with open(csv_file_path, mode='r', encoding='latin1') as file:
-            reader = csv.DictReader(file)
-
-            stations = []
-            routes_map = {}
-
-            # Collect stations and their routes
-            for row in reader:
-                station_name = row["StationName"]
-                stations.append(station_name)
-                routes = [r.strip() for r in row["Routes Serviced"].split(',')]
-
-                for route in routes:
-                    if route not in routes_map:
-                        routes_map[route] = []
-                    routes_map[route].append((station_name, float(row["Distance_km"])))
-
-            # Create relationships
-            for route, stations_in_route in routes_map.items():
-                for i in range(len(stations_in_route) - 1):
-                    station1, distance1 = stations_in_route[i]
-                    station2, distance2 = stations_in_route[i + 1]
-
-                    query = """
-                    MATCH (station1:Station {name: $Station1}),
-                          (station2:Station {name: $Station2})
-                    MERGE (station1)-[r:CONNECTED_BY_ROUTE {
-                        route: $Route,
-                        distance_km: $Distance
-                    }]->(station2)
-                    """
-                    self.execute_query(
-                        query,
-                        parameters={
-                            "Station1": station1,
-                            "Station2": station2,
-                            "Route": route,
-                            "Distance": (distance1 + distance2) / 2,  # Average distance
-                        },
-                    )
+        batches, _ = self._csv_stream(csv_file_path, batch_size, ("edge",))
+        self.writer.write_stream("dart_routes", {"edge": ROUTE_QUERY}, batches, csv_fingerprint(csv_file_path, batch_size))
         print("Customized relationships created successfully!")
 
     def calculate_degree_centrality(self):
@@ -142,10 +112,90 @@ class DartExecution:
         except Exception as e:
             print(f"Degree centrality calculation failed: {e}")
 
+    def calculate_path_centrality(self, sample_size=None, workers=None):
+        """
+        Calculate betweenness and closeness centrality for DART stations using Brandes' algorithm.
+        Pass sample_size to approximate from k random sources and workers to size the process pool.
+        """
+        node_query = """
+        MATCH (:Category {name: 'DART'})-[:HAS_STATION]->(s:Station)
+        RETURN elementId(s) AS id
+        """
+        edge_query = """
+        MATCH (s:Station)-[r:CONNECTED_BY_ROUTE]->(t:Station)
+        RETURN elementId(s) AS source, elementId(t) AS target, r.distance_km AS weight
+        """
+        try:
+            result = run_path_centrality(self, node_query, edge_query, sample_size, workers, weighted=True)
+            print("Betweenness and closeness centrality calculated successfully.")
+            return result
+        except Exception as e:
+            print(f"Path centrality calculation failed: {e}")
+
+    def build_routing_index(self):
+        """
+        Contract the DART network weighted by distance_km and store the hierarchy so
+        shortest-path lookups no longer need a graph search in Neo4j.
+        """
+        node_query = """
+        MATCH (:Category {name: 'DART'})-[:HAS_STATION]->(s:Station)
+        RETURN s.name AS id
+        """
+        edge_query = """
+        MATCH (:Category {name: 'DART'})-[:HAS_STATION]->(s:Station)-[r:CONNECTED_BY_ROUTE]->(t:Station)
+        RETURN s.name AS source, t.name AS target, r.distance_km AS weight
+        """
+        try:
+            self.routing_index = build_routing_index(self, "DART", node_query, edge_query)
+            print(f"DART routing index built over {len(self.routing_index)} stations.")
+            return self.routing_index
+        except Exception as e:
+            print(f"Routing index build failed: {e}")
+
+    def build_reachability_index(self):
+        """
+        Label connected components of the DART network, stored on disk and as the
+        `component` property of each station.
+        """
+        node_query = """
+        MATCH (:Category {name: 'DART'})-[:HAS_STATION]->(s:Station)
+        RETURN s.name AS id, elementId(s) AS element_id
+        """
+        edge_query = """
+        MATCH (:Category {name: 'DART'})-[:HAS_STATION]->(s:Station)-[:CONNECTED_BY_ROUTE]->(t:Station)
+        RETURN s.name AS source, t.name AS target
+        """
+        try:
+            self.reachability = build_reachability_index(self, "DART", node_query, edge_query)
+            print(f"DART reachability index built: {len(self.reachability.sizes())} components.")
+            return self.reachability
+        except Exception as e:
+            print(f"Reachability index build failed: {e}")
+
+    def is_reachable(self, start_station, end_station):
+        """O(1) check against the reachability index; True when no index has been built."""
+        if self.reachability is None:
+            self.reachability = load_reachability_index("DART")
+        return self.reachability is None or self.reachability.reachable(start_station, end_station)
+
     def calculate_shortest_path(self, start_station, end_station):
         """
-        Calculate the shortest path between two stations using plain Cypher queries.
+        Calculate the shortest path between two stations by distance from the routing
+        index, falling back to plain Cypher queries when it has not been built.
+        Pairs in different components are rejected before any search.
         """
+        if not self.is_reachable(start_station, end_station):
+            print(f"No path: {start_station} and {end_station} are not connected.")
+            return []
+        if self.routing_index is None:
+            self.routing_index = load_routing_index("DART")
+        if self.routing_index is not None:
+            path, distance = self.routing_index.shortest_path(start_station, end_station)
+            print("Shortest path calculation successful.")
+            if path is None:
+                return []
+            return [{"path": path, "totalDistance": round(distance, 3)}]
+
         shortest_path_query = """
         MATCH (start:Station {name: $StartStation}), (end:Station {name: $EndStation})
         MATCH p = shortestPath((start)-[:CONNECTED_BY_ROUTE*]-(end))
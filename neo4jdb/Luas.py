@@ -1,11 +1,46 @@
 from neo4j import GraphDatabase
+from neo4jdb.resilient import ResilientWriter
+from neo4jdb.ingest import read_rows, validate_rows, batch_stream, prefetch, csv_fingerprint
+from neo4jdb.analytics import (
+    run_path_centrality, fetch_adjacency, build_routing_index, load_routing_index,
+    build_reachability_index, load_reachability_index,
+)
+from utils.components import ReachabilityIndex
+from utils.spatial import SpatialIndex
+from utils.routing import astar_path
+from utils.timetable import TimetableModel, parse_clock
+from utils.model import load_luas_stations
+from utils.network_rows import luas_row_stream
 import os
 import csv
 
+
+STATION_QUERY = """
+MATCH (luas:Category {name: 'LUAS'})
+UNWIND $rows AS props
+MERGE (luas)-[:HAS_STATION]->(station:Station {Station_ID: props.Station_ID})
+SET station += props
+"""
+LINE_QUERY = """
+MATCH (luas:Category {name: 'LUAS'})
+UNWIND $rows AS edge
+MATCH (luas)-[:HAS_STATION]->(station1:Station {name: edge.Station1}),
+      (luas)-[:HAS_STATION]->(station2:Station {name: edge.Station2})
+MERGE (station1)-[:CONNECTED_BY_LINE {line: edge.Line}]->(station2)
+"""
+
+
 class LuasExecution:
-    def __init__(self, uri, user, password):
-        """Initialize the Neo4j connection"""
-        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+    def __init__(self, uri, user, password, driver=None):
+        """Initialize the Neo4j connection, or share an existing `driver` and its pool"""
+        self.driver = driver or GraphDatabase.driver(uri, auth=(user, password))
+        self.writer = ResilientWriter(self.driver)
+        self.spatial_index = None
+        self.routing_index = None
+        self.reachability = {}
+        self.station_lines = {}
+        self.timetable = None
+        self.timetable_reachability = None
 
     def close(self):
         """Close the Neo4j connection"""
@@ -21,110 +56,304 @@ class LuasExecution:
             except Exception as e:
                 print(f"Query execution failed: {e}")
 
-    def import_luas_data(self, csv_file_path):
+    def clear_luas_data(self):
         """
-        Import station data for the DART node from a CSV file.
+        Remove all LUAS stations and their relationships so the network can be re-imported.
+        """
+        self.execute_query("""
+        MATCH (:Category {name: 'LUAS'})-[:HAS_STATION]->(station:Station)
+        DETACH DELETE station
+        """)
+
+    def _csv_stream(self, csv_file_path, batch_size, kinds):
+        """Validated rows of the CSV, streamed once into prefetched batches of the given kinds."""
+        rejected = {}
+        rows = validate_rows(read_rows(csv_file_path), required=["Station Name", "Line", "Station_ID"], rejected=rejected)
+        items = ((kind, row) for kind, row in luas_row_stream(rows) if kind in kinds)
+        return prefetch(batch_stream(items, batch_size)), rejected
+
+    def import_luas_data(self, csv_file_path, batch_size=500):
+        """
+        Import LUAS stations and their CONNECTED_BY_LINE relationships in one pass over
+        the CSV. Stations are merged on Station_ID under the LUAS category as the rows are
+        read, in checkpointed batches, so memory stays bounded by the batch size.
         """
         if not os.path.exists(csv_file_path):
             print(f"CSV file not found at path: {csv_file_path}")
             return
 
-        with open(csv_file_path, mode='r', encoding='latin1') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                query = """
-                MATCH (luas:Category {name: 'LUAS'})
-                 CREATE (station:Station 
-                 {
-                    name: $Station_Name,
-                    Line: $Line,
-                    Station_ID: $Station_ID,
-                    Location: $Location,
-                    Key_Features_Attractions: $Key_Features_Attractions,
-                    Type: $Type,
-                    Interchange: $Interchange,
-                    Zone: $Zone,
-                    Daily_Footfall: $Daily_Footfall,
-                    Facilities: $Facilities,
-                    Accessibility: $Accessibility,
-                    Latitude: $Latitude,
-                    Longitude: $Longitude,
-                    Parking_Availability: $Parking_Availability,
-                    Nearby_Landmarks: $Nearby_Landmarks,
-                    First_Tram_Time: $First_Tram_Time,
-                    Last_Tram_Time: $Last_Tram_Time
-                })
-                CREATE (luas)-[:HAS_STATION]->(station)
-                """
-                self.execute_query(
-                    query,
-                    parameters={
-                        "Station_Name": row["Station Name"],
-                        "Station_ID": row["Station_ID"],
-                        "Line": row["Line"],
-                        "Location": row["Location"],
-                        "Key_Features_Attractions": row["Key Features/Attractions"],
-                        "Type": row["Type (Terminus/Regular)"],
-                        "Interchange": row["Interchange"],
-                        "Zone": row["Zone"],
-                        "Daily_Footfall": row["Daily Footfall"],
-                        "Facilities": row["Facilities"],
-                        "Accessibility": row["Accessibility"],
-                        "Latitude": row["Latitude"],
-                        "Longitude": row["Longitude"],
-                        "Parking_Availability": row["Parking Availability"],
-                        "Nearby_Landmarks": row["Nearby Landmarks"],
-                        "First_Tram_Time": row["First Tram Time"],
-                        "Last_Tram_Time": row["Last Tram Time"],
-                    },
-                )
-        print("LUAS imported successfully!")
-
-    def create_luas_relationships(self, csv_file_path):
+        batches, rejected = self._csv_stream(csv_file_path, batch_size, ("station", "edge"))
+        written = self.writer.write_stream(
+            "luas_stations", {"station": STATION_QUERY, "edge": LINE_QUERY}, batches,
+            csv_fingerprint(csv_file_path, batch_size),
+        )
+        print(f"LUAS imported successfully! {written} stations and lines written, {sum(rejected.values())} rows rejected.")
+
+    def create_luas_relationships(self, csv_file_path, batch_size=500):
         """
         Create relationships between LUAS stations based on the Line attribute.
+        import_luas_data already creates them; this rebuilds only the relationships.
         """
         if not os.path.exists(csv_file_path):
             print(f"CSV file not found at path: {csv_file_path}")
             return
 
-        with open(csv_file_path, mode='r', encoding='latin1') as file:
-            reader = csv.DictReader(file)
-            lines_map = {}
-
-            # Group stations by line
-            for row in reader:
-                line = row["Line"]
-                station_name = row["Station Name"]
-                if line not in lines_map:
-                    lines_map[line] = []
-                lines_map[line].append(station_name)
-
-            # Create relationships along each line
-            for line, stations in lines_map.items():
-                for i in range(len(stations) - 1):
-                    station1 = stations[i]
-                    station2 = stations[i + 1]
-
-                    query = """
-                    MATCH (station1:Station {name: $Station1}),
-                          (station2:Station {name: $Station2})
-                    MERGE (station1)-[:CONNECTED_BY_LINE {line: $Line}]->(station2)
-                    """
-                    self.execute_query(
-                        query,
-                        parameters={
-                            "Station1": station1,
-                            "Station2": station2,
-                            "Line": line,
-                        },
-                    )
+        batches, _ = self._csv_stream(csv_file_path, batch_size, ("edge",))
+        self.writer.write_stream("luas_lines", {"edge": LINE_QUERY}, batches, csv_fingerprint(csv_file_path, batch_size))
         print("LUAS relationships created successfully!")
 
+    def build_spatial_index(self, csv_file_path):
+        """
+        Build the in-memory KD-tree over LUAS station coordinates from the CSV file.
+        """
+        if not os.path.exists(csv_file_path):
+            print(f"CSV file not found at path: {csv_file_path}")
+            return
+
+        stations = load_luas_stations(csv_file_path)
+        self.spatial_index = SpatialIndex((station.name, station.latitude, station.longitude) for station in stations)
+        self.station_lines = {station.name: station.lines[0] for station in stations}
+        print(f"Spatial index built for {len(self.spatial_index)} LUAS stations.")
+        return self.spatial_index
+
+    def create_station_points(self):
+        """
+        Store station coordinates as Neo4j point properties, add a point index
+        and set distance_km on CONNECTED_BY_LINE relationships.
+        """
+        self.execute_query(
+            """
+            MATCH (:Category {name: 'LUAS'})-[:HAS_STATION]->(station:Station)
+            WHERE station.Latitude IS NOT NULL AND station.Longitude IS NOT NULL
+            SET station.coordinates = point({
+                latitude: toFloat(station.Latitude),
+                longitude: toFloat(station.Longitude)
+            })
+            """
+        )
+        self.execute_query(
+            "CREATE POINT INDEX station_coordinates IF NOT EXISTS FOR (s:Station) ON (s.coordinates)"
+        )
+        self.execute_query(
+            """
+            MATCH (station1:Station)-[r:CONNECTED_BY_LINE]->(station2:Station)
+            WHERE station1.coordinates IS NOT NULL AND station2.coordinates IS NOT NULL
+            SET r.distance_km = point.distance(station1.coordinates, station2.coordinates) / 1000.0
+            """
+        )
+        print("LUAS station points and line distances created successfully!")
+
+    def find_nearest_stations(self, latitude, longitude, count=5):
+        """
+        Return the `count` LUAS stations closest to a location as (name, distance_km).
+        """
+        if self.spatial_index is None:
+            print("Spatial index not built. Use build_spatial_index() first.")
+            return []
+        return self.spatial_index.nearest(latitude, longitude, count)
+
+    def find_stations_within(self, latitude, longitude, radius_km):
+        """
+        Return all LUAS stations within radius_km of a location as (name, distance_km).
+        """
+        if self.spatial_index is None:
+            print("Spatial index not built. Use build_spatial_index() first.")
+            return []
+        return self.spatial_index.within_radius(latitude, longitude, radius_km)
+
+    def create_proximity_interchanges(self, radius_km=0.3):
+        """
+        Link stations on different lines that lie within walking distance with INTERCHANGE_WITH.
+        """
+        if self.spatial_index is None:
+            print("Spatial index not built. Use build_spatial_index() first.")
+            return
+
+        rows = [
+            {"Station1": station1, "Station2": station2, "Distance": distance}
+            for station1, station2, distance in self.spatial_index.pairs_within(radius_km)
+            if self.station_lines.get(station1) != self.station_lines.get(station2)
+        ]
+        query = """
+        UNWIND $rows AS row
+        MATCH (station1:Station {name: row.Station1}),
+              (station2:Station {name: row.Station2})
+        MERGE (station1)-[r:INTERCHANGE_WITH]->(station2)
+        SET r.distance_km = row.Distance
+        """
+        self.execute_query(query, parameters={"rows": rows})
+        print(f"{len(rows)} LUAS proximity interchanges created successfully!")
+
+    def build_routing_index(self):
+        """
+        Contract the LUAS network (lines and interchanges, weighted by distance_km) and
+        store the hierarchy for calculate_geo_shortest_path.
+        """
+        node_query = """
+        MATCH (:Category {name: 'LUAS'})-[:HAS_STATION]->(s:Station)
+        RETURN s.name AS id
+        """
+        edge_query = """
+        MATCH (:Category {name: 'LUAS'})-[:HAS_STATION]->(s:Station)-[r:CONNECTED_BY_LINE|INTERCHANGE_WITH]->(t:Station)
+        RETURN s.name AS source, t.name AS target, r.distance_km AS weight
+        """
+        try:
+            self.routing_index = build_routing_index(self, "LUAS", node_query, edge_query)
+            print(f"LUAS routing index built over {len(self.routing_index)} stations.")
+            return self.routing_index
+        except Exception as e:
+            print(f"Routing index build failed: {e}")
+
+    def build_reachability_index(self):
+        """
+        Label connected components twice: along lines only (stored as the `component`
+        station property, used by calculate_shortest_path) and with proximity
+        interchanges included (used by calculate_geo_shortest_path).
+        """
+        node_query = """
+        MATCH (:Category {name: 'LUAS'})-[:HAS_STATION]->(s:Station)
+        RETURN s.name AS id, elementId(s) AS element_id
+        """
+        edge_query = """
+        MATCH (:Category {{name: 'LUAS'}})-[:HAS_STATION]->(s:Station)-[:{relationships}]->(t:Station)
+        RETURN s.name AS source, t.name AS target
+        """
+        try:
+            self.reachability = {
+                "LUAS": build_reachability_index(
+                    self, "LUAS", node_query, edge_query.format(relationships="CONNECTED_BY_LINE")
+                ),
+                "LUAS_GEO": build_reachability_index(
+                    self, "LUAS_GEO", node_query, edge_query.format(relationships="CONNECTED_BY_LINE|INTERCHANGE_WITH"),
+                    property_name=None,
+                ),
+            }
+            print(f"LUAS reachability index built: {len(self.reachability['LUAS'].sizes())} line components, "
+                  f"{len(self.reachability['LUAS_GEO'].sizes())} with interchanges.")
+            return self.reachability
+        except Exception as e:
+            print(f"Reachability index build failed: {e}")
+
+    def is_reachable(self, start_station, end_station, interchanges=False):
+        """O(1) check against the reachability index; True when no index has been built."""
+        key = "LUAS_GEO" if interchanges else "LUAS"
+        if key not in self.reachability:
+            self.reachability[key] = load_reachability_index(key)
+        index = self.reachability[key]
+        return index is None or index.reachable(start_station, end_station)
+
+    def calculate_geo_shortest_path(self, start_station, end_station):
+        """
+        Calculate the shortest LUAS path by distance. Answered from the routing index when
+        it has been built, otherwise with A* using straight-line distance from the spatial
+        index as the heuristic.
+        """
+        if not self.is_reachable(start_station, end_station, interchanges=True):
+            print(f"No path: {start_station} and {end_station} are not connected.")
+            return []
+        if self.routing_index is None:
+            self.routing_index = load_routing_index("LUAS")
+        if self.routing_index is not None:
+            path, distance = self.routing_index.shortest_path(start_station, end_station)
+            print("Shortest path calculation successful.")
+            if path is None:
+                return []
+            return [{"path": path, "totalDistance": round(distance, 3)}]
+
+        node_query = """
+        MATCH (:Category {name: 'LUAS'})-[:HAS_STATION]->(s:Station)
+        RETURN s.name AS id
+        """
+        edge_query = """
+        MATCH (s:Station)-[r:CONNECTED_BY_LINE|INTERCHANGE_WITH]->(t:Station)
+        RETURN s.name AS source, t.name AS target, r.distance_km AS weight
+        """
+        try:
+            adjacency = fetch_adjacency(self, node_query, edge_query)
+            heuristic = self.spatial_index.heuristic(end_station) if self.spatial_index else None
+            path, distance = astar_path(adjacency, start_station, end_station, heuristic)
+            print("Shortest path calculation successful.")
+            if path is None:
+                return []
+            return [{"path": path, "totalDistance": round(distance, 3)}]
+        except Exception as e:
+            print(f"Shortest path calculation failed: {e}")
+
+    def build_timetable(self, csv_file_path):
+        """
+        Expand First/Last Tram Time into per-edge service windows and headways.
+        """
+        if not os.path.exists(csv_file_path):
+            print(f"CSV file not found at path: {csv_file_path}")
+            return
+
+        with open(csv_file_path, mode='r', encoding='latin1') as file:
+            self.timetable = TimetableModel.from_luas_rows(csv.DictReader(file))
+        self.timetable_reachability = ReachabilityIndex.from_edges(
+            self.timetable.edges,
+            ((stop, edge.target) for stop, edges in self.timetable.edges.items() for edge in edges),
+            directed=True,
+        )
+        return self.timetable
+
+    def create_service_windows(self):
+        """
+        Store each CONNECTED_BY_LINE edge's service window, headways and travel time.
+        """
+        if self.timetable is None:
+            print("Timetable not built. Use build_timetable() first.")
+            return
+
+        rows = []
+        for station, edges in self.timetable.edges.items():
+            for edge in edges:
+                rows.append({
+                    "Station1": station,
+                    "Station2": edge.target,
+                    "First": edge.first,
+                    "Last": edge.last,
+                    "PeakHeadway": edge.headways.peak,
+                    "OffPeakHeadway": edge.headways.off_peak,
+                    "Travel": edge.travel,
+                })
+        query = """
+        UNWIND $rows AS row
+        MATCH (station1:Station {name: row.Station1})-[r:CONNECTED_BY_LINE]->(station2:Station {name: row.Station2})
+        SET r.first_departure_min = row.First,
+            r.last_departure_min = row.Last,
+            r.headway_peak_min = row.PeakHeadway,
+            r.headway_offpeak_min = row.OffPeakHeadway,
+            r.travel_min = row.Travel
+        """
+        self.execute_query(query, parameters={"rows": rows})
+        print("LUAS service windows stored successfully!")
+
+    def calculate_earliest_arrival(self, start_station, end_station, departure_time):
+        """
+        Find the earliest LUAS arrival when leaving at departure_time (e.g. '8:15 am').
+        """
+        if self.timetable is None:
+            print("Timetable not built. Use build_timetable() first.")
+            return None
+        departure = parse_clock(departure_time)
+        if departure is None:
+            print(f"Could not parse departure time: {departure_time}")
+            return None
+        if not self.timetable_reachability.reachable(start_station, end_station):
+            print(f"No service: {end_station} cannot be reached from {start_station}.")
+            return None
+        journey = self.timetable.earliest_arrival(start_station, end_station, departure)
+        print("Earliest arrival calculation successful.")
+        return journey
+
     def calculate_shortest_path(self, start_station, end_station):
         """
         Calculate the shortest path between two LUAS stations using plain Cypher queries.
+        Pairs on disconnected lines are rejected before the search.
         """
+        if not self.is_reachable(start_station, end_station):
+            print(f"No path: {start_station} and {end_station} are not connected.")
+            return []
         query = """
         MATCH (start:Station {name: $StartStation}), (end:Station {name: $EndStation})
         MATCH p = shortestPath((start)-[:CONNECTED_BY_LINE*]-(end))
@@ -157,6 +386,26 @@ class LuasExecution:
         except Exception as e:
             print(f"Degree centrality calculation failed: {e}")
 
+    def calculate_path_centrality(self, sample_size=None, workers=None):
+        """
+        Calculate betweenness and closeness centrality for LUAS stations using Brandes' algorithm.
+        Pass sample_size to approximate from k random sources and workers to size the process pool.
+        """
+        node_query = """
+        MATCH (:Category {name: 'LUAS'})-[:HAS_STATION]->(s:Station)
+        RETURN elementId(s) AS id
+        """
+        edge_query = """
+        MATCH (s:Station)-[r:CONNECTED_BY_LINE]->(t:Station)
+        RETURN elementId(s) AS source, elementId(t) AS target, 1.0 AS weight
+        """
+        try:
+            result = run_path_centrality(self, node_query, edge_query, sample_size, workers, weighted=False)
+            print("Betweenness and closeness centrality calculated successfully.")
+            return result
+        except Exception as e:
+            print(f"Path centrality calculation failed: {e}")
+
     def calculate_pagerank(self, node_label, relationship_type):
         """
         Calculate PageRank for LUAS nodes and relationships.
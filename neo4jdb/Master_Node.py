@@ -1,5 +1,30 @@
 from neo4j import GraphDatabase
 
+TRANSPORT_CATEGORIES = [
+    {
+        "name": "DART",
+        "type": "Rail",
+        "operator": "Irish Rail",
+        "routes_count": 1,
+        "description": "Dublin Area Rapid Transit",
+    },
+    {
+        "name": "LUAS",
+        "type": "Tram",
+        "operator": "Transdev",
+        "routes_count": 2,
+        "description": "Dublin Light Rail System",
+    },
+    {
+        "name": "BUS",
+        "type": "Road",
+        "operator": "Dublin Bus",
+        "routes_count": 130,
+        "description": "Dublin public bus service",
+    },
+]
+
+
 class MasterNode:
     def __init__(self, uri, user, password):
         """Initialize the Neo4j connection"""
@@ -23,49 +48,21 @@ class MasterNode:
         """
         Create Ireland as a parent node, add transport categories,
         and establish relationships between them.
+        Everything is merged, so a rerun leaves the imported networks (and any
+        interrupted import they are resuming) untouched.
         """
-
-        self.execute_query("MATCH (n) DETACH DELETE n")
         # Step 1: Create the Parent Node (Ireland)
-        self.execute_query("CREATE (Ireland:Country {name: 'Ireland'})")
+        self.execute_query("MERGE (Ireland:Country {name: 'Ireland'})")
 
         # Step 2: Create Transport Categories with Properties
-        transport_categories = [
-            {
-                "name": "DART",
-                "type": "Rail",
-                "operator": "Irish Rail",
-                "routes_count": 1,
-                "description": "Dublin Area Rapid Transit",
-            },
-            {
-                "name": "LUAS",
-                "type": "Tram",
-                "operator": "Transdev",
-                "routes_count": 2,
-                "description": "Dublin Light Rail System",
-            },
-            {
-                "name": "BUS",
-                "type": "Road",
-                "operator": "Dublin Bus",
-                "routes_count": 130,
-                "description": "Dublin public bus service",
-            },
-        ]
-
-        for category in transport_categories:
-            self.execute_query(
-                f"""
-                CREATE (c:Category {{
-                    name: '{category['name']}',
-                    type: '{category['type']}',
-                    operator: '{category['operator']}',
-                    routes_count: {category['routes_count']},
-                    description: '{category['description']}'
-                }})
-                """
-            )
+        self.execute_query(
+            """
+            UNWIND $categories AS category
+            MERGE (c:Category {name: category.name})
+            SET c += category
+            """,
+            {"categories": TRANSPORT_CATEGORIES},
+        )
 
         # Step 3: Connect Transport Categories to Ireland
         self.execute_query(
@@ -74,8 +71,8 @@ class MasterNode:
                   (dart:Category {name: 'DART'}),
                   (luas:Category {name: 'LUAS'}),
                   (bus:Category {name: 'BUS'})
-            CREATE (Ireland)-[:HAS_TRANSPORT]->(dart),
-                   (Ireland)-[:HAS_TRANSPORT]->(luas),
-                   (Ireland)-[:HAS_TRANSPORT]->(bus)
+            MERGE (Ireland)-[:HAS_TRANSPORT]->(dart)
+            MERGE (Ireland)-[:HAS_TRANSPORT]->(luas)
+            MERGE (Ireland)-[:HAS_TRANSPORT]->(bus)
             """
         )
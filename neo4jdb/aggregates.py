@@ -0,0 +1,80 @@
+from neo4j import GraphDatabase
+
+
+class AggregateExecution:
+    def __init__(self, uri, user, password):
+        """Initialize the Neo4j connection"""
+        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+
+    def close(self):
+        """Close the Neo4j connection"""
+        if self.driver:
+            self.driver.close()
+
+    def execute_query(self, query, parameters=None):
+        """Execute a given Cypher query."""
+        with self.driver.session() as session:
+            try:
+                result = session.run(query, parameters)
+                return [record for record in result]
+            except Exception as e:
+                print(f"Query execution failed: {e}")
+
+    def write_summary_nodes(self, aggregates):
+        """
+        Materialise the precomputed aggregates as summary nodes:
+        (:Category)-[:HAS_LINE]->(:Line), (:Category)-[:HAS_ZONE]->(:Zone) and
+        (:Category)-[:HAS_FACILITY]->(:Facility), plus counts and the degree
+        distribution on each Category.
+        """
+        self.execute_query(
+            """
+            MATCH (c:Category {name: 'LUAS'})
+            UNWIND $lines AS line
+            MERGE (l:Line {name: line.name, network: 'LUAS'})
+            SET l.station_count = line.station_count, l.total_footfall = line.total_footfall
+            MERGE (c)-[:HAS_LINE]->(l)
+            """,
+            {"lines": [{"name": name, **values} for name, values in aggregates["luas_lines"].items()]},
+        )
+        self.execute_query(
+            """
+            MATCH (c:Category {name: 'LUAS'})
+            UNWIND $zones AS zone
+            MERGE (z:Zone {name: zone.name, network: 'LUAS'})
+            SET z.station_count = zone.station_count
+            MERGE (c)-[:HAS_ZONE]->(z)
+            """,
+            {"zones": [{"name": name, "station_count": count} for name, count in aggregates["luas_zones"].items()]},
+        )
+        self.execute_query(
+            """
+            MATCH (c:Category {name: 'DART'})
+            UNWIND $facilities AS facility
+            MERGE (f:Facility {name: facility.name, network: 'DART'})
+            SET f.station_count = facility.station_count
+            MERGE (c)-[:HAS_FACILITY]->(f)
+            """,
+            {"facilities": [
+                {"name": name, "station_count": count} for name, count in aggregates["dart_facilities"].items()
+            ]},
+        )
+        self.execute_query(
+            """
+            UNWIND $categories AS category
+            MATCH (c:Category {name: category.name})
+            SET c.station_count = category.station_count,
+                c.degree_values = category.degree_values,
+                c.degree_counts = category.degree_counts
+            """,
+            {"categories": [
+                {
+                    "name": name,
+                    "station_count": aggregates["station_counts"][name],
+                    "degree_values": [int(value) for value in aggregates["degree_distribution"][name]],
+                    "degree_counts": list(aggregates["degree_distribution"][name].values()),
+                }
+                for name in aggregates["station_counts"]
+            ]},
+        )
+        print("Aggregate summary nodes written.")
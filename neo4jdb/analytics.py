@@ -0,0 +1,169 @@
+from utils.centrality import path_centrality, default_workers
+from utils.community import louvain_communities, modularity
+from utils.contraction import ContractionHierarchy
+from utils.components import ReachabilityIndex
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROUTING_INDEX_DIR = os.path.join(PROJECT_ROOT, "data", "routing")
+
+
+def fetch_adjacency(executor, node_query, edge_query, weight_default=1.0, combine=min):
+    """
+    Load an undirected weighted adjacency {node_id: {neighbour_id: weight}} from Neo4j.
+    node_query must return `id`; edge_query must return `source`, `target` and `weight`.
+    Parallel edges between the same pair are merged with `combine` (cheapest by default).
+    """
+    adjacency = {}
+    for record in executor.execute_query(node_query) or []:
+        adjacency.setdefault(record["id"], {})
+    for record in executor.execute_query(edge_query) or []:
+        source, target = record["source"], record["target"]
+        if source == target:
+            continue
+        weight = record["weight"] if record["weight"] is not None else weight_default
+        adjacency.setdefault(source, {})
+        adjacency.setdefault(target, {})
+        if target in adjacency[source]:
+            weight = combine(adjacency[source][target], weight)
+        adjacency[source][target] = weight
+        adjacency[target][source] = weight
+    return adjacency
+
+
+def write_node_properties(executor, rows, properties):
+    """
+    Write computed scores back as node properties in a single batched query.
+    Each row is a dict with `id` (elementId) and one key per property.
+    """
+    assignments = ", ".join(f"n.{prop} = row.{prop}" for prop in properties)
+    query = f"""
+    UNWIND $rows AS row
+    MATCH (n) WHERE elementId(n) = row.id
+    SET {assignments}
+    """
+    executor.execute_query(query, parameters={"rows": rows})
+
+
+def run_path_centrality(executor, node_query, edge_query, sample_size=None, workers=None, weighted=False):
+    """
+    Compute betweenness and closeness centrality for one network and store them
+    as `betweenness` and `closeness` node properties.
+    """
+    adjacency = fetch_adjacency(executor, node_query, edge_query)
+    if workers is None:
+        workers = default_workers()
+    scores = path_centrality(adjacency, sample_size=sample_size, workers=workers, weighted=weighted)
+    rows = [
+        {"id": node, "betweenness": betweenness, "closeness": closeness}
+        for node, (betweenness, closeness) in scores.items()
+    ]
+    write_node_properties(executor, rows, ["betweenness", "closeness"])
+    return sorted(rows, key=lambda row: row["betweenness"], reverse=True)
+
+
+def run_community_detection(executor, node_query, edge_query, resolution=1.0, seed=None):
+    """
+    Detect communities with Louvain and store the id as a `community` node property.
+    Parallel edges are summed, so pairs linked in several ways pull harder together.
+    """
+    adjacency = fetch_adjacency(executor, node_query, edge_query, combine=lambda a, b: a + b)
+    communities = louvain_communities(adjacency, resolution=resolution, seed=seed)
+    rows = [{"id": node, "community": community} for node, community in communities.items()]
+    write_node_properties(executor, rows, ["community"])
+    return communities, modularity(adjacency, communities, resolution)
+
+
+def routing_index_path(category, directory=ROUTING_INDEX_DIR):
+    return os.path.join(directory, f"{category.lower()}_ch.json")
+
+
+def build_routing_index(executor, category, node_query, edge_query, directory=ROUTING_INDEX_DIR):
+    """
+    Preprocess one network into a contraction hierarchy and store it on disk.
+    The queries should key nodes by station name, as shortest-path lookups do.
+    """
+    adjacency = fetch_adjacency(executor, node_query, edge_query)
+    hierarchy = ContractionHierarchy.build(adjacency)
+    hierarchy.save(routing_index_path(category, directory))
+    return hierarchy
+
+
+def load_routing_index(category, directory=ROUTING_INDEX_DIR):
+    """The stored contraction hierarchy of a network, or None if it has not been built."""
+    path = routing_index_path(category, directory)
+    return ContractionHierarchy.load(path) if os.path.exists(path) else None
+
+
+def reachability_index_path(category, directory=ROUTING_INDEX_DIR):
+    return os.path.join(directory, f"{category.lower()}_components.json")
+
+
+def build_reachability_index(executor, category, node_query, edge_query, extra_edges=(),
+                             directed=False, property_name="component", directory=ROUTING_INDEX_DIR):
+    """
+    Label the connected components of one network, store the index on disk and write
+    each node's component id as `property_name` (skipped when None). node_query must
+    return `id` (the lookup key) and `element_id`; edge_query must return `source` and
+    `target` keys. `extra_edges` adds links between keys that only exist in the index,
+    such as terminus aliases.
+    """
+    nodes = executor.execute_query(node_query) or []
+    edges = [(record["source"], record["target"]) for record in executor.execute_query(edge_query) or []]
+    index = ReachabilityIndex.from_edges(
+        [record["id"] for record in nodes], edges + list(extra_edges), directed=directed
+    )
+    index.save(reachability_index_path(category, directory))
+    if property_name:
+        rows = [{"id": record["element_id"], property_name: index.component_of(record["id"])} for record in nodes]
+        write_node_properties(executor, rows, [property_name])
+    return index
+
+
+def load_reachability_index(category, directory=ROUTING_INDEX_DIR):
+    """The stored reachability index of a network, or None if it has not been built."""
+    path = reachability_index_path(category, directory)
+    return ReachabilityIndex.load(path) if os.path.exists(path) else None
+
+
+# Score properties that can be paged; indexed per label so ORDER BY ... LIMIT walks the index
+RANKED_PROPERTIES = ("rank", "degree", "betweenness", "closeness")
+CATEGORY_LABELS = {"DART": "Station", "LUAS": "Station", "BUS": "Stop"}
+# Relationship from a Category to the nodes of its network graph
+CATEGORY_MEMBERSHIP = {"DART": "HAS_STATION", "LUAS": "HAS_STATION", "BUS": "HAS_STOP"}
+
+
+def create_ranking_indexes(executor):
+    """Create range indexes on every ranked score property of Station and Stop nodes."""
+    for label in sorted(set(CATEGORY_LABELS.values())):
+        for prop in RANKED_PROPERTIES:
+            executor.execute_query(
+                f"CREATE INDEX {label.lower()}_{prop} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})"
+            )
+
+
+def fetch_ranked_page(executor, category, prop, limit=25, cursor=None):
+    """
+    One page of a network's nodes ordered by `prop` descending, using keyset pagination:
+    `cursor` is the (score, id) of the last row of the previous page, so each page costs
+    the same regardless of depth. Returns (rows, next cursor or None).
+    """
+    if prop not in RANKED_PROPERTIES:
+        raise ValueError(f"Unsupported ranking property '{prop}'")
+    label = CATEGORY_LABELS[category]
+    query = f"""
+    MATCH (n:{label})
+    WHERE n.{prop} IS NOT NULL
+      AND ($score IS NULL OR n.{prop} < $score OR (n.{prop} = $score AND elementId(n) > $id))
+      AND EXISTS {{ MATCH (:Category {{name: $category}})-[:{CATEGORY_MEMBERSHIP[category]}]->(n) }}
+    RETURN elementId(n) AS id, coalesce(n.name, n.`Route Number`) AS name, n.{prop} AS score
+    ORDER BY score DESC, id ASC
+    LIMIT $limit
+    """
+    score, node_id = cursor if cursor else (None, None)
+    rows = executor.execute_query(
+        query, {"category": category, "score": score, "id": node_id, "limit": limit}
+    ) or []
+    rows = [{"id": record["id"], "name": record["name"], "score": record["score"]} for record in rows]
+    next_cursor = (rows[-1]["score"], rows[-1]["id"]) if len(rows) == limit else None
+    return rows, next_cursor
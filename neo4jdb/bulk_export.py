@@ -0,0 +1,290 @@
+from neo4jdb.Master_Node import TRANSPORT_CATEGORIES
+from neo4jdb.Bus import bus_route_properties
+from neo4jdb.ingest import read_rows
+from utils.model import route_from_row, to_float
+from utils.network_rows import (
+    dart_station_properties, dart_route_edges, luas_station_properties, luas_line_edges,
+    bus_route_stops, bus_stop_edges, canonical_route_edges,
+)
+import csv
+import glob
+import os
+
+NODE_PREFIX = "nodes_"
+RELATIONSHIP_PREFIX = "relationships_"
+ARRAY_DELIMITER = ";"
+
+# Node property columns as (key, neo4j-admin type); CSV numbers are converted to match
+NAME_COLUMNS = [("name", "string")]
+CATEGORY_COLUMNS = [
+    ("name", "string"), ("type", "string"), ("operator", "string"), ("routes_count", "int"), ("description", "string"),
+]
+DART_STATION_COLUMNS = [
+    (key, "string") for key in (
+        "name", "operational", "location", "address", "eircode", "atm", "weekend_working", "wifi",
+        "refreshments", "phone_charging", "ticket_machine", "smart_card_enabled", "routes_serviced",
+    )
+]
+LUAS_STATION_COLUMNS = [
+    ("name", "string"), ("Line", "string"), ("Station_ID", "string"), ("Location", "string"),
+    ("Key_Features_Attractions", "string"), ("Type", "string"), ("Interchange", "string"), ("Zone", "string"),
+    ("Daily_Footfall", "int"), ("Facilities", "string"), ("Accessibility", "string"),
+    ("Latitude", "float"), ("Longitude", "float"), ("Parking_Availability", "string"),
+    ("Nearby_Landmarks", "string"), ("First_Tram_Time", "string"), ("Last_Tram_Time", "string"),
+]
+BUS_ROUTE_COLUMNS = [
+    (key, "string") for key in (
+        "Route Number", "From", "To", "Route Type", "Frequency", "Duration", "Key Landmarks",
+        "Peak Hours", "Operator", "Primary Areas Served",
+    )
+]
+
+
+def _typed(value, kind):
+    """A node property value as its column type; unparsable numbers are left empty."""
+    if kind in ("int", "float") and not isinstance(value, (int, float)):
+        value = to_float(value)
+        if value is None:
+            return None
+    if kind == "int" and value is not None:
+        return int(value)
+    return value
+
+
+class AdminCsvExporter:
+    def __init__(self, dart_csv_path, luas_csv_path, bus_csv_path):
+        """
+        Write the transport graph as header-annotated CSVs for `neo4j-admin database import`.
+        """
+        self.dart_csv_path = dart_csv_path
+        self.luas_csv_path = luas_csv_path
+        self.bus_csv_path = bus_csv_path
+
+    @staticmethod
+    def _write(path, header, rows):
+        with open(path, mode='w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            count = 0
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def _write_nodes(self, directory, name, id_space, label, records, columns):
+        """records are (id, properties); columns are (key, neo4j type) pairs."""
+        header = [f":ID({id_space})"]
+        header += [f"{key}:{kind}" if kind != "string" else key for key, kind in columns]
+        header.append(":LABEL")
+        rows = (
+            [node_id] + [_typed(props.get(key), kind) for key, kind in columns] + [label]
+            for node_id, props in records
+        )
+        return self._write(os.path.join(directory, f"{NODE_PREFIX}{name}.csv"), header, rows)
+
+    def _write_relationships(self, directory, name, start_space, end_space, rel_type, records, columns=()):
+        """records are (start id, end id, properties); columns are (key, neo4j type) pairs."""
+        header = [f":START_ID({start_space})", f":END_ID({end_space})"]
+        header += [f"{key}:{kind}" if kind != "string" else key for key, kind in columns]
+        header.append(":TYPE")
+        rows = (
+            [start, end] + [props[key] for key, _ in columns] + [rel_type]
+            for start, end, props in records
+        )
+        return self._write(os.path.join(directory, f"{RELATIONSHIP_PREFIX}{name}.csv"), header, rows)
+
+    def export(self, output_dir):
+        """
+        Export every node and relationship type. Returns {file name: row count}.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        dart_rows = list(read_rows(self.dart_csv_path))
+        luas_rows = list(read_rows(self.luas_csv_path))
+        bus_rows = list(read_rows(self.bus_csv_path))
+        counts = {}
+
+        counts["country"] = self._write_nodes(output_dir, "country", "Country", "Country", [("Ireland", {"name": "Ireland"})], NAME_COLUMNS)
+        counts["category"] = self._write_nodes(
+            output_dir, "category", "Category", "Category",
+            [(category["name"], category) for category in TRANSPORT_CATEGORIES], CATEGORY_COLUMNS,
+        )
+        counts["dart_station"] = self._write_nodes(
+            output_dir, "dart_station", "DartStation", "Station",
+            [(row["StationName"], dart_station_properties(row)) for row in dart_rows], DART_STATION_COLUMNS,
+        )
+        counts["luas_station"] = self._write_nodes(
+            output_dir, "luas_station", "LuasStation", "Station",
+            [(row["Station_ID"], luas_station_properties(row)) for row in luas_rows], LUAS_STATION_COLUMNS,
+        )
+        counts["bus_route"] = self._write_nodes(
+            output_dir, "bus_route", "BusRoute", "Route",
+            [(row["Route Number"], bus_route_properties(row)) for row in bus_rows], BUS_ROUTE_COLUMNS,
+        )
+        bus_stops = sorted({stop for row in bus_rows for stop in bus_route_stops(row)})
+        counts["bus_stop"] = self._write_nodes(
+            output_dir, "bus_stop", "BusStop", "Stop", [(stop, {"name": stop}) for stop in bus_stops], NAME_COLUMNS,
+        )
+
+        counts["has_transport"] = self._write_relationships(
+            output_dir, "has_transport", "Country", "Category", "HAS_TRANSPORT",
+            [("Ireland", category["name"], {}) for category in TRANSPORT_CATEGORIES],
+        )
+        counts["has_station_dart"] = self._write_relationships(
+            output_dir, "has_station_dart", "Category", "DartStation", "HAS_STATION",
+            [("DART", row["StationName"], {}) for row in dart_rows],
+        )
+        counts["has_station_luas"] = self._write_relationships(
+            output_dir, "has_station_luas", "Category", "LuasStation", "HAS_STATION",
+            [("LUAS", row["Station_ID"], {}) for row in luas_rows],
+        )
+        counts["has_route"] = self._write_relationships(
+            output_dir, "has_route", "Category", "BusRoute", "HAS_ROUTE",
+            [("BUS", row["Route Number"], {}) for row in bus_rows],
+        )
+        counts["has_stop"] = self._write_relationships(
+            output_dir, "has_stop", "Category", "BusStop", "HAS_STOP",
+            [("BUS", stop, {}) for stop in bus_stops],
+        )
+        counts["connected_by_route"] = self._write_relationships(
+            output_dir, "connected_by_route", "DartStation", "DartStation", "CONNECTED_BY_ROUTE",
+            [
+                (edge["Station1"], edge["Station2"], {"route": edge["Route"], "distance_km": edge["Distance"]})
+                for edge in dart_route_edges(dart_rows)
+            ],
+            columns=[("route", "string"), ("distance_km", "float")],
+        )
+        luas_ids = {row["Station Name"]: row["Station_ID"] for row in luas_rows}
+        counts["connected_by_line"] = self._write_relationships(
+            output_dir, "connected_by_line", "LuasStation", "LuasStation", "CONNECTED_BY_LINE",
+            [
+                (luas_ids[edge["Station1"]], luas_ids[edge["Station2"]], {"line": edge["Line"]})
+                for edge in luas_line_edges(luas_rows)
+            ],
+            columns=[("line", "string")],
+        )
+        counts["connected_to"] = self._write_relationships(
+            output_dir, "connected_to", "BusRoute", "BusRoute", "CONNECTED_TO",
+            [
+                (edge["source"], edge["target"], edge)
+                for edge in canonical_route_edges([route_from_row(row) for row in bus_rows])
+            ],
+            columns=[("shared_landmarks", "int"), ("shared_termini", "int"), ("area_overlap", "float"), ("weight", "float")],
+        )
+        counts["connects"] = self._write_relationships(
+            output_dir, "connects", "BusStop", "BusStop", "CONNECTS",
+            [
+                (edge["source"], edge["target"], {"route": edge["route"], "duration_mins": edge["duration"]})
+                for row in bus_rows for edge in bus_stop_edges(row)
+            ],
+            columns=[("route", "string"), ("duration_mins", "float")],
+        )
+        print(f"neo4j-admin CSVs written to {output_dir}")
+        return counts
+
+    @staticmethod
+    def import_command(output_dir, database="neo4j"):
+        """
+        Build the offline import command for the exported files.
+        Neo4j must be stopped (or the database offline) while it runs.
+        """
+        nodes = sorted(glob.glob(os.path.join(output_dir, f"{NODE_PREFIX}*.csv")))
+        relationships = sorted(glob.glob(os.path.join(output_dir, f"{RELATIONSHIP_PREFIX}*.csv")))
+        parts = ["neo4j-admin", "database", "import", "full", database, "--overwrite-destination=true"]
+        parts += [f"--nodes={path}" for path in nodes]
+        parts += [f"--relationships={path}" for path in relationships]
+        return " ".join(f'"{part}"' if " " in part else part for part in parts)
+
+
+class AdminCsvLoader:
+    def __init__(self, directory):
+        """
+        Stream header-annotated neo4j-admin CSVs without Neo4j, as a local stand-in
+        for the offline importer. Files are read one row at a time.
+        """
+        self.directory = directory
+
+    @staticmethod
+    def _parse_header(header):
+        """Split each header field into (property name, role or type, id space)."""
+        fields = []
+        for field in header:
+            name, _, kind = field.partition(":")
+            space = None
+            if "(" in kind and kind.endswith(")"):
+                kind, space = kind[:-1].split("(", 1)
+            fields.append((name, kind or "string", space))
+        return fields
+
+    @staticmethod
+    def _convert(value, kind):
+        if kind.endswith("[]"):
+            return [AdminCsvLoader._convert(item, kind[:-2]) for item in value.split(ARRAY_DELIMITER)] if value else []
+        if value == "":
+            return None
+        if kind in ("int", "long", "short", "byte"):
+            return int(value)
+        if kind in ("float", "double"):
+            return float(value)
+        if kind == "boolean":
+            return value.lower() == "true"
+        return value
+
+    def _stream(self, prefix):
+        for path in sorted(glob.glob(os.path.join(self.directory, f"{prefix}*.csv"))):
+            with open(path, mode='r', encoding='utf-8', newline='') as file:
+                reader = csv.reader(file)
+                fields = self._parse_header(next(reader))
+                for row in reader:
+                    yield fields, row
+
+    def iter_nodes(self):
+        """Yield ((id space, id), labels, properties) for every node row."""
+        for fields, row in self._stream(NODE_PREFIX):
+            node_id, labels, props = None, [], {}
+            for (name, kind, space), value in zip(fields, row):
+                if kind == "ID":
+                    node_id = (space, value)
+                    if name:
+                        props[name] = value
+                elif kind == "LABEL":
+                    labels = [label for label in value.split(ARRAY_DELIMITER) if label]
+                elif kind != "IGNORE":
+                    converted = self._convert(value, kind)
+                    if converted is not None:
+                        props[name] = converted
+            yield node_id, labels, props
+
+    def iter_relationships(self):
+        """Yield (start key, end key, type, properties) for every relationship row."""
+        for fields, row in self._stream(RELATIONSHIP_PREFIX):
+            start = end = rel_type = None
+            props = {}
+            for (name, kind, space), value in zip(fields, row):
+                if kind == "START_ID":
+                    start = (space, value)
+                elif kind == "END_ID":
+                    end = (space, value)
+                elif kind == "TYPE":
+                    rel_type = value
+                elif kind != "IGNORE":
+                    converted = self._convert(value, kind)
+                    if converted is not None:
+                        props[name] = converted
+            yield start, end, rel_type, props
+
+    def to_networkx(self):
+        """Load the files into an in-process NetworkX multigraph in one pass."""
+        import networkx as nx
+
+        graph = nx.MultiDiGraph()
+        for node_id, labels, props in self.iter_nodes():
+            graph.add_node(node_id, labels=labels, **props)
+        for start, end, rel_type, props in self.iter_relationships():
+            graph.add_edge(start, end, type=rel_type, **props)
+        return graph
+
+    def to_snapshot(self):
+        """Load the files straight into a binary GraphSnapshot."""
+        from neo4jdb.snapshot import GraphSnapshot
+
+        return GraphSnapshot.from_records(self.iter_nodes(), self.iter_relationships())
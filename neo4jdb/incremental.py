@@ -0,0 +1,151 @@
+from neo4jdb.analytics import CATEGORY_MEMBERSHIP, write_node_properties
+from utils.incremental import IncrementalPageRank
+import json
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STATE_DIR = os.path.join(PROJECT_ROOT, "data", "analytics_state")
+NETWORK_RELATIONSHIPS = {"DART": "CONNECTED_BY_ROUTE", "LUAS": "CONNECTED_BY_LINE", "BUS": "CONNECTS"}
+
+
+def node_key(variable):
+    """Business key that survives a clear and re-import, unlike elementId."""
+    return f"coalesce({variable}.Station_ID, {variable}.name, {variable}.`Route Number`)"
+
+
+class IncrementalAnalytics:
+    def __init__(self, executor, state_dir=DEFAULT_STATE_DIR, write_tolerance=1e-6):
+        """
+        Keep `degree` and `rank` (PageRank) node properties current per network. The edge
+        list of the last run is stored with the PageRank state; the next run diffs against
+        it, updates degrees of touched nodes in place, pushes PageRank locally from the
+        previous vector and writes back only the nodes that changed: those with a new degree
+        or whose rank drifted more than `write_tolerance` from the value last written.
+        """
+        self.executor = executor
+        self.state_dir = state_dir
+        self.write_tolerance = write_tolerance
+
+    def _state_path(self, category):
+        return os.path.join(self.state_dir, f"{category.lower()}.json")
+
+    def load_state(self, category):
+        try:
+            with open(self._state_path(category), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def save_state(self, category, state):
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(self._state_path(category), "w", encoding="utf-8") as file:
+            json.dump(state, file)
+
+    def reset(self, category):
+        """Drop the saved state so the next refresh recomputes from scratch."""
+        if os.path.exists(self._state_path(category)):
+            os.remove(self._state_path(category))
+
+    def fetch_graph(self, category):
+        """({key: elementId}, {(key, key): relationship count}) for one network."""
+        nodes = self.executor.execute_query(
+            f"""
+            MATCH (:Category {{name: $category}})-[:{CATEGORY_MEMBERSHIP[category]}]->(n)
+            RETURN {node_key("n")} AS key, elementId(n) AS id
+            """,
+            {"category": category},
+        ) or []
+        edges = self.executor.execute_query(
+            f"""
+            MATCH (c:Category {{name: $category}})-[:{CATEGORY_MEMBERSHIP[category]}]->(n)-[:{NETWORK_RELATIONSHIPS[category]}]->(m),
+                  (c)-[:{CATEGORY_MEMBERSHIP[category]}]->(m)
+            RETURN {node_key("n")} AS source, {node_key("m")} AS target, count(*) AS count
+            """,
+            {"category": category},
+        ) or []
+        counts = {}
+        for record in edges:
+            key = tuple(sorted((record["source"], record["target"])))
+            counts[key] = counts.get(key, 0) + record["count"]
+        return {record["key"]: record["id"] for record in nodes}, counts
+
+    def refresh(self, category):
+        """
+        Bring degree and PageRank of one network up to date. Returns a summary with the
+        mode ("full" or "incremental"), touched edge pairs and written nodes.
+        """
+        ids, counts = self.fetch_graph(category)
+        state = self.load_state(category)
+
+        if state is None:
+            engine = IncrementalPageRank.from_edges(ids, (pair for pair in counts if pair[0] != pair[1]))
+            degree = self._degrees(ids, counts)
+            written = {}
+            to_write = set(ids)
+            mode, touched = "full", len(counts)
+        else:
+            old_counts = {tuple(pair): count for *pair, count in state["edges"]}
+            engine = IncrementalPageRank.from_dict(state["pagerank"], (pair for pair in old_counts if pair[0] != pair[1]))
+            degree = state["degree"]
+            written = state["written"]
+            previous_ids = state["ids"]
+
+            added_nodes = [key for key in ids if key not in previous_ids]
+            removed_nodes = [key for key in previous_ids if key not in ids]
+            engine.add_nodes(added_nodes)
+            for key in added_nodes:
+                degree[key] = 0
+
+            touched_pairs = [pair for pair in set(old_counts) | set(counts) if old_counts.get(pair, 0) != counts.get(pair, 0)]
+            touched_nodes = set(added_nodes)
+            for pair in touched_pairs:
+                before, after = old_counts.get(pair, 0), counts.get(pair, 0)
+                for key in pair:
+                    if key in degree:
+                        degree[key] += after - before
+                        touched_nodes.add(key)
+                if pair[0] == pair[1]:
+                    continue
+                if before and not after:
+                    engine.remove_edge(*pair)
+                elif after and not before and all(key in ids for key in pair):
+                    engine.add_edge(*pair)
+
+            engine.remove_nodes(removed_nodes)
+            for key in removed_nodes:
+                degree.pop(key, None)
+                written.pop(key, None)
+                touched_nodes.discard(key)
+            # Re-imported nodes keep their key but lost their properties
+            recreated = {key for key in ids if key in previous_ids and previous_ids[key] != ids[key]}
+            to_write = touched_nodes | recreated
+            mode, touched = "incremental", len(touched_pairs)
+
+        for key in engine.settle():
+            if key not in written or abs(engine.rank[key] - written[key]) > self.write_tolerance:
+                to_write.add(key)
+        rows = [
+            {"id": ids[key], "degree": degree.get(key, 0), "rank": engine.rank[key]}
+            for key in to_write if key in ids
+        ]
+        if rows:
+            write_node_properties(self.executor, rows, ["degree", "rank"])
+            written.update((key, engine.rank[key]) for key in to_write if key in ids)
+        self.save_state(category, {
+            "ids": ids,
+            "edges": [[*pair, count] for pair, count in counts.items()],
+            "degree": degree,
+            "written": written,
+            "pagerank": engine.to_dict(),
+        })
+        print(f"{category} analytics ({mode}): {touched} edge pairs touched, {len(rows)} nodes written.")
+        return {"mode": mode, "touched_edges": touched, "written": len(rows)}
+
+    @staticmethod
+    def _degrees(ids, counts):
+        """Relationship endpoints per node, parallel edges included, as COUNT(r) gives."""
+        degree = {key: 0 for key in ids}
+        for (source, target), count in counts.items():
+            degree[source] = degree.get(source, 0) + count
+            degree[target] = degree.get(target, 0) + count
+        return degree
@@ -0,0 +1,95 @@
+from queue import Queue
+from neo4jdb.pipeline import file_fingerprint
+import csv
+import threading
+
+_DONE = object()
+
+
+def read_rows(csv_file_path, encoding="latin1"):
+    """Yield the rows of a CSV one at a time; the file is read once, front to back."""
+    with open(csv_file_path, mode='r', encoding=encoding, newline='') as file:
+        yield from csv.DictReader(file)
+
+
+def csv_fingerprint(csv_file_path, batch_size=500):
+    """Checkpoint fingerprint of a streamed CSV import: the file's content hash and batch size."""
+    return f"{file_fingerprint(csv_file_path)}:{batch_size}"
+
+
+def validate_rows(rows, required=(), numeric=(), rejected=None):
+    """
+    Pass through rows whose `required` fields are non-empty and whose `numeric` fields
+    parse as floats. Rejected rows are counted in `rejected` (keyed by reason) and dropped.
+    """
+    for number, row in enumerate(rows, start=2):
+        missing = [field for field in required if not (row.get(field) or "").strip()]
+        if missing:
+            reason = f"missing {', '.join(missing)}"
+        else:
+            reason = None
+            for field in numeric:
+                try:
+                    float(row[field])
+                except (TypeError, ValueError):
+                    reason = f"non-numeric {field}"
+                    break
+        if reason is None:
+            yield row
+        elif rejected is not None:
+            rejected[reason] = rejected.get(reason, 0) + 1
+            print(f"Skipping CSV line {number}: {reason}")
+
+
+def batch_stream(items, batch_size=500):
+    """
+    Group a stream of (kind, row) items into batches {kind: [rows]} of at most
+    `batch_size` items. Kinds keep their first-seen order within each batch.
+    """
+    batch, size = {}, 0
+    for kind, row in items:
+        batch.setdefault(kind, []).append(row)
+        size += 1
+        if size >= batch_size:
+            yield batch
+            batch, size = {}, 0
+    if size:
+        yield batch
+
+
+def prefetch(iterable, depth=2):
+    """
+    Produce items of `iterable` on a background thread into a queue of `depth` slots.
+    Parsing overlaps with the consumer's writes, and the producer blocks while the queue
+    is full, so at most `depth` items wait in memory however fast the file is read.
+    """
+    queue = Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    return
+                queue.put(item)
+            queue.put(_DONE)
+        except BaseException as e:
+            queue.put(e)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Unblock the producer if the consumer stopped early
+        stop.set()
+        while thread.is_alive():
+            while not queue.empty():
+                queue.get_nowait()
+            thread.join(timeout=0.05)
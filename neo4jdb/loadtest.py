@@ -0,0 +1,261 @@
+from neo4jdb.analytics import fetch_ranked_page
+from neo4jdb.Dart import DartExecution
+from neo4jdb.Luas import LuasExecution
+from neo4jdb.Bus import BusExecution, stop_graph
+from neo4jdb.warmup import shortest_path
+from neo4jdb.ingest import read_rows
+from utils.contraction import ContractionHierarchy
+from utils.network_rows import dart_route_edges, luas_line_edges, bus_route_stops, bus_stop_edges
+from utils.routing import bidirectional_dijkstra
+from utils.centrality import pagerank
+import random
+import statistics
+import threading
+import time
+
+FLOW_WEIGHTS = {"degree": 0.4, "shortest_path": 0.3, "pagerank": 0.3}
+WAIT_THRESHOLD_MS = 1.0
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers; 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+class ConnectionPool:
+    def __init__(self, size):
+        """
+        Gate queries to `size` concurrent connections and record how long each request
+        waited for one. Sized like the driver pool, it makes saturation visible.
+        """
+        self.size = size
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.peak = 0
+        self.waits = []
+
+    def __enter__(self):
+        start = time.perf_counter()
+        self._slots.acquire()
+        waited = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.in_use += 1
+            self.peak = max(self.peak, self.in_use)
+            self.waits.append(waited)
+        return self
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.in_use -= 1
+        self._slots.release()
+        return False
+
+
+class Neo4jTarget:
+    def __init__(self, uri, user, password, luas_csv_path, pool_size=100):
+        """
+        The dashboard flows against a live Neo4j through one shared driver, as a Streamlit
+        server has. Paths go through the dashboard's own executors: reachability check,
+        then the contraction hierarchy (DART), geo A* (LUAS) or the stop graph (BUS).
+        As on the dashboard, a failed path query is printed and answers with no path.
+        """
+        from neo4j import GraphDatabase
+
+        self.driver = GraphDatabase.driver(uri, auth=(user, password), max_connection_pool_size=pool_size)
+        self.executors = {
+            "DART": DartExecution(uri, user, password, driver=self.driver),
+            "LUAS": LuasExecution(uri, user, password, driver=self.driver),
+            "BUS": BusExecution(uri, user, password, driver=self.driver),
+        }
+        self.executors["LUAS"].build_spatial_index(luas_csv_path)
+
+    def close(self):
+        self.driver.close()
+
+    def execute_query(self, query, parameters=None):
+        """Unlike the executors' execute_query, errors propagate so they are counted."""
+        with self.driver.session() as session:
+            return [record for record in session.run(query, parameters)]
+
+    def degree_page(self, category, limit):
+        return fetch_ranked_page(self, category, "degree", limit)[0]
+
+    def pagerank_page(self, category, limit):
+        return fetch_ranked_page(self, category, "rank", limit)[0]
+
+    def shortest_path(self, category, start, end):
+        return shortest_path(self.executors, category, start, end)
+
+
+class LocalTarget:
+    def __init__(self, aggregates, dart_rows, luas_rows, bus_rows=()):
+        """
+        In-process stand-in answering the same flows from the CSVs, for running the
+        harness without Neo4j (e.g. to check the harness itself or Python-side overhead).
+        """
+        self.degree = aggregates["degree"]
+        self.adjacency = {
+            "DART": self._adjacency((edge["Station1"], edge["Station2"], edge["Distance"]) for edge in dart_route_edges(dart_rows)),
+            "LUAS": self._adjacency((edge["Station1"], edge["Station2"], 1.0) for edge in luas_line_edges(luas_rows)),
+            "BUS": stop_graph(edge for row in bus_rows for edge in bus_stop_edges(row))[0],
+        }
+        self.rank = {
+            category: sorted(pagerank(adjacency).items(), key=lambda item: item[1], reverse=True)
+            for category, adjacency in self.adjacency.items()
+        }
+        # Rail paths are answered from contraction hierarchies and bus paths by bidirectional
+        # Dijkstra over the stop graph, as the dashboard does
+        self.hierarchy = {category: ContractionHierarchy.build(self.adjacency[category]) for category in ("DART", "LUAS")}
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def _adjacency(edges):
+        adjacency = {}
+        for source, target, weight in edges:
+            adjacency.setdefault(source, {})[target] = weight
+            adjacency.setdefault(target, {})[source] = weight
+        return adjacency
+
+    def degree_page(self, category, limit):
+        return list(self.degree[category].items())[:limit]
+
+    def pagerank_page(self, category, limit):
+        return self.rank.get(category, [])[:limit]
+
+    def shortest_path(self, category, start, end):
+        if category == "BUS":
+            return bidirectional_dijkstra(self.adjacency["BUS"], start, end)
+        return self.hierarchy[category].shortest_path(start, end)
+
+
+class LoadTest:
+    def __init__(self, target, stations, sessions=10, duration=10.0, pool_size=10,
+                 think_ms=0.0, page_size=25, flow_weights=None, seed=None):
+        """
+        Simulate `sessions` concurrent dashboard users for `duration` seconds. Each session
+        repeatedly picks a flow (degree page, shortest path, PageRank page) by weight.
+        `stations` maps a network to the station (or BUS stop) names used for path queries.
+        """
+        self.target = target
+        self.stations = stations
+        self.sessions = sessions
+        self.duration = duration
+        self.pool = ConnectionPool(pool_size)
+        self.think_ms = think_ms
+        self.page_size = page_size
+        self.flow_weights = flow_weights or FLOW_WEIGHTS
+        self.seed = seed
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def _request(self, flow, rng):
+        if flow == "shortest_path":
+            category = rng.choice(sorted(self.stations))
+            start, end = rng.sample(self.stations[category], 2)
+            return lambda: self.target.shortest_path(category, start, end)
+        category = rng.choice(["DART", "LUAS", "BUS"])
+        if flow == "degree":
+            return lambda: self.target.degree_page(category, self.page_size)
+        return lambda: self.target.pagerank_page(category, self.page_size)
+
+    def _session(self, number, deadline):
+        rng = random.Random(None if self.seed is None else self.seed + number)
+        flows, weights = zip(*self.flow_weights.items())
+        samples = []
+        while time.perf_counter() < deadline:
+            flow = rng.choices(flows, weights)[0]
+            request = self._request(flow, rng)
+            start = time.perf_counter()
+            error = None
+            try:
+                with self.pool:
+                    request()
+            except Exception as e:
+                error = e.__class__.__name__
+            samples.append((flow, (time.perf_counter() - start) * 1000, error))
+            if self.think_ms:
+                time.sleep(rng.expovariate(1000.0 / self.think_ms))
+        with self._lock:
+            self.samples.extend(samples)
+
+    def run(self):
+        """Run every session to the deadline and return the report dict."""
+        self.samples = []
+        start = time.perf_counter()
+        deadline = start + self.duration
+        threads = [threading.Thread(target=self._session, args=(number, deadline)) for number in range(self.sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed):
+        """Latency percentiles and throughput per flow and overall, plus pool saturation."""
+        def summary(samples):
+            latencies = [latency for _, latency, error in samples if error is None]
+            return {
+                "requests": len(samples),
+                "errors": sum(1 for _, _, error in samples if error is not None),
+                "throughput": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+                "p50_ms": round(percentile(latencies, 0.50), 2),
+                "p95_ms": round(percentile(latencies, 0.95), 2),
+                "p99_ms": round(percentile(latencies, 0.99), 2),
+                "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+            }
+
+        flows = {flow: summary([s for s in self.samples if s[0] == flow]) for flow in self.flow_weights}
+        waits = self.pool.waits
+        errors = {}
+        for _, _, error in self.samples:
+            if error is not None:
+                errors[error] = errors.get(error, 0) + 1
+        return {
+            "sessions": self.sessions,
+            "elapsed_s": round(elapsed, 2),
+            "overall": summary(self.samples),
+            "flows": flows,
+            "errors": errors,
+            "pool": {
+                "size": self.pool.size,
+                "peak_in_use": self.pool.peak,
+                "waited_pct": round(100.0 * sum(1 for w in waits if w > WAIT_THRESHOLD_MS) / len(waits), 1) if waits else 0.0,
+                "p95_wait_ms": round(percentile(waits, 0.95), 2),
+            },
+        }
+
+    @staticmethod
+    def print_report(report):
+        print(f"{report['sessions']} sessions over {report['elapsed_s']}s")
+        print(f"{'flow':<16} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name, row in list(report["flows"].items()) + [("overall", report["overall"])]:
+            print(f"{name:<16} {row['requests']:>9} {row['errors']:>7} {row['throughput']:>8.1f} "
+                  f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}")
+        pool = report["pool"]
+        print(f"pool: size {pool['size']}, peak in use {pool['peak_in_use']}, "
+              f"{pool['waited_pct']}% of requests waited for a connection (p95 wait {pool['p95_wait_ms']} ms)")
+        for name, count in report["errors"].items():
+            print(f"error {name}: {count}")
+
+
+def station_names(dart_csv_path, luas_csv_path, bus_csv_path):
+    """Station and stop names per network for the shortest-path flow."""
+    return {
+        "DART": [row["StationName"] for row in read_rows(dart_csv_path)],
+        "LUAS": [row["Station Name"] for row in read_rows(luas_csv_path)],
+        "BUS": sorted({stop for row in read_rows(bus_csv_path) for stop in bus_route_stops(row)}),
+    }
+
+
+def local_target(dart_csv_path, luas_csv_path, bus_csv_path, aggregate_path):
+    from utils.aggregates import AggregateStore
+
+    aggregates = AggregateStore(aggregate_path, dart_csv_path, luas_csv_path, bus_csv_path).load()
+    return LocalTarget(aggregates, list(read_rows(dart_csv_path)), list(read_rows(luas_csv_path)), list(read_rows(bus_csv_path)))
@@ -0,0 +1,175 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+import hashlib
+import json
+import os
+import time
+
+from utils.fingerprint import file_fingerprint
+
+HISTORY_LENGTH = 20
+
+
+class Stage:
+    def __init__(self, name, action, depends_on=(), inputs=(), version="1"):
+        """
+        A pipeline step. `action` is called with no arguments; `inputs` are file paths
+        whose content decides whether the stage can be skipped; bump `version` to force
+        a rerun after changing the action itself.
+        """
+        self.name = name
+        self.action = action
+        self.depends_on = list(depends_on)
+        self.inputs = list(inputs)
+        self.version = version
+
+
+class PipelineRunner:
+    def __init__(self, stages, state_path, max_workers=3):
+        """
+        Run stages as a dependency DAG on a thread pool, persisting fingerprints and
+        timings to `state_path`. Threads are used because the stages share Neo4j drivers.
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_path = state_path
+        self.max_workers = max_workers
+        for stage in stages:
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a dependency cycle through '{name}'")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable pipeline state: {e}")
+            return {}
+
+    def save_state(self, state):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as file:
+            json.dump(state, file, indent=2)
+
+    def _fingerprint(self, stage, fingerprints):
+        """Hash of the stage version, its input files and its dependencies' fingerprints."""
+        digest = hashlib.sha256(stage.version.encode("utf-8"))
+        for path in stage.inputs:
+            digest.update(file_fingerprint(path).encode("utf-8"))
+        for dependency in stage.depends_on:
+            digest.update(fingerprints[dependency].encode("utf-8"))
+        return digest.hexdigest()
+
+    def run(self, only=None, force=False):
+        """
+        Execute the pipeline. A stage is skipped when its fingerprint matches the last
+        successful run and none of its dependencies ran. `only` limits the run to the
+        named stages and whatever they depend on; `force` reruns everything.
+        """
+        state = self.load_state()
+        selected = self._closure(only) if only else set(self.stages)
+        fingerprints = {}
+        outcome = {}
+        pending = set(selected)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                for name in sorted(pending):
+                    stage = self.stages[name]
+                    if any(dep in pending or dep in running.values() for dep in stage.depends_on if dep in selected):
+                        continue
+                    pending.discard(name)
+                    if any(outcome.get(dep) in ("failed", "blocked") for dep in stage.depends_on):
+                        outcome[name] = "blocked"
+                        print(f"[pipeline] {name}: blocked by a failed dependency")
+                        continue
+                    for dependency in stage.depends_on:
+                        if dependency not in fingerprints:
+                            fingerprints[dependency] = state.get(dependency, {}).get("fingerprint", "")
+                    fingerprints[name] = self._fingerprint(stage, fingerprints)
+                    previous = state.get(name, {})
+                    upstream_ran = any(outcome.get(dep) == "ran" for dep in stage.depends_on)
+                    if (not force and not upstream_ran and previous.get("status") == "ok"
+                            and previous.get("fingerprint") == fingerprints[name]):
+                        outcome[name] = "skipped"
+                        print(f"[pipeline] {name}: unchanged, skipped")
+                        continue
+                    running[pool.submit(self._timed, stage)] = name
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    seconds, error = future.result()
+                    entry = state.setdefault(name, {})
+                    history = entry.get("history", [])
+                    history.append({"seconds": round(seconds, 3), "finished_at": datetime.now().isoformat(timespec="seconds")})
+                    entry["history"] = history[-HISTORY_LENGTH:]
+                    entry["seconds"] = round(seconds, 3)
+                    if error is None:
+                        entry["status"] = "ok"
+                        entry["fingerprint"] = fingerprints[name]
+                        outcome[name] = "ran"
+                        print(f"[pipeline] {name}: completed in {seconds:.2f}s")
+                    else:
+                        entry["status"] = "failed"
+                        entry["error"] = str(error)
+                        outcome[name] = "failed"
+                        print(f"[pipeline] {name}: failed after {seconds:.2f}s: {error}")
+                    self.save_state(state)
+
+        self.save_state(state)
+        return outcome
+
+    def _closure(self, names):
+        """The named stages plus everything they depend on."""
+        selected = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'")
+            if name not in selected:
+                selected.add(name)
+                stack.extend(self.stages[name].depends_on)
+        return selected
+
+    @staticmethod
+    def _timed(stage):
+        start = time.perf_counter()
+        try:
+            stage.action()
+            return time.perf_counter() - start, None
+        except Exception as e:
+            return time.perf_counter() - start, e
+
+    def report(self):
+        """Print the last recorded timing of every stage."""
+        state = self.load_state()
+        for name in self.stages:
+            entry = state.get(name, {})
+            print(f"{name:<24} {entry.get('status', 'never run'):<10} {entry.get('seconds', 0):>8.2f}s")
@@ -17,16 +17,24 @@
 
 # Import the essential Classes and Libraries
 from neo4j import GraphDatabase
+import csv
 import os
-import streamlit as st
+import sys
 
 from neo4jdb.Bus import BusExecution
 from neo4jdb.Dart import DartExecution
 from neo4jdb.Luas import LuasExecution
 from neo4jdb.Master_Node import MasterNode
-from utils.data_processing import IrishTransportData
+from neo4jdb.snapshot import SnapshotExecution
+from neo4jdb.aggregates import AggregateExecution
+from neo4jdb.analytics import create_ranking_indexes
+from neo4jdb.incremental import IncrementalAnalytics
+from neo4jdb.ingest import csv_fingerprint
+from neo4jdb.pipeline import PipelineRunner, Stage
+from utils.aggregates import AggregateStore
 import subprocess
-import logging
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 class Neo4jExecution:
     def __init__(self, uri, user, password):
@@ -57,32 +65,165 @@ class Neo4jExecution:
                 print(f"Query execution failed: {e}")
                 return None
 
-    def run_streamlit_app(self):
-        """Execute the Streamlit app."""
+    def run_streamlit_app(self, headless=True, port=None, wait=True):
+        """
+        Launch the Streamlit app from the project root.
+        With wait=False the server keeps running in the background and the process is returned.
+        """
+        app_path = os.path.join(PROJECT_ROOT, "app.py")
+        if not os.path.exists(app_path):
+            print(f"Error: The file '{app_path}' does not exist.")
+            return
+
+        command = [sys.executable, "-m", "streamlit", "run", app_path,
+                   "--server.headless", "true" if headless else "false"]
+        if port:
+            command += ["--server.port", str(port)]
         try:
-            # Command to run Streamlit app
-            app_path = r"C:\Users\Autom\PycharmProjects\B9AI101\app.py"
-            if not os.path.exists(app_path):
-                print(f"Error: The file '{app_path}' does not exist.")
-                return
-
-            # Run the Streamlit app
-            result = subprocess.run(
-                ["streamlit", "run", app_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            if result.returncode != 0:
-                print(f"Error occurred while running the Streamlit app: {result.stderr}")
-            else:
-                print("Streamlit app is running successfully.")
+            process = subprocess.Popen(command, cwd=PROJECT_ROOT)
+            print(f"Streamlit app started (pid {process.pid}).")
+            if not wait:
+                return process
+            returncode = process.wait()
+            if returncode != 0:
+                print(f"Streamlit app exited with code {returncode}.")
+            return returncode
         except FileNotFoundError:
-            print("Streamlit executable not found. Please ensure Streamlit is installed.")
+            print("Python executable not found. Please ensure Streamlit is installed.")
         except Exception as e:
             print(f"Unexpected error occurred: {e}")
 
 
+def build_pipeline(uri, user, password, project_root=PROJECT_ROOT, max_workers=3):
+    """
+    Declare the import and analytics stages as a DAG:
+    master node -> imports -> relationships -> analytics/aggregates -> snapshot.
+    Returns the runner and the executors that must be closed afterwards.
+    """
+    dart_csv = os.path.join(project_root, "data", "DART_Dataset.csv")
+    luas_csv = os.path.join(project_root, "data", "LUAS_Dataset.csv")
+    bus_csv = os.path.join(project_root, "data", "BUS_Dataset.csv")
+    snapshot_dir = os.path.join(project_root, "data", "snapshot")
+    layout_dir = os.path.join(project_root, "data", "layouts")
+
+    imaster = MasterNode(uri, user, password)
+    iDart = DartExecution(uri, user, password)
+    iluas = LuasExecution(uri, user, password)
+    ibus = BusExecution(uri, user, password)
+    isnapshot = SnapshotExecution(uri, user, password)
+    iaggregates = AggregateExecution(uri, user, password)
+    incremental = IncrementalAnalytics(iaggregates, os.path.join(project_root, "data", "analytics_state"))
+    aggregate_store = AggregateStore(os.path.join(project_root, "data", "aggregates.json"), dart_csv, luas_csv, bus_csv)
+
+    def eda():
+        # Imported lazily so import/analytics runs do not pay for pandas up front
+        from utils.data_processing import IrishTransportData
+
+        # One chunked pass per file; counts, missing values, moments and correlations are
+        # cached under data/stats, so datasets larger than memory can be profiled
+        iclean = IrishTransportData()
+        for path in (dart_csv, luas_csv, bus_csv):
+            iclean.streaming_statistics(path)
+
+    # A clear is skipped when an interrupted import of the same file left a checkpoint to resume from
+    def dart_import():
+        if not iDart.writer.pending("dart_stations", csv_fingerprint(dart_csv)):
+            iDart.clear_station_data()
+        iDart.import_station_data(dart_csv)
+
+    # Reachability and routing indexes are rebuilt whenever a network is re-imported
+    def dart_routing():
+        iDart.build_reachability_index()
+        iDart.build_routing_index()
+
+    def dart_analytics():
+        iDart.calculate_degree_centrality()
+        iDart.calculate_path_centrality()
+        iDart.calculate_shortest_path("Adamstown", "Ballybrophy")
+
+    def luas_import():
+        if not iluas.writer.pending("luas_stations", csv_fingerprint(luas_csv)):
+            iluas.clear_luas_data()
+        iluas.import_luas_data(luas_csv)
+
+    # Stations and their line relationships are written by luas_import in one pass
+    def luas_relationships():
+        iluas.build_spatial_index(luas_csv)
+        iluas.create_station_points()
+        iluas.create_proximity_interchanges()
+        iluas.build_timetable(luas_csv)
+        iluas.create_service_windows()
+
+    def luas_routing():
+        iluas.build_reachability_index()
+        iluas.build_routing_index()
+
+    def luas_analytics():
+        iluas.calculate_degree_centrality()
+        iluas.calculate_path_centrality()
+        iluas.calculate_shortest_path("Tallaght", "Belgard")
+        iluas.calculate_geo_shortest_path("Tallaght", "Broombridge")
+        iluas.calculate_earliest_arrival("Tallaght", "The Point", "8:00 am")
+
+    def bus_import():
+        if not ibus.writer.pending("bus_routes", csv_fingerprint(bus_csv)):
+            ibus.clear_bus_data()
+        ibus.import_bus_data(bus_csv)
+
+    def bus_analytics():
+        ibus.calculate_degree_centrality()
+        ibus.calculate_path_centrality(sample_size=32)
+        ibus.detect_communities()
+        ibus.find_shortest_path("Santry (Shanard Rd.)", "Shankill")
+        ibus.build_timetable(bus_csv)
+        ibus.calculate_earliest_arrival("Santry (Shanard Rd.)", "Shankill", "8:00 am")
+
+    def aggregates():
+        create_ranking_indexes(iaggregates)
+        iaggregates.write_summary_nodes(aggregate_store.build())
+
+    def layouts():
+        # Physics runs here, offline; the dashboard only reads the cached positions
+        from utils.network_view import LayoutCache, build_network
+
+        cache = LayoutCache(layout_dir)
+        rows = []
+        for path in (dart_csv, luas_csv, bus_csv):
+            with open(path, mode='r', encoding='latin1') as file:
+                rows.append(list(csv.DictReader(file)))
+        for category in ("DART", "LUAS", "BUS"):
+            nodes, edges = build_network(category, *rows)
+            cache.get(category, nodes, edges)
+
+    def pagerank():
+        # Degree and PageRank per network; only nodes around changed edges are recomputed and written
+        for category in ("DART", "LUAS", "BUS"):
+            incremental.refresh(category)
+
+    stages = [
+        Stage("eda", eda, inputs=[dart_csv, luas_csv, bus_csv]),
+        Stage("master_node", imaster.create_master_parent_child_node),
+        Stage("dart_import", dart_import, ["master_node"], [dart_csv]),
+        Stage("dart_routing", dart_routing, ["dart_import"]),
+        Stage("dart_analytics", dart_analytics, ["dart_routing"]),
+        Stage("luas_import", luas_import, ["master_node"], [luas_csv]),
+        Stage("luas_relationships", luas_relationships, ["luas_import"], [luas_csv]),
+        Stage("luas_routing", luas_routing, ["luas_relationships"]),
+        Stage("luas_analytics", luas_analytics, ["luas_routing"]),
+        Stage("bus_import", bus_import, ["master_node"], [bus_csv]),
+        Stage("bus_relationships", ibus.create_route_relationships, ["bus_import"]),
+        Stage("bus_routing", ibus.build_reachability_index, ["bus_import"]),
+        Stage("bus_analytics", bus_analytics, ["bus_routing", "bus_relationships"], [bus_csv]),
+        Stage("aggregates", aggregates, ["dart_import", "luas_relationships", "bus_relationships"], [dart_csv, luas_csv, bus_csv]),
+        Stage("layouts", layouts, inputs=[dart_csv, luas_csv, bus_csv]),
+        Stage("pagerank", pagerank, ["dart_analytics", "luas_analytics", "bus_analytics"]),
+        Stage("snapshot", lambda: isnapshot.export_snapshot(snapshot_dir), ["pagerank", "aggregates"]),
+    ]
+    state_path = os.path.join(project_root, "data", "pipeline_state.json")
+    runner = PipelineRunner(stages, state_path, max_workers=max_workers)
+    return runner, [imaster, iDart, iluas, ibus, isnapshot, iaggregates]
+
+
 # Main Execution
 if __name__ == "__main__":
     # Define Neo4j connection details
@@ -93,67 +234,20 @@ if __name__ == "__main__":
     # Initialize Neo4j Execution
     neo4j_exec = Neo4jExecution(URI, USER, PASSWORD)
 
-     # Path to the CSV file
-    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    DART_CSV_FILE_PATH = os.path.join(PROJECT_ROOT, "data","DART_Dataset.csv")
-    LUAS_CSV_FILE_PATH = os.path.join(PROJECT_ROOT, "data", "LUAS_Dataset.csv")
-    BUS_CSV_FILE_PATH = os.path.join(PROJECT_ROOT, "data", "BUS_Dataset.csv")
+    runner, executors = build_pipeline(URI, USER, PASSWORD, PROJECT_ROOT)
     try:
         # Test connection to Neo4j
         neo4j_exec.iconnect()
 
-        # Load and clean data
-        print("Initializing data cleaning...")
-        iclean = IrishTransportData()
-        iclean.load_data()
-        iclean.check_missing_values()
-        iclean.handle_missing_values()
-        iclean.clean_data()
-
-        # Perform exploratory data analysis
-        print("Performing Exploratory Data Analysis...")
-        iclean.exploratory_data_analysis(iclean.dart_data)
-        iclean.exploratory_data_analysis(iclean.luas_data)
-        iclean.exploratory_data_analysis(iclean.bus_data)
-
-        # Run Streamlit app
-        print("Launching Streamlit app...")
+        # Independent networks run in parallel; unchanged stages are skipped
+        runner.run()
+        runner.report()
 
-         # Test the connection
-        neo4j_exec.iconnect()
-        # Create master-parent-child nodes
-        imaster = MasterNode(URI, USER, PASSWORD)
-        imaster.create_master_parent_child_node()
-
-        # Import station data from CSV
-        iDart=DartExecution(URI, USER, PASSWORD)
-        iDart.import_station_data(DART_CSV_FILE_PATH)
-        iDart.create_custom_relationships_from_csv(DART_CSV_FILE_PATH)
-        iDart.calculate_degree_centrality()
-        iDart.calculate_shortest_path("Adamstown","Ballybrophy")
-        iDart.calculate_pagerank("Station","CONNECTED_TO")
-        print("********************************************************************************************************************************************")
-        iluas=LuasExecution(URI, USER, PASSWORD)
-        iluas.import_luas_data(LUAS_CSV_FILE_PATH)
-        iluas.create_luas_relationships(LUAS_CSV_FILE_PATH)
-        iluas.calculate_degree_centrality()
-        iluas.calculate_shortest_path("Tallaght","Belgard")
-        iluas.calculate_pagerank("Station","CONNECTED_BY_LINE")
-        print("********************************************************************************************************************************************")
-        ibus=BusExecution(URI, USER, PASSWORD)
-        ibus.import_bus_data(BUS_CSV_FILE_PATH)
-        ibus.create_route_relationships()
-        ibus.create_route_connections()
-        ibus.calculate_degree_centrality()
-        ibus.find_shortest_path("Santry (Shanard Rd.)", "Shankill")
-        ibus.calculate_pagerank("Route","CONNECTED_TO")
-
-        print("********************************************************************************************************************************************")
-        iDart.calculate_pagerank("Station", "CONNECTED_BY_ROUTE")
-        iDart.calculate_pagerank("Station", "CONNECTED_BY_LINE")
-        iDart.calculate_pagerank("Route", "CONNECTED_TO")
+        print("Launching Streamlit app...")
         neo4j_exec.run_streamlit_app()
     finally:
         # Close the Neo4j connection
         print("Closing Neo4j connection...")
+        for executor in executors:
+            executor.close()
         neo4j_exec.close()
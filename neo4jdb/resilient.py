@@ -0,0 +1,128 @@
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CHECKPOINT_PATH = os.path.join(PROJECT_ROOT, "data", "import_checkpoint.json")
+RETRYABLE_ERRORS = (ServiceUnavailable, SessionExpired, TransientError)
+
+# Importers for different networks share one checkpoint file from pipeline threads
+_checkpoint_lock = threading.Lock()
+
+
+def rows_fingerprint(rows):
+    """Stable hash of the rows of a job, so a changed input restarts it from the first batch."""
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(json.dumps(row, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResilientWriter:
+    def __init__(self, driver, checkpoint_path=DEFAULT_CHECKPOINT_PATH, max_retries=5, base_delay=0.5, max_delay=30.0):
+        """
+        Batched writes in managed transactions with exponential-backoff retry on transient
+        errors, recording the last committed batch of each job so an interrupted import
+        resumes where it stopped. Queries should MERGE on a key so replaying a batch is harmless.
+        """
+        self.driver = driver
+        self.checkpoint_path = checkpoint_path
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def execute_write(self, query, parameters=None):
+        """
+        Run one write transaction, retrying transient failures with jittered exponential
+        backoff. Other errors, and the last transient one, are raised to the caller.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.driver.session() as session:
+                    return session.execute_write(lambda tx: [record for record in tx.run(query, parameters)])
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+                print(f"Transient write failure ({e.__class__.__name__}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    # --------------------------------------
+    # Checkpoints
+    # --------------------------------------
+    def _load_checkpoints(self):
+        if not os.path.exists(self.checkpoint_path):
+            return {}
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable import checkpoint: {e}")
+            return {}
+
+    def _update_checkpoint(self, job, entry):
+        with _checkpoint_lock:
+            checkpoints = self._load_checkpoints()
+            if entry is None:
+                checkpoints.pop(job, None)
+            else:
+                checkpoints[job] = entry
+            directory = os.path.dirname(self.checkpoint_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.checkpoint_path, "w", encoding="utf-8") as file:
+                json.dump(checkpoints, file, indent=2)
+
+    def pending(self, job, fingerprint):
+        """
+        Whether `job` was interrupted with committed batches of the same input to resume
+        from. Pass the fingerprint given to write_stream (or the rows' fingerprint for
+        write_batches); a checkpoint of different input would be restarted, not resumed.
+        """
+        with _checkpoint_lock:
+            entry = self._load_checkpoints().get(job)
+        return entry is not None and entry.get("fingerprint") == fingerprint
+
+    def reset(self, job):
+        """Forget the progress of `job` so the next run starts from the first batch."""
+        self._update_checkpoint(job, None)
+
+    def write_batches(self, job, query, rows, batch_size=500):
+        """
+        Write `rows` as UNWIND $rows batches. After each commit the batch number is
+        checkpointed; a rerun with the same rows skips the batches already committed.
+        The checkpoint is cleared once every batch is in. Returns the rows written now.
+        """
+        rows = list(rows)
+        batches = ({"rows": rows[start:start + batch_size]} for start in range(0, len(rows), batch_size))
+        return self.write_stream(job, {"rows": query}, batches, rows_fingerprint(rows))
+
+    def write_stream(self, job, queries, batches, fingerprint):
+        """
+        Write a stream of batches without holding more than one in memory. Each batch maps
+        a key of `queries` to its rows; the queries run in their declared order (e.g. nodes
+        before the edges that match them), each as UNWIND $rows. `fingerprint` identifies
+        the input (e.g. a file hash), since the rows are never all available to hash.
+        Committed batches are checkpointed and skipped on a rerun of the same input.
+        """
+        with _checkpoint_lock:
+            entry = self._load_checkpoints().get(job, {})
+        committed = entry.get("batches", 0) if entry.get("fingerprint") == fingerprint else 0
+        if committed:
+            print(f"Resuming {job} after {committed} committed batches.")
+
+        written = 0
+        for number, batch in enumerate(batches):
+            if number < committed:
+                continue
+            for key, query in queries.items():
+                if batch.get(key):
+                    self.execute_write(query, {"rows": batch[key]})
+                    written += len(batch[key])
+            self._update_checkpoint(job, {"fingerprint": fingerprint, "batches": number + 1})
+        self.reset(job)
+        return written
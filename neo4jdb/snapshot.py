@@ -0,0 +1,380 @@
+from neo4j import GraphDatabase
+from neo4j.spatial import CartesianPoint, Point, WGS84Point
+import numpy as np
+import json
+import os
+
+# Property value kinds stored in the snapshot property arrays
+KIND_TEXT = 0
+KIND_INT = 1
+KIND_FLOAT = 2
+KIND_BOOL = 3
+KIND_JSON = 4
+KIND_POINT = 5
+
+# Geographic SRIDs (2D, 3D); every other SRID is Cartesian
+WGS84_SRIDS = (4326, 4979)
+# Temporary label and key that let restore_snapshot match created nodes by snapshot index
+SNAPSHOT_LABEL = "_SnapshotNode"
+
+SNAPSHOT_ARRAYS = [
+    "string_blob", "string_offsets",
+    "node_labels",
+    "node_prop_owner", "node_prop_key", "node_prop_kind", "node_prop_text", "node_prop_number", "node_prop_integer",
+    "edge_src", "edge_dst", "edge_type",
+    "edge_prop_owner", "edge_prop_key", "edge_prop_kind", "edge_prop_text", "edge_prop_number", "edge_prop_integer",
+]
+# Added later; snapshots written before keep their integers in the float64 number column
+INTEGER_ARRAYS = ("node_prop_integer", "edge_prop_integer")
+INT64_RANGE = (-2 ** 63, 2 ** 63)
+
+
+class StringTable:
+    def __init__(self):
+        """Collect unique strings and hand out integer ids for them."""
+        self.ids = {}
+        self.values = []
+
+    def add(self, value):
+        """Return the id of a string, adding it to the table if needed."""
+        index = self.ids.get(value)
+        if index is None:
+            index = len(self.values)
+            self.ids[value] = index
+            self.values.append(value)
+        return index
+
+    def to_arrays(self):
+        """Pack all strings into one UTF-8 blob plus an offsets array."""
+        encoded = [value.encode("utf-8") for value in self.values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            offsets[1:] = np.cumsum([len(value) for value in encoded])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8).copy()
+        return blob, offsets
+
+
+class GraphSnapshot:
+    def __init__(self, arrays):
+        """
+        Wrap the snapshot arrays (plain or memory-mapped NumPy arrays).
+        """
+        self.arrays = arrays
+        self._strings = None
+
+    # --------------------------------------
+    # Building and persisting
+    # --------------------------------------
+    @classmethod
+    def from_records(cls, nodes, edges):
+        """
+        Build a snapshot from node records (id, labels, properties)
+        and edge records (source id, target id, type, properties).
+        """
+        strings = StringTable()
+        node_index = {}
+        node_labels = []
+        node_props = ([], [], [], [], [], [])
+        for node_id, labels, props in nodes:
+            node_index[node_id] = len(node_labels)
+            node_labels.append(strings.add(":".join(sorted(labels))))
+            cls._pack_properties(strings, node_index[node_id], props, node_props)
+
+        edge_src, edge_dst, edge_type = [], [], []
+        edge_props = ([], [], [], [], [], [])
+        for source, target, rel_type, props in edges:
+            if source not in node_index or target not in node_index:
+                continue
+            cls._pack_properties(strings, len(edge_src), props, edge_props)
+            edge_src.append(node_index[source])
+            edge_dst.append(node_index[target])
+            edge_type.append(strings.add(rel_type))
+
+        blob, offsets = strings.to_arrays()
+        arrays = {
+            "string_blob": blob,
+            "string_offsets": offsets,
+            "node_labels": np.asarray(node_labels, dtype=np.int32),
+            "edge_src": np.asarray(edge_src, dtype=np.int32),
+            "edge_dst": np.asarray(edge_dst, dtype=np.int32),
+            "edge_type": np.asarray(edge_type, dtype=np.int32),
+        }
+        for prefix, columns in (("node_prop", node_props), ("edge_prop", edge_props)):
+            owner, key, kind, text, number, integer = columns
+            arrays[f"{prefix}_owner"] = np.asarray(owner, dtype=np.int32)
+            arrays[f"{prefix}_key"] = np.asarray(key, dtype=np.int32)
+            arrays[f"{prefix}_kind"] = np.asarray(kind, dtype=np.int8)
+            arrays[f"{prefix}_text"] = np.asarray(text, dtype=np.int32)
+            arrays[f"{prefix}_number"] = np.asarray(number, dtype=np.float64)
+            arrays[f"{prefix}_integer"] = np.asarray(integer, dtype=np.int64)
+        return cls(arrays)
+
+    @staticmethod
+    def _pack_properties(strings, owner, props, columns):
+        """Append one owner's properties to the columnar property arrays."""
+        owners, keys, kinds, texts, numbers, integers = columns
+        for key, value in (props or {}).items():
+            if value is None:
+                continue
+            integer = 0
+            if isinstance(value, bool):
+                kind, text, number = KIND_BOOL, -1, float(value)
+            elif isinstance(value, int) and INT64_RANGE[0] <= value < INT64_RANGE[1]:
+                # Kept out of float64, which is exact only up to 2**53
+                kind, text, number, integer = KIND_INT, -1, 0.0, value
+            elif isinstance(value, float):
+                kind, text, number = KIND_FLOAT, -1, value
+            elif isinstance(value, str):
+                kind, text, number = KIND_TEXT, strings.add(value), 0.0
+            elif isinstance(value, Point):
+                # Points are tuples; kept apart from JSON so the spatial type survives a restore
+                point = json.dumps({"srid": value.srid, "coordinates": list(value)})
+                kind, text, number = KIND_POINT, strings.add(point), 0.0
+            else:
+                kind, text, number = KIND_JSON, strings.add(json.dumps(value, default=str)), 0.0
+            owners.append(owner)
+            keys.append(strings.add(key))
+            kinds.append(kind)
+            texts.append(text)
+            numbers.append(number)
+            integers.append(integer)
+
+    def save(self, directory):
+        """
+        Write every array as its own .npy file so it can be memory-mapped on load.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in SNAPSHOT_ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), self.arrays[name])
+        print(f"Snapshot saved to {directory}: {self.node_count} nodes, {self.edge_count} relationships.")
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Load a snapshot directory, memory-mapping the arrays by default.
+        """
+        mode = "r" if mmap else None
+        arrays = {}
+        for name in SNAPSHOT_ARRAYS:
+            path = os.path.join(directory, f"{name}.npy")
+            if name in INTEGER_ARRAYS and not os.path.exists(path):
+                continue
+            arrays[name] = np.load(path, mmap_mode=mode)
+        return cls(arrays)
+
+    # --------------------------------------
+    # Reading
+    # --------------------------------------
+    @property
+    def node_count(self):
+        return len(self.arrays["node_labels"])
+
+    @property
+    def edge_count(self):
+        return len(self.arrays["edge_src"])
+
+    @property
+    def strings(self):
+        """Decode the string table once on first access."""
+        if self._strings is None:
+            blob = self.arrays["string_blob"].tobytes()
+            offsets = self.arrays["string_offsets"]
+            self._strings = [
+                blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)
+            ]
+        return self._strings
+
+    def _unpack_properties(self, prefix, count):
+        """Rebuild the property dictionaries for all owners of one kind."""
+        strings = self.strings
+        props = [{} for _ in range(count)]
+        owners = self.arrays[f"{prefix}_owner"]
+        keys = self.arrays[f"{prefix}_key"]
+        kinds = self.arrays[f"{prefix}_kind"]
+        texts = self.arrays[f"{prefix}_text"]
+        numbers = self.arrays[f"{prefix}_number"]
+        integers = self.arrays.get(f"{prefix}_integer", numbers)
+        for i in range(len(owners)):
+            kind = kinds[i]
+            if kind == KIND_TEXT:
+                value = strings[texts[i]]
+            elif kind == KIND_INT:
+                value = int(integers[i])
+            elif kind == KIND_FLOAT:
+                value = float(numbers[i])
+            elif kind == KIND_BOOL:
+                value = bool(numbers[i])
+            elif kind == KIND_POINT:
+                point = json.loads(strings[texts[i]])
+                point_class = WGS84Point if point["srid"] in WGS84_SRIDS else CartesianPoint
+                value = point_class(point["coordinates"])
+            else:
+                value = json.loads(strings[texts[i]])
+            props[owners[i]][strings[keys[i]]] = value
+        return props
+
+    def node_records(self):
+        """Return (index, labels, properties) for every node."""
+        strings = self.strings
+        props = self._unpack_properties("node_prop", self.node_count)
+        return [
+            (i, strings[label].split(":") if strings[label] else [], props[i])
+            for i, label in enumerate(self.arrays["node_labels"])
+        ]
+
+    def edge_records(self):
+        """Return (source index, target index, type, properties) for every relationship."""
+        strings = self.strings
+        props = self._unpack_properties("edge_prop", self.edge_count)
+        return [
+            (int(src), int(dst), strings[rel_type], props[i])
+            for i, (src, dst, rel_type) in enumerate(
+                zip(self.arrays["edge_src"], self.arrays["edge_dst"], self.arrays["edge_type"])
+            )
+        ]
+
+    def to_networkx(self):
+        """
+        Load the snapshot straight into an in-process NetworkX multigraph.
+        """
+        import networkx as nx
+
+        graph = nx.MultiDiGraph()
+        for index, labels, props in self.node_records():
+            graph.add_node(index, labels=labels, **props)
+        for source, target, rel_type, props in self.edge_records():
+            graph.add_edge(source, target, type=rel_type, **props)
+        return graph
+
+
+class SnapshotExecution:
+    def __init__(self, uri, user, password):
+        """Initialize the Neo4j connection"""
+        self.driver = GraphDatabase.driver(uri, auth=(user, password))
+
+    def close(self):
+        """Close the Neo4j connection"""
+        if self.driver:
+            self.driver.close()
+
+    def execute_query(self, query, parameters=None):
+        """Execute a given Cypher query."""
+        with self.driver.session() as session:
+            try:
+                result = session.run(query, parameters)
+                return [record for record in result]
+            except Exception as e:
+                print(f"Query execution failed: {e}")
+
+    def export_snapshot(self, directory):
+        """
+        Export the full transport graph (all nodes and relationships) to a binary snapshot.
+        """
+        nodes = self.execute_query(
+            "MATCH (n) RETURN elementId(n) AS id, labels(n) AS labels, properties(n) AS props"
+        ) or []
+        edges = self.execute_query(
+            """
+            MATCH (a)-[r]->(b)
+            RETURN elementId(a) AS source, elementId(b) AS target, type(r) AS type, properties(r) AS props
+            """
+        ) or []
+        snapshot = GraphSnapshot.from_records(
+            ((record["id"], record["labels"], record["props"]) for record in nodes),
+            ((record["source"], record["target"], record["type"], record["props"]) for record in edges),
+        )
+        snapshot.save(directory)
+        return snapshot
+
+    def restore_snapshot(self, directory, batch_size=1000):
+        """
+        Rebuild the graph in Neo4j from a snapshot using batched UNWIND writes.
+        Every node is created with a temporary label and snapshot index, so relationships
+        match their endpoints through one index whatever the node labels; both are removed
+        in batched transactions at the end. Point properties are rebuilt with point().
+        """
+        snapshot = GraphSnapshot.load(directory)
+        # Deleting in one transaction would hold the whole graph in the transaction heap
+        self.execute_query(
+            """
+            MATCH (n)
+            CALL {
+                WITH n
+                DETACH DELETE n
+            } IN TRANSACTIONS OF $batch_size ROWS
+            """,
+            parameters={"batch_size": batch_size},
+        )
+        self.execute_query(
+            f"CREATE INDEX snapshot_node_id IF NOT EXISTS FOR (n:`{SNAPSHOT_LABEL}`) ON (n._snapshot_id)"
+        )
+
+        # Nodes are grouped by labels and point keys so each batch is a single CREATE statement
+        node_groups = {}
+        for index, labels, props in snapshot.node_records():
+            points = {key: value for key, value in props.items() if isinstance(value, Point)}
+            plain = {key: value for key, value in props.items() if key not in points}
+            row = {
+                "sid": index,
+                "props": plain,
+                "points": {key: _point_map(value) for key, value in points.items()},
+            }
+            node_groups.setdefault((tuple(labels), tuple(sorted(points))), []).append(row)
+
+        for (labels, point_keys), rows in node_groups.items():
+            label_clause = "".join(f":`{label}`" for label in labels + (SNAPSHOT_LABEL,))
+            point_clause = "".join(f", n.`{key}` = point(row.points.`{key}`)" for key in point_keys)
+            for start in range(0, len(rows), batch_size):
+                self.execute_query(
+                    f"""
+                    UNWIND $rows AS row
+                    CREATE (n{label_clause})
+                    SET n = row.props, n._snapshot_id = row.sid{point_clause}
+                    """,
+                    parameters={"rows": rows[start:start + batch_size]},
+                )
+        self.execute_query("CALL db.awaitIndexes()")
+
+        edges_by_type = {}
+        for source, target, rel_type, props in snapshot.edge_records():
+            points = {key: value for key, value in props.items() if isinstance(value, Point)}
+            row = {
+                "src": source,
+                "dst": target,
+                "props": {key: value for key, value in props.items() if key not in points},
+                "points": {key: _point_map(value) for key, value in points.items()},
+            }
+            edges_by_type.setdefault((rel_type, tuple(sorted(points))), []).append(row)
+
+        for (rel_type, point_keys), rows in edges_by_type.items():
+            point_clause = "".join(f", r.`{key}` = point(row.points.`{key}`)" for key in point_keys)
+            for start in range(0, len(rows), batch_size):
+                self.execute_query(
+                    f"""
+                    UNWIND $rows AS row
+                    MATCH (a:`{SNAPSHOT_LABEL}` {{_snapshot_id: row.src}}), (b:`{SNAPSHOT_LABEL}` {{_snapshot_id: row.dst}})
+                    CREATE (a)-[r:`{rel_type}`]->(b)
+                    SET r = row.props{point_clause}
+                    """,
+                    parameters={"rows": rows[start:start + batch_size]},
+                )
+
+        # Batched for the same reason as the wipe
+        self.execute_query(
+            f"""
+            MATCH (n:`{SNAPSHOT_LABEL}`)
+            CALL {{
+                WITH n
+                REMOVE n:`{SNAPSHOT_LABEL}`, n._snapshot_id
+            }} IN TRANSACTIONS OF $batch_size ROWS
+            """,
+            parameters={"batch_size": batch_size},
+        )
+        self.execute_query("DROP INDEX snapshot_node_id IF EXISTS")
+        print(f"Snapshot restored from {directory}: {snapshot.node_count} nodes, {snapshot.edge_count} relationships.")
+        return snapshot
+
+
+def _point_map(point):
+    """Map accepted by Cypher's point() for a driver Point: srid plus x, y (and z)."""
+    return {"srid": point.srid, **dict(zip("xyz", point))}
@@ -0,0 +1,234 @@
+from collections import Counter, OrderedDict, deque
+from datetime import datetime
+from neo4jdb.analytics import fetch_ranked_page
+from neo4jdb.incremental import IncrementalAnalytics
+from neo4jdb.watch import read_cache_version
+import json
+import os
+import threading
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_QUERY_LOG_PATH = os.path.join(PROJECT_ROOT, "data", "query_log.jsonl")
+DEFAULT_WARM_CACHE_PATH = os.path.join(PROJECT_ROOT, "data", "warm_cache.json")
+DEFAULT_READINESS_PATH = os.path.join(PROJECT_ROOT, "data", "readiness.json")
+PIPELINE_STATE_PATH = os.path.join(PROJECT_ROOT, "data", "pipeline_state.json")
+NETWORKS = ("DART", "LUAS", "BUS")
+# The dashboard's "Rows per page" choices; first pages of each are cached
+PAGE_SIZES = (25, 50, 100)
+# Most frequent logged pairs precomputed per network
+DEFAULT_TOP_PAIRS = 10
+
+_log_lock = threading.Lock()
+
+
+class QueryLog:
+    def __init__(self, path=DEFAULT_QUERY_LOG_PATH, max_entries=10000):
+        """
+        Append-only log of shortest path queries (network, source, target), one JSON line
+        each. Only the last `max_entries` count towards the most frequent pairs.
+        """
+        self.path = path
+        self.max_entries = max_entries
+
+    def record(self, category, source, target):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps({"network": category, "source": source, "target": target})
+        with _log_lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+    def _tail(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return deque(file, maxlen=self.max_entries)
+        except OSError:
+            return deque()
+
+    def most_frequent(self, category, limit=10):
+        """The `limit` most queried (source, target) pairs of one network."""
+        counts = Counter()
+        for line in self._tail():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("network") == category:
+                counts[(entry["source"], entry["target"])] += 1
+        return [pair for pair, _ in counts.most_common(limit)]
+
+    def compact(self):
+        """Drop entries older than the last `max_entries` so the file stays bounded."""
+        with _log_lock:
+            tail = self._tail()
+            if not tail:
+                return
+            with open(self.path, "w", encoding="utf-8") as file:
+                file.writelines(tail)
+
+
+class PathCache:
+    def __init__(self, paths=(), limit=len(NETWORKS) * DEFAULT_TOP_PAIRS):
+        """
+        Least recently used shortest path results, shared by every dashboard session.
+        Holds at most `limit` entries, or as many as the warm-up saved if that is more.
+        """
+        self.paths = OrderedDict(paths)
+        self.limit = max(limit, len(self.paths))
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            result = self.paths.get(key)
+            if result is not None:
+                self.paths.move_to_end(key)
+            return result
+
+    def put(self, key, result):
+        with self._lock:
+            self.paths[key] = result
+            self.paths.move_to_end(key)
+            while len(self.paths) > self.limit:
+                self.paths.popitem(last=False)
+
+
+def read_readiness(path=DEFAULT_READINESS_PATH):
+    """The last reported warm-up state; not ready when nothing was reported."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {"ready": False}
+
+
+def write_readiness(ready, path=DEFAULT_READINESS_PATH, **details):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    state = {"ready": ready, "updated_at": datetime.now().isoformat(timespec="seconds"), **details}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(state, file, indent=2)
+    return state
+
+
+def cache_signature(pipeline_state_path=PIPELINE_STATE_PATH):
+    """
+    Identifies the data cached results were computed from: the watch cache version and
+    the last pipeline run. Cached entries with another signature are stale.
+    """
+    try:
+        modified = os.stat(pipeline_state_path).st_mtime_ns
+    except OSError:
+        modified = None
+    return [read_cache_version(), modified]
+
+
+def load_warm_cache(signature, path=DEFAULT_WARM_CACHE_PATH):
+    """
+    The warmed results as {"paths": {(network, source, target): result},
+    "pages": {(network, prop, size): (rows, next cursor)}}; empty when stale or missing.
+    """
+    cache = {"paths": {}, "pages": {}}
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            stored = json.load(file)
+    except (OSError, ValueError):
+        return cache
+    if stored.get("signature") != signature:
+        return cache
+    for category, source, target, result in stored["paths"]:
+        cache["paths"][(category, source, target)] = result
+    for category, prop, size, rows, cursor in stored["pages"]:
+        cache["pages"][(category, prop, size)] = (rows, tuple(cursor) if cursor else None)
+    return cache
+
+
+def save_warm_cache(cache, signature, path=DEFAULT_WARM_CACHE_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({
+            "signature": signature,
+            "paths": [[*key, result] for key, result in cache["paths"].items()],
+            "pages": [[*key, rows, cursor] for key, (rows, cursor) in cache["pages"].items()],
+        }, file)
+
+
+def shortest_path(executors, category, source, target):
+    """
+    The dashboard's shortest path query for one network, as a list of dicts with a
+    "path" plus "totalDistance" (rail, km) or "routes" and "totalDuration" (BUS, mins).
+    `executors` maps network name to its executor; LUAS needs its spatial index built first.
+    """
+    if category == "BUS":
+        results = executors["BUS"].find_shortest_path(source, target)
+    elif category == "DART":
+        results = executors["DART"].calculate_shortest_path(source, target)
+    else:
+        results = executors["LUAS"].calculate_geo_shortest_path(source, target)
+    return [{**dict(record), "path": list(record["path"])} for record in results or []]
+
+
+def prime_page_cache(executor, category):
+    """
+    Touch every node, relationship and property of one network so their store pages are
+    loaded before the first user asks: stations, BUS routes and stops, and every
+    relationship around them (including the CONNECTS segments BUS routing reads).
+    """
+    records = executor.execute_query(
+        """
+        MATCH (:Category {name: $category})-[:HAS_STATION|HAS_ROUTE|HAS_STOP]->(n)
+        OPTIONAL MATCH (n)-[r]-()
+        RETURN count(DISTINCT n) AS nodes, count(r) AS relationships,
+               sum(size(keys(n))) + sum(size(keys(r))) AS properties
+        """,
+        {"category": category},
+    ) or []
+    return dict(records[0]) if records else {}
+
+
+def warm_up(executors, luas_csv, query_log=None, top_pairs=DEFAULT_TOP_PAIRS, cache_path=DEFAULT_WARM_CACHE_PATH,
+            readiness_path=DEFAULT_READINESS_PATH):
+    """
+    Prepare a freshly started server: prime the Neo4j page cache for every network,
+    bring degree and PageRank up to date, cache the first ranked pages the dashboard
+    shows and the shortest paths of the most frequent logged OD pairs. The same queries
+    also leave their plans in Neo4j's query cache. Readiness is reported as not ready
+    for the whole run and as ready only once the warmed results are saved.
+    """
+    query_log = query_log or QueryLog()
+    write_readiness(False, readiness_path, phase="warming up")
+    timings = {}
+
+    def timed(name, action):
+        start = time.perf_counter()
+        result = action()
+        timings[name] = round(time.perf_counter() - start, 3)
+        return result
+
+    ranking = executors["DART"]
+    analytics = IncrementalAnalytics(ranking)
+    cache = {"paths": {}, "pages": {}}
+    for category in NETWORKS:
+        timed(f"{category} page cache", lambda: prime_page_cache(ranking, category))
+        timed(f"{category} degree and PageRank", lambda: analytics.refresh(category))
+        for prop in ("degree", "rank"):
+            for size in PAGE_SIZES:
+                cache["pages"][(category, prop, size)] = fetch_ranked_page(ranking, category, prop, size)
+
+    executors["LUAS"].build_spatial_index(luas_csv)
+    query_log.compact()
+    for category in NETWORKS:
+        pairs = query_log.most_frequent(category, top_pairs)
+
+        def run_pairs():
+            for source, target in pairs:
+                cache["paths"][(category, source, target)] = shortest_path(executors, category, source, target)
+
+        timed(f"{category} shortest paths ({len(pairs)} pairs)", run_pairs)
+
+    signature = cache_signature()
+    save_warm_cache(cache, signature, cache_path)
+    return write_readiness(True, readiness_path, signature=signature, timings=timings)
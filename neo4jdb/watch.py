@@ -0,0 +1,84 @@
+from datetime import datetime
+from neo4jdb.pipeline import file_fingerprint
+import json
+import os
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_VERSION_PATH = os.path.join(PROJECT_ROOT, "data", "cache_version.json")
+
+
+def read_cache_version(path=DEFAULT_CACHE_VERSION_PATH):
+    """The dashboard cache version; 0 until the first watched update."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file).get("version", 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def bump_cache_version(changed, path=DEFAULT_CACHE_VERSION_PATH):
+    """Increment the cache version so dashboard sessions reload data derived from `changed`."""
+    version = read_cache_version(path) + 1
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({
+            "version": version,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "changed": [os.path.basename(item) for item in changed],
+        }, file, indent=2)
+    return version
+
+
+class DatasetWatcher:
+    def __init__(self, paths, interval=2.0, settle=1.0):
+        """
+        Poll files for changes. A cheap (mtime, size) check runs every `interval` seconds;
+        once a file's stat has stayed the same for `settle` seconds (so a copy in progress
+        is not picked up half written) its content hash decides whether it really changed.
+        """
+        self.paths = list(paths)
+        self.interval = interval
+        self.settle = settle
+        self.signatures = {path: self._signature(path) for path in self.paths}
+        self.hashes = {path: file_fingerprint(path) for path in self.paths}
+        self.pending = {}
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self, now=None):
+        """Paths whose content changed since the last poll that reported them."""
+        now = time.monotonic() if now is None else now
+        changed = []
+        for path in self.paths:
+            signature = self._signature(path)
+            if signature != self.signatures[path]:
+                self.signatures[path] = signature
+                self.pending[path] = now
+                continue
+            if path not in self.pending or now - self.pending[path] < self.settle:
+                continue
+            del self.pending[path]
+            fingerprint = file_fingerprint(path)
+            if fingerprint != self.hashes[path]:
+                self.hashes[path] = fingerprint
+                changed.append(path)
+        return changed
+
+    def watch(self, on_change, max_polls=None):
+        """Call `on_change(paths)` for every batch of changed files until interrupted."""
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            changed = self.poll()
+            if changed:
+                on_change(changed)
+            polls += 1
+            time.sleep(self.interval)
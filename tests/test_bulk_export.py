@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from neo4jdb.bulk_export import AdminCsvExporter, AdminCsvLoader
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+@pytest.fixture(scope="module")
+def export_dir(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("admin_import"))
+    AdminCsvExporter(
+        os.path.join(DATA, "DART_Dataset.csv"), os.path.join(DATA, "LUAS_Dataset.csv"), os.path.join(DATA, "BUS_Dataset.csv"),
+    ).export(directory)
+    return directory
+
+
+def test_luas_numbers_are_typed(export_dir):
+    with open(os.path.join(export_dir, "nodes_luas_station.csv"), encoding="utf-8") as file:
+        header = file.readline().strip().split(",")
+    assert {"Daily_Footfall:int", "Latitude:float", "Longitude:float"} <= set(header)
+
+    stations = {key: props for key, labels, props in AdminCsvLoader(export_dir).iter_nodes() if key[0] == "LuasStation"}
+    tallaght = stations[("LuasStation", "Tallaght_Red")]
+    assert tallaght["Daily_Footfall"] == 20000
+    assert tallaght["Latitude"] == pytest.approx(53.287)
+    assert tallaght["Zone"] == "Zone 4"
+
+
+def test_relationships_reference_exported_nodes(export_dir):
+    loader = AdminCsvLoader(export_dir)
+    nodes = {key for key, _, _ in loader.iter_nodes()}
+    types = set()
+    for start, end, rel_type, _ in loader.iter_relationships():
+        assert start in nodes and end in nodes
+        types.add(rel_type)
+    assert {"HAS_STOP", "CONNECTS", "CONNECTED_BY_LINE", "CONNECTED_BY_ROUTE"} <= types
@@ -0,0 +1,26 @@
+from neo4jdb.Bus import stop_graph
+from utils.network_rows import bus_route_stops, bus_stop_edges
+from utils.routing import bidirectional_dijkstra
+
+
+def route(number, stops, duration):
+    return {"Route Number": number, "Primary Areas Served": stops, "Duration": duration}
+
+
+def test_bus_route_stops_drops_consecutive_repeats():
+    assert bus_route_stops(route("1", " A, B,, B ,C, A", "10 mins")) == ["A", "B", "C", "A"]
+
+
+def test_bus_stop_edges_split_duration_evenly():
+    edges = bus_stop_edges(route("1", "A, B, C", "30 mins"))
+    assert [(edge["source"], edge["target"], edge["duration"]) for edge in edges] == [("A", "B", 15.0), ("B", "C", 15.0)]
+    assert bus_stop_edges(route("2", "A", "30 mins")) == []
+    assert bus_stop_edges(route("3", "A, B", "")) == []
+
+
+def test_stop_graph_routes_over_fastest_segments():
+    edges = bus_stop_edges(route("1", "A, B, C", "40 mins")) + bus_stop_edges(route("2", "A, C", "30 mins"))
+    adjacency, routes = stop_graph(edges)
+    path, cost = bidirectional_dijkstra(adjacency, "C", "A")
+    assert (path, cost) == (["C", "A"], 30.0)
+    assert routes[("C", "A")] == routes[("A", "C")] == "2"
@@ -0,0 +1,35 @@
+import pytest
+
+from utils.centrality import pagerank, path_centrality
+
+
+def undirected(edges, nodes=()):
+    adjacency = {node: {} for node in nodes}
+    for a, b in edges:
+        adjacency.setdefault(a, {})[b] = 1
+        adjacency.setdefault(b, {})[a] = 1
+    return adjacency
+
+
+def test_path_graph_betweenness_and_closeness():
+    scores = path_centrality(undirected([("a", "b"), ("b", "c")]))
+    assert scores["b"] == pytest.approx((1.0, 1.0))
+    assert scores["a"] == pytest.approx((0.0, 2 / 3))
+
+
+def test_star_betweenness():
+    scores = path_centrality(undirected([("hub", leaf) for leaf in "abcd"]), normalized=False)
+    assert scores["hub"][0] == pytest.approx(6.0)
+    assert all(scores[leaf][0] == 0.0 for leaf in "abcd")
+
+
+def test_weighted_betweenness_prefers_cheaper_route():
+    adjacency = {"a": {"b": 1, "c": 5}, "b": {"a": 1, "c": 1}, "c": {"a": 5, "b": 1}}
+    assert path_centrality(adjacency, weighted=True)["b"][0] == pytest.approx(1.0)
+    assert path_centrality(adjacency)["b"][0] == pytest.approx(0.0)
+
+
+def test_pagerank_sums_to_one():
+    ranks = pagerank(undirected([("a", "b"), ("b", "c")], nodes=["d"]))
+    assert sum(ranks.values()) == pytest.approx(1.0)
+    assert ranks["b"] > ranks["a"] > ranks["d"]
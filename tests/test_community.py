@@ -0,0 +1,20 @@
+from utils.community import louvain_communities, modularity
+
+
+def undirected(edges, nodes=()):
+    adjacency = {node: {} for node in nodes}
+    for a, b in edges:
+        adjacency.setdefault(a, {})[b] = 1
+        adjacency.setdefault(b, {})[a] = 1
+    return adjacency
+
+
+def test_louvain_splits_two_cliques():
+    left = [(a, b) for a in "abcd" for b in "abcd" if a < b]
+    right = [(a, b) for a in "wxyz" for b in "wxyz" if a < b]
+    adjacency = undirected(left + right + [("d", "w")])
+    communities = louvain_communities(adjacency, seed=1)
+    assert len({communities[node] for node in "abcd"}) == 1
+    assert len({communities[node] for node in "wxyz"}) == 1
+    assert communities["a"] != communities["z"]
+    assert modularity(adjacency, communities) > 0.4
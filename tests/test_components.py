@@ -0,0 +1,39 @@
+from utils.components import ReachabilityIndex, UnionFind, strongly_connected_components
+
+
+def test_strongly_connected_components_in_reverse_topological_order():
+    adjacency = {"a": ["b"], "b": ["c"], "c": ["a", "d"], "d": ["e"], "e": ["d"], "f": []}
+    components = [sorted(component) for component in strongly_connected_components(adjacency)]
+    assert sorted(components) == [["a", "b", "c"], ["d", "e"], ["f"]]
+    assert components.index(["d", "e"]) < components.index(["a", "b", "c"])
+
+
+def test_strongly_connected_components_deep_chain():
+    adjacency = {node: [node + 1] for node in range(5000)}
+    adjacency[5000] = [0]
+    assert len(strongly_connected_components(adjacency)) == 1
+
+
+def test_union_find():
+    sets = UnionFind("abcd")
+    sets.union("a", "b")
+    sets.union("c", "d")
+    assert sets.find("a") == sets.find("b") != sets.find("c")
+
+
+def test_directed_reachability_follows_edge_direction():
+    index = ReachabilityIndex.from_edges("abcd", [("a", "b"), ("b", "c"), ("c", "b")], directed=True)
+    assert index.reachable("a", "c")
+    assert not index.reachable("c", "a")
+    assert not index.reachable("a", "d")
+    assert index.component_of("b") == index.component_of("c")
+
+
+def test_undirected_reachability_round_trips(tmp_path):
+    index = ReachabilityIndex.from_edges("abcd", [("a", "b"), ("c", "d")])
+    path = str(tmp_path / "reach.json")
+    index.save(path)
+    loaded = ReachabilityIndex.load(path)
+    assert loaded.reachable("b", "a")
+    assert not loaded.reachable("a", "c")
+    assert not loaded.reachable("a", "missing")
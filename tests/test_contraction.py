@@ -0,0 +1,38 @@
+import random
+
+from utils.contraction import ContractionHierarchy
+from utils.routing import astar_path
+
+
+def random_graph(nodes=60, edges=150, seed=7):
+    rng = random.Random(seed)
+    adjacency = {node: {} for node in range(nodes)}
+    for _ in range(edges):
+        a, b = rng.sample(range(nodes), 2)
+        weight = rng.randint(1, 20)
+        adjacency[a][b] = adjacency[b][a] = weight
+    return adjacency
+
+
+def path_cost(adjacency, path):
+    return sum(adjacency[a][b] for a, b in zip(path, path[1:]))
+
+
+def test_contraction_hierarchy_matches_dijkstra():
+    adjacency = random_graph()
+    hierarchy = ContractionHierarchy.build(adjacency)
+    for source in range(0, 60, 5):
+        for target in range(1, 60, 9):
+            path, cost = hierarchy.shortest_path(source, target)
+            _, expected = astar_path(adjacency, source, target)
+            assert cost == expected
+            if path is not None:
+                assert path[0] == source and path[-1] == target
+                assert path_cost(adjacency, path) == cost
+
+
+def test_contraction_hierarchy_round_trips(tmp_path):
+    adjacency = {"a": {"b": 2, "c": 5}, "b": {"a": 2, "c": 1}, "c": {"a": 5, "b": 1}}
+    path = str(tmp_path / "ch.json")
+    ContractionHierarchy.build(adjacency).save(path)
+    assert ContractionHierarchy.load(path).shortest_path("a", "c") == (["a", "b", "c"], 3)
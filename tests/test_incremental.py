@@ -0,0 +1,28 @@
+import pytest
+
+from utils.centrality import pagerank
+from utils.incremental import IncrementalPageRank
+
+
+def undirected(edges, nodes=()):
+    adjacency = {node: {} for node in nodes}
+    for a, b in edges:
+        adjacency.setdefault(a, {})[b] = 1
+        adjacency.setdefault(b, {})[a] = 1
+    return adjacency
+
+
+def test_incremental_pagerank_tracks_edge_and_node_changes():
+    edges = {("a", "b"), ("b", "c"), ("c", "d")}
+    engine = IncrementalPageRank.from_edges("abcde", edges)
+    engine.add_edge("d", "a")
+    engine.remove_edge("b", "c")
+    engine.add_nodes(["f"])
+    engine.add_edge("e", "f")
+    engine.remove_nodes(["c"])
+    engine.settle()
+
+    expected = pagerank(undirected([("a", "b"), ("d", "a"), ("e", "f")], nodes="abdef"), iterations=200)
+    assert engine.rank.keys() == expected.keys()
+    for node, rank in expected.items():
+        assert engine.rank[node] == pytest.approx(rank, abs=1e-6)
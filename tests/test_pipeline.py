@@ -0,0 +1,37 @@
+import pytest
+
+from neo4jdb.pipeline import PipelineRunner, Stage
+
+
+def test_unchanged_stages_are_skipped_and_changed_inputs_rerun(tmp_path):
+    source = tmp_path / "input.csv"
+    source.write_text("a\n")
+    calls = []
+    stages = [
+        Stage("load", lambda: calls.append("load"), inputs=[str(source)]),
+        Stage("rank", lambda: calls.append("rank"), depends_on=["load"]),
+    ]
+    state = str(tmp_path / "state.json")
+
+    assert PipelineRunner(stages, state).run() == {"load": "ran", "rank": "ran"}
+    assert PipelineRunner(stages, state).run() == {"load": "skipped", "rank": "skipped"}
+
+    source.write_text("b\n")
+    assert PipelineRunner(stages, state).run() == {"load": "ran", "rank": "ran"}
+    assert calls == ["load", "rank", "load", "rank"]
+
+
+def test_failed_stage_blocks_dependants_and_reruns(tmp_path):
+    def fail():
+        raise RuntimeError("boom")
+
+    stages = [Stage("load", fail), Stage("rank", lambda: None, depends_on=["load"])]
+    state = str(tmp_path / "state.json")
+    assert PipelineRunner(stages, state).run() == {"load": "failed", "rank": "blocked"}
+    assert PipelineRunner(stages, state).run()["load"] == "failed"
+
+
+def test_cycles_are_rejected(tmp_path):
+    stages = [Stage("a", lambda: None, depends_on=["b"]), Stage("b", lambda: None, depends_on=["a"])]
+    with pytest.raises(ValueError):
+        PipelineRunner(stages, str(tmp_path / "state.json"))
@@ -0,0 +1,74 @@
+import pytest
+
+from neo4jdb.resilient import ResilientWriter, rows_fingerprint
+
+QUERY = "UNWIND $rows AS row MERGE (:Stop {name: row.name})"
+
+
+class RecordingWriter(ResilientWriter):
+    """Records the rows of every write instead of sending them, failing on request."""
+
+    def __init__(self, checkpoint_path, fail_on_call=None):
+        super().__init__(driver=None, checkpoint_path=checkpoint_path)
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+        self.written = []
+
+    def execute_write(self, query, parameters=None):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("connection lost")
+        self.written.append([row["name"] for row in parameters["rows"]])
+
+
+def stops(count):
+    return [{"name": f"stop {i}"} for i in range(count)]
+
+
+def test_write_batches_resumes_after_committed_batches(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    rows = stops(10)
+    interrupted = RecordingWriter(checkpoint, fail_on_call=3)
+    with pytest.raises(RuntimeError):
+        interrupted.write_batches("stops", QUERY, rows, batch_size=3)
+    assert interrupted.pending("stops", rows_fingerprint(rows))
+
+    resumed = RecordingWriter(checkpoint)
+    assert resumed.write_batches("stops", QUERY, rows, batch_size=3) == 4
+    assert resumed.written == [["stop 6", "stop 7", "stop 8"], ["stop 9"]]
+    assert not resumed.pending("stops", rows_fingerprint(rows))
+
+
+def test_changed_input_restarts_from_first_batch(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    interrupted = RecordingWriter(checkpoint, fail_on_call=2)
+    with pytest.raises(RuntimeError):
+        interrupted.write_batches("stops", QUERY, stops(6), batch_size=2)
+
+    changed = stops(5)
+    assert not interrupted.pending("stops", rows_fingerprint(changed))
+    rerun = RecordingWriter(checkpoint)
+    assert rerun.write_batches("stops", QUERY, changed, batch_size=2) == 5
+    assert rerun.written[0] == ["stop 0", "stop 1"]
+
+
+def test_write_stream_runs_queries_in_order_and_skips_committed(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    batches = [{"nodes": [{"name": "a"}], "edges": [{"name": "a-b"}]}, {"nodes": [{"name": "b"}]}]
+    queries = {"nodes": QUERY, "edges": QUERY}
+
+    interrupted = RecordingWriter(checkpoint, fail_on_call=3)
+    with pytest.raises(RuntimeError):
+        interrupted.write_stream("network", queries, iter(batches), "file-hash")
+    assert interrupted.written == [["a"], ["a-b"]]
+    assert interrupted.pending("network", "file-hash")
+    assert not interrupted.pending("network", "other-hash")
+
+    resumed = RecordingWriter(checkpoint)
+    assert resumed.write_stream("network", queries, iter(batches), "file-hash") == 1
+    assert resumed.written == [["b"]]
+
+
+def test_pending_without_checkpoint(tmp_path):
+    writer = RecordingWriter(str(tmp_path / "missing.json"))
+    assert not writer.pending("stops", "anything")
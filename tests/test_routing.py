@@ -0,0 +1,36 @@
+import random
+
+from utils.routing import astar_path, bidirectional_dijkstra
+
+
+def random_graph(nodes=60, edges=150, seed=7):
+    rng = random.Random(seed)
+    adjacency = {node: {} for node in range(nodes)}
+    for _ in range(edges):
+        a, b = rng.sample(range(nodes), 2)
+        weight = rng.randint(1, 20)
+        adjacency[a][b] = adjacency[b][a] = weight
+    return adjacency
+
+
+def path_cost(adjacency, path):
+    return sum(adjacency[a][b] for a, b in zip(path, path[1:]))
+
+
+def test_bidirectional_dijkstra_matches_dijkstra():
+    adjacency = random_graph()
+    for source in range(0, 60, 7):
+        for target in range(3, 60, 11):
+            path, cost = bidirectional_dijkstra(adjacency, source, target)
+            _, expected = astar_path(adjacency, source, target)
+            assert cost == expected
+            if path is not None:
+                assert path[0] == source and path[-1] == target
+                assert path_cost(adjacency, path) == cost
+
+
+def test_bidirectional_dijkstra_unreachable_and_unknown():
+    adjacency = {"a": {"b": 1}, "b": {"a": 1}, "c": {}}
+    assert bidirectional_dijkstra(adjacency, "a", "c") == (None, None)
+    assert bidirectional_dijkstra(adjacency, "a", "z") == (None, None)
+    assert bidirectional_dijkstra(adjacency, "a", "a") == (["a"], 0.0)
@@ -0,0 +1,85 @@
+from neo4j.spatial import CartesianPoint, WGS84Point
+
+from neo4jdb.snapshot import SNAPSHOT_LABEL, GraphSnapshot, SnapshotExecution
+
+
+def sample_snapshot():
+    nodes = [
+        ("luas", ["Category"], {"name": "LUAS"}),
+        ("abbey", ["Station"], {
+            "name": "Abbey Street", "footfall": 1200, "score": 0.75, "accessible": True,
+            "lines": ["Red"], "location": WGS84Point((-6.2585, 53.3486)),
+        }),
+        ("depot", [], {"position": CartesianPoint((1.0, 2.0, 3.0))}),
+    ]
+    edges = [
+        ("luas", "abbey", "HAS_STATION", {}),
+        ("abbey", "depot", "SERVED_BY", {"distance": 1.5, "since": "2004"}),
+    ]
+    return GraphSnapshot.from_records(nodes, edges)
+
+
+def test_snapshot_round_trip(tmp_path):
+    sample_snapshot().save(str(tmp_path))
+    snapshot = GraphSnapshot.load(str(tmp_path))
+    assert (snapshot.node_count, snapshot.edge_count) == (3, 2)
+
+    nodes = {props.get("name", "depot"): (labels, props) for _, labels, props in snapshot.node_records()}
+    labels, abbey = nodes["Abbey Street"]
+    assert labels == ["Station"]
+    assert abbey["footfall"] == 1200 and abbey["score"] == 0.75 and abbey["accessible"] is True
+    assert abbey["lines"] == ["Red"]
+
+    edges = sorted(snapshot.edge_records(), key=lambda edge: edge[2])
+    assert [edge[2] for edge in edges] == ["HAS_STATION", "SERVED_BY"]
+    assert edges[1][3] == {"distance": 1.5, "since": "2004"}
+
+
+def test_snapshot_keeps_large_integers(tmp_path):
+    large = 2 ** 62 + 1
+    GraphSnapshot.from_records([("a", [], {"id": large, "negative": -7, "huge": 2 ** 70})], []).save(str(tmp_path))
+    [(_, _, props)] = GraphSnapshot.load(str(tmp_path)).node_records()
+    assert props == {"id": large, "negative": -7, "huge": 2 ** 70}
+
+
+def test_snapshot_keeps_points(tmp_path):
+    sample_snapshot().save(str(tmp_path))
+    props = [props for _, _, props in GraphSnapshot.load(str(tmp_path)).node_records()]
+    location = next(prop["location"] for prop in props if "location" in prop)
+    position = next(prop["position"] for prop in props if "position" in prop)
+    assert isinstance(location, WGS84Point) and location.srid == 4326
+    assert tuple(location) == (-6.2585, 53.3486)
+    assert isinstance(position, CartesianPoint) and position.srid == 9157
+    assert tuple(position) == (1.0, 2.0, 3.0)
+
+
+class RecordingExecution(SnapshotExecution):
+    """Collects restore queries instead of sending them to Neo4j."""
+
+    def __init__(self):
+        self.queries = []
+
+    def execute_query(self, query, parameters=None):
+        self.queries.append((" ".join(query.split()), parameters))
+        return []
+
+
+def test_restore_rebuilds_points_and_batches_cleanup(tmp_path):
+    sample_snapshot().save(str(tmp_path))
+    execution = RecordingExecution()
+    execution.restore_snapshot(str(tmp_path), batch_size=2)
+
+    creates = [(query, parameters) for query, parameters in execution.queries if "CREATE (n" in query]
+    station = next(parameters["rows"][0] for query, parameters in creates if ":`Station`" in query)
+    assert station["points"] == {"location": {"srid": 4326, "x": -6.2585, "y": 53.3486}}
+    assert "location" not in station["props"]
+    assert any("n.`location` = point(row.points.`location`)" in query for query, _ in creates)
+    assert all(f":`{SNAPSHOT_LABEL}`" in query for query, _ in creates)
+
+    wipe = execution.queries[0]
+    assert "DETACH DELETE n } IN TRANSACTIONS OF $batch_size ROWS" in wipe[0]
+    assert wipe[1] == {"batch_size": 2}
+
+    cleanup = next(query for query, _ in execution.queries if "REMOVE" in query)
+    assert "IN TRANSACTIONS OF $batch_size ROWS" in cleanup
+    assert execution.queries[-1][0] == "DROP INDEX snapshot_node_id IF EXISTS"
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from utils.spatial import SpatialIndex, haversine_km
+
+
+def dublin_points(count=200, seed=3):
+    rng = random.Random(seed)
+    return [(f"s{i}", 53.2 + rng.random() * 0.3, -6.45 + rng.random() * 0.4) for i in range(count)]
+
+
+def test_haversine_known_distance():
+    # O'Connell Bridge to Heuston Station is about 2.2 km
+    assert haversine_km(53.3472, -6.2592, 53.3464, -6.2923) == pytest.approx(2.2, abs=0.1)
+
+
+def test_nearest_matches_brute_force():
+    points = dublin_points()
+    index = SpatialIndex(points)
+    for lat, lon in [(53.35, -6.26), (53.25, -6.4), (53.49, -6.06)]:
+        expected = sorted(points, key=lambda point: haversine_km(lat, lon, point[1], point[2]))[:5]
+        assert [key for key, _ in index.nearest(lat, lon, n=5)] == [point[0] for point in expected]
+
+
+def test_within_radius_matches_brute_force():
+    points = dublin_points()
+    index = SpatialIndex(points)
+    found = index.within_radius(53.35, -6.26, 3.0)
+    expected = {key for key, lat, lon in points if haversine_km(53.35, -6.26, lat, lon) <= 3.0}
+    assert {key for key, _ in found} == expected
+    assert [distance for _, distance in found] == sorted(distance for _, distance in found)
+
+
+def test_invalid_coordinates_are_skipped():
+    index = SpatialIndex([("a", "53.3", "-6.2"), ("b", "", "-6.2"), ("c", None, None)])
+    assert len(index) == 1
+    assert index.nearest(53.3, -6.2)[0][0] == "a"
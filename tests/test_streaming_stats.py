@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.streaming_stats import DatasetProfile, HyperLogLog, Moments, TopValues
+
+
+def test_moments_merge_matches_numpy():
+    values = np.random.default_rng(0).normal(10, 3, 1000)
+    moments = Moments()
+    for block in np.array_split(values, 7):
+        moments.add_array(block)
+    assert moments.count == 1000
+    assert moments.mean == pytest.approx(values.mean())
+    assert moments.std == pytest.approx(values.std(ddof=1))
+    assert (moments.minimum, moments.maximum) == (values.min(), values.max())
+
+
+def test_hyperloglog_exact_while_small():
+    sketch = HyperLogLog()
+    sketch.add_series(pd.Series(["a", "b", "a", "c"]))
+    assert sketch.count() == 3
+
+
+def test_hyperloglog_estimate_and_merge():
+    left, right = HyperLogLog(exact_limit=0), HyperLogLog(exact_limit=0)
+    left.add_series(pd.Series(range(0, 60000)))
+    right.add_series(pd.Series(range(40000, 100000)))
+    assert left.merge(right).count() == pytest.approx(100000, rel=0.03)
+
+
+def test_top_values_finds_value_frequent_only_overall():
+    top = TopValues(capacity=8)
+    for chunk in range(5):
+        top.add_series(pd.Series([f"a{chunk}"] * 3 + ["x"] * 2 + [f"b{chunk}"]))
+    assert top.top() == ("x", 10)
+
+
+def test_dataset_profile_chunks_match_whole_frame():
+    frame = pd.DataFrame({
+        "footfall": ["10", "20", None, "40", "15", "35"],
+        "line": ["Red", "Green", "Red", "Red", "Green", None],
+        "zone": ["1", "2", "1", "3", "2", "2"],
+    })
+    whole = DatasetProfile(frame.columns).update(frame).report()
+    chunked = DatasetProfile(frame.columns).update(frame[:3]).merge(DatasetProfile(frame.columns).update(frame[3:])).report()
+    for name, entry in whole["columns"].items():
+        assert chunked["columns"][name] == pytest.approx(entry)
+    assert whole["numeric_columns"] == ["footfall", "zone"]
+    assert whole["columns"]["line"] == {"count": 5, "missing": 1, "distinct": 2, "top": "Red", "freq": 3}
+    assert whole["columns"]["footfall"]["mean"] == pytest.approx(24.0)
+    expected = pd.to_numeric(frame["footfall"]).corr(pd.to_numeric(frame["zone"]))
+    assert whole["correlation"]["footfall"]["zone"] == pytest.approx(expected)
@@ -0,0 +1,66 @@
+from utils.timetable import Headways, ServiceEdge, TimetableModel, format_clock, parse_window
+
+
+def night_edge(headway=30):
+    first, last = parse_window("11:00 PM - 1:00 AM")
+    return ServiceEdge("B", "N1 to B", 10, first, last, Headways(headway, headway, []))
+
+
+def bus_row(route, stops, duration="30 mins", frequency="Every 10 mins (all-day)", peak="7:00 AM - 9:00 AM"):
+    return {
+        "Route Number": route,
+        "Primary Areas Served": stops,
+        "Duration": duration,
+        "Frequency": frequency,
+        "Peak Hours": peak,
+    }
+
+
+def test_parse_window_crossing_midnight_ends_next_day():
+    assert parse_window("11:00 PM - 1:00 AM") == (23 * 60, 25 * 60)
+
+
+def test_night_service_after_midnight_keeps_running():
+    edge = night_edge()
+    assert edge.next_departure(30) == 30
+    assert edge.next_departure(40) == 60
+
+
+def test_night_service_after_midnight_does_not_wait_for_the_evening():
+    # 00:30 is inside the service that started at 23:00 the evening before
+    assert format_clock(night_edge().next_departure(30)) == "00:30"
+
+
+def test_night_service_after_it_ends_waits_for_the_evening():
+    assert night_edge().next_departure(90) == 23 * 60
+
+
+def test_day_service_headways():
+    edge = ServiceEdge("B", "1 to B", 5, 6 * 60, 23 * 60, Headways(20, 10, [(7 * 60, 9 * 60)]))
+    assert edge.next_departure(5 * 60) == 6 * 60
+    assert edge.next_departure(7 * 60 + 1) == 7 * 60 + 10
+    assert edge.next_departure(23 * 60 + 1) is None
+
+
+def test_night_route_journey_after_midnight():
+    row = bus_row("N1", "A, B, C", duration="20 mins", frequency="Every 30 mins (night)", peak="11:00 PM - 1:00 AM")
+    model = TimetableModel.from_bus_rows([row])
+    journey = model.earliest_arrival("A", "C", 30)
+    assert journey["legs"][0]["depart"] == "00:30"
+    assert journey["arrival"] == "00:50"
+    assert journey["duration"] == 20
+
+
+def test_from_bus_rows_drops_consecutive_duplicate_stops():
+    model = TimetableModel.from_bus_rows([bus_row("1", "A, B, B, C")])
+    assert sorted(model.stops) == ["A", "B", "C"]
+    assert all(edge.target != stop for stop, edges in model.edges.items() for edge in edges)
+    assert [edge.travel for edge in model.edges["A"]] == [15.0]
+
+
+def test_earliest_arrival_changes_route_with_transfer():
+    model = TimetableModel.from_bus_rows([bus_row("1", "A, B", duration="10 mins"), bus_row("2", "B, C", duration="10 mins")])
+    journey = model.earliest_arrival("A", "C", 8 * 60)
+    assert journey["path"] == ["A", "B", "C"]
+    assert [leg["route"] for leg in journey["legs"]] == ["1 to B", "2 to C"]
+    assert journey["legs"][1]["depart"] == "08:20"
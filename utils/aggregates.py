@@ -0,0 +1,122 @@
+import csv
+import json
+import os
+
+import pandas as pd
+
+from utils.facilities import FacilityIndex
+from utils.fingerprint import file_fingerprint
+from utils.model import to_float
+from utils.network_rows import dart_route_edges, luas_line_edges, bus_route_stops, bus_stop_edges
+
+AGGREGATE_VERSION = "2"
+DART_FACILITIES = [
+    "ATM", "Wi-Fi & Internet Access", "Refreshments",
+    "Phone Charging", "Ticket Vending Machine", "Smart Card Enabled",
+]
+
+
+def _rows(csv_file_path):
+    with open(csv_file_path, mode='r', encoding='latin1') as file:
+        return list(csv.DictReader(file))
+
+
+def _count(values):
+    counts = {}
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def _sorted_desc(counts):
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+def edge_degrees(nodes, edges):
+    """Count relationship endpoints per node, parallel edges included, as Cypher COUNT(r) does."""
+    degree = {node: 0 for node in nodes}
+    for source, target in edges:
+        degree[source] = degree.get(source, 0) + 1
+        degree[target] = degree.get(target, 0) + 1
+    return _sorted_desc(degree)
+
+
+def degree_distribution(degree):
+    """{degree: number of nodes with that degree}, ascending by degree; keys are strings for JSON."""
+    return {str(value): count for value, count in sorted(_count(degree.values()).items())}
+
+
+def compute_aggregates(dart_rows, luas_rows, bus_rows):
+    """
+    Summaries the dashboard charts need: LUAS footfall and stations per line and zone,
+    DART facility and weekend counts, and node degrees with their distribution per network.
+    """
+    lines = {}
+    for row in luas_rows:
+        line = lines.setdefault(row["Line"], {"station_count": 0, "total_footfall": 0.0})
+        line["station_count"] += 1
+        line["total_footfall"] += to_float(row["Daily Footfall"]) or 0.0
+
+    bus_stops = sorted({stop for row in bus_rows for stop in bus_route_stops(row)})
+    degree = {
+        "DART": edge_degrees(
+            (row["StationName"] for row in dart_rows),
+            ((edge["Station1"], edge["Station2"]) for edge in dart_route_edges(dart_rows)),
+        ),
+        "LUAS": edge_degrees(
+            (row["Station Name"] for row in luas_rows),
+            ((edge["Station1"], edge["Station2"]) for edge in luas_line_edges(luas_rows)),
+        ),
+        "BUS": edge_degrees(
+            bus_stops,
+            ((edge["source"], edge["target"]) for row in bus_rows for edge in bus_stop_edges(row)),
+        ),
+    }
+
+    return {
+        "luas_lines": lines,
+        "luas_zones": _sorted_desc(_count(row["Zone"] for row in luas_rows)),
+        "dart_facilities": {
+            facility: counts for facility, counts in FacilityIndex.from_frame(pd.DataFrame(dart_rows)).column_counts().items()
+            if facility in DART_FACILITIES
+        },
+        "dart_weekend": _sorted_desc(_count(row["Weekend Working"] for row in dart_rows)),
+        "station_counts": {"DART": len(dart_rows), "LUAS": len(luas_rows), "BUS": len(bus_stops)},
+        "degree": degree,
+        "degree_distribution": {network: degree_distribution(values) for network, values in degree.items()},
+    }
+
+
+class AggregateStore:
+    def __init__(self, path, dart_csv_path, luas_csv_path, bus_csv_path):
+        """
+        Local JSON cache of compute_aggregates, rebuilt only when a source CSV
+        (or AGGREGATE_VERSION) changes.
+        """
+        self.path = path
+        self.csv_paths = [dart_csv_path, luas_csv_path, bus_csv_path]
+
+    def fingerprint(self):
+        return [AGGREGATE_VERSION] + [file_fingerprint(path) for path in self.csv_paths]
+
+    def build(self):
+        """Recompute from the CSVs and write the store."""
+        aggregates = compute_aggregates(*(_rows(path) for path in self.csv_paths))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump({"fingerprint": self.fingerprint(), "aggregates": aggregates}, file, indent=2)
+        return aggregates
+
+    def load(self):
+        """Return the stored aggregates, rebuilding them first when missing or stale."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+            if stored.get("fingerprint") == self.fingerprint():
+                return stored["aggregates"]
+        except (OSError, ValueError) as e:
+            if os.path.exists(self.path):
+                print(f"Rebuilding unreadable aggregate store: {e}")
+        return self.build()
@@ -0,0 +1,178 @@
+import heapq
+import os
+import random
+from collections import deque
+from multiprocessing import Pool
+
+# Adjacency shared with pool workers through the initializer, so it is pickled once per worker
+_worker_adjacency = None
+
+
+def _init_worker(adjacency):
+    global _worker_adjacency
+    _worker_adjacency = adjacency
+
+
+def _single_source(adjacency, source, weighted):
+    """
+    Single-source shortest paths for Brandes' algorithm.
+    Returns the visit order, predecessors, path counts and distances.
+    """
+    order = []
+    predecessors = {source: []}
+    sigma = {source: 1.0}
+    distance = {source: 0.0}
+
+    if not weighted:
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for neighbour in adjacency.get(node, {}):
+                if neighbour not in distance:
+                    distance[neighbour] = distance[node] + 1
+                    sigma[neighbour] = 0.0
+                    predecessors[neighbour] = []
+                    queue.append(neighbour)
+                if distance[neighbour] == distance[node] + 1:
+                    sigma[neighbour] += sigma[node]
+                    predecessors[neighbour].append(node)
+        return order, predecessors, sigma, distance
+
+    seen = {source: 0.0}
+    heap = [(0.0, 0, source, source)]
+    counter = 1
+    while heap:
+        dist, _, predecessor, node = heapq.heappop(heap)
+        if node in distance and node != source:
+            continue
+        if node != source:
+            sigma[node] += sigma[predecessor]
+        order.append(node)
+        distance[node] = dist
+        for neighbour, weight in adjacency.get(node, {}).items():
+            new_dist = dist + weight
+            if neighbour not in distance and (neighbour not in seen or new_dist < seen[neighbour]):
+                seen[neighbour] = new_dist
+                heapq.heappush(heap, (new_dist, counter, node, neighbour))
+                counter += 1
+                sigma[neighbour] = 0.0
+                predecessors[neighbour] = [node]
+            elif new_dist == seen.get(neighbour):
+                sigma[neighbour] += sigma[node]
+                predecessors[neighbour].append(node)
+    return order, predecessors, sigma, distance
+
+
+def _accumulate(sources, adjacency, weighted):
+    """
+    Run Brandes' dependency accumulation from a chunk of sources.
+    Returns partial betweenness, distance sums and reach counts per node.
+    """
+    betweenness = dict.fromkeys(adjacency, 0.0)
+    distance_sum = dict.fromkeys(adjacency, 0.0)
+    reached = dict.fromkeys(adjacency, 0)
+    for source in sources:
+        order, predecessors, sigma, distance = _single_source(adjacency, source, weighted)
+        delta = dict.fromkeys(order, 0.0)
+        while order:
+            node = order.pop()
+            coefficient = (1.0 + delta[node]) / sigma[node]
+            for predecessor in predecessors[node]:
+                delta[predecessor] += sigma[predecessor] * coefficient
+            if node != source:
+                betweenness[node] += delta[node]
+                distance_sum[node] += distance[node]
+                reached[node] += 1
+    return betweenness, distance_sum, reached
+
+
+def _accumulate_in_worker(args):
+    sources, weighted = args
+    return _accumulate(sources, _worker_adjacency, weighted)
+
+
+def path_centrality(adjacency, sample_size=None, workers=None, weighted=False, normalized=True, seed=None):
+    """
+    Compute betweenness and closeness centrality with Brandes' algorithm.
+
+    adjacency maps every node to a dict of {neighbour: weight} and must be symmetric
+    for undirected graphs. When sample_size is given only that many random sources
+    are expanded and the scores are scaled up (k-source approximation). workers > 1
+    splits the sources across a multiprocessing pool.
+
+    Returns a dict {node: (betweenness, closeness)}.
+    """
+    nodes = list(adjacency)
+    n = len(nodes)
+    if n == 0:
+        return {}
+
+    if sample_size and sample_size < n:
+        sources = random.Random(seed).sample(nodes, sample_size)
+    else:
+        sources = nodes
+    k = len(sources)
+
+    workers = workers or 1
+    if workers > 1 and k > workers:
+        chunks = [(sources[i::workers], weighted) for i in range(workers)]
+        with Pool(processes=workers, initializer=_init_worker, initargs=(adjacency,)) as pool:
+            partials = pool.map(_accumulate_in_worker, chunks)
+    else:
+        partials = [_accumulate(sources, adjacency, weighted)]
+
+    betweenness = dict.fromkeys(nodes, 0.0)
+    distance_sum = dict.fromkeys(nodes, 0.0)
+    reached = dict.fromkeys(nodes, 0)
+    for partial_betweenness, partial_distance, partial_reached in partials:
+        for node in nodes:
+            betweenness[node] += partial_betweenness[node]
+            distance_sum[node] += partial_distance[node]
+            reached[node] += partial_reached[node]
+
+    # Same rescaling as NetworkX for undirected graphs
+    if normalized:
+        scale = 1.0 / ((n - 1) * (n - 2)) if n > 2 else None
+    else:
+        scale = 0.5
+    if scale is not None:
+        scale *= n / k
+
+    sampled = k < n
+    source_set = set(sources)
+    scores = {}
+    for node in nodes:
+        node_betweenness = betweenness[node] * scale if scale is not None else betweenness[node]
+        # Wasserman-Faust closeness; with sampling the reachable share is estimated from the sources
+        candidates = (k - 1 if node in source_set else k) if sampled else n - 1
+        if distance_sum[node] > 0 and candidates > 0:
+            closeness = (reached[node] / distance_sum[node]) * (reached[node] / candidates)
+        else:
+            closeness = 0.0
+        scores[node] = (node_betweenness, closeness)
+    return scores
+
+
+def default_workers():
+    """Use every core but one for the process pool."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def pagerank(adjacency, damping=0.85, iterations=30):
+    """
+    Power-iteration PageRank over an undirected adjacency {node: {neighbour: weight}}.
+    Isolated nodes spread their rank evenly. Returns {node: rank}, summing to 1.
+    """
+    count = len(adjacency)
+    if not count:
+        return {}
+    rank = {node: 1.0 / count for node in adjacency}
+    for _ in range(iterations):
+        dangling = sum(rank[node] for node in adjacency if not adjacency[node])
+        base = (1 - damping + damping * dangling) / count
+        rank = {
+            node: base + damping * sum(rank[other] / len(adjacency[other]) for other in adjacency[node])
+            for node in adjacency
+        }
+    return rank
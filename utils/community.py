@@ -0,0 +1,114 @@
+import random
+
+
+def _degrees(adjacency):
+    return {node: sum(neighbours.values()) for node, neighbours in adjacency.items()}
+
+
+def modularity(adjacency, communities, resolution=1.0):
+    """
+    Modularity of a partition {node: community} over a symmetric weighted adjacency.
+    """
+    degrees = _degrees(adjacency)
+    two_m = sum(degrees.values())
+    if two_m == 0:
+        return 0.0
+    internal = {}
+    totals = {}
+    for node, neighbours in adjacency.items():
+        community = communities[node]
+        totals[community] = totals.get(community, 0.0) + degrees[node]
+        for neighbour, weight in neighbours.items():
+            if communities[neighbour] == community:
+                internal[community] = internal.get(community, 0.0) + weight
+    return sum(
+        internal.get(community, 0.0) / two_m - resolution * (total / two_m) ** 2
+        for community, total in totals.items()
+    )
+
+
+def _local_moves(adjacency, resolution, rng):
+    """
+    Louvain phase one: move single nodes to the neighbouring community with the
+    best modularity gain until no move improves it. Community totals and the
+    node-to-community weights are kept as sparse dicts and updated per move.
+    """
+    degrees = _degrees(adjacency)
+    two_m = sum(degrees.values())
+    community = {node: node for node in adjacency}
+    totals = dict(degrees)
+    nodes = list(adjacency)
+    improved = False
+
+    moved = True
+    while moved:
+        moved = False
+        rng.shuffle(nodes)
+        for node in nodes:
+            current = community[node]
+            node_degree = degrees[node]
+
+            # Sparse row of weights from this node into each neighbouring community
+            links = {}
+            for neighbour, weight in adjacency[node].items():
+                if neighbour != node:
+                    links[community[neighbour]] = links.get(community[neighbour], 0.0) + weight
+
+            totals[current] -= node_degree
+            best = current
+            best_gain = links.get(current, 0.0) - resolution * totals[current] * node_degree / two_m
+            for candidate, weight in links.items():
+                gain = weight - resolution * totals[candidate] * node_degree / two_m
+                if gain > best_gain + 1e-12:
+                    best, best_gain = candidate, gain
+            totals[best] += node_degree
+
+            if best != current:
+                community[node] = best
+                moved = True
+                improved = True
+    return community, improved
+
+
+def _aggregate(adjacency, community):
+    """
+    Louvain phase two: collapse each community into one node, summing edge weights.
+    Internal weight becomes a self loop so degrees are preserved.
+    """
+    aggregated = {}
+    for node, neighbours in adjacency.items():
+        source = community[node]
+        row = aggregated.setdefault(source, {})
+        for neighbour, weight in neighbours.items():
+            target = community[neighbour]
+            row[target] = row.get(target, 0.0) + weight
+    return aggregated
+
+
+def louvain_communities(adjacency, resolution=1.0, seed=None, max_levels=20):
+    """
+    Detect communities with the Louvain method.
+
+    adjacency maps every node to a dict of {neighbour: weight} and must be symmetric.
+    Returns {node: community_id} with ids numbered 0..k-1 from the largest community down.
+    """
+    if not adjacency:
+        return {}
+    if sum(_degrees(adjacency).values()) == 0:
+        return {node: index for index, node in enumerate(adjacency)}
+
+    rng = random.Random(seed)
+    membership = {node: node for node in adjacency}
+    graph = adjacency
+    for _ in range(max_levels):
+        community, improved = _local_moves(graph, resolution, rng)
+        if not improved:
+            break
+        membership = {node: community[group] for node, group in membership.items()}
+        graph = _aggregate(graph, community)
+
+    sizes = {}
+    for group in membership.values():
+        sizes[group] = sizes.get(group, 0) + 1
+    ranking = {group: index for index, group in enumerate(sorted(sizes, key=lambda g: (-sizes[g], str(g))))}
+    return {node: ranking[group] for node, group in membership.items()}
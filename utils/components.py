@@ -0,0 +1,169 @@
+import json
+import os
+
+
+class UnionFind:
+    def __init__(self, items=()):
+        """Disjoint sets with union by size and path halving."""
+        self.parent = {}
+        self.size = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        self.add(a)
+        self.add(b)
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a
+
+
+def strongly_connected_components(adjacency):
+    """
+    Tarjan's algorithm without recursion. `adjacency` maps a node to its successors.
+    Components are returned in reverse topological order: every component comes after
+    all components reachable from it.
+    """
+    index, low = {}, {}
+    stack, on_stack = [], set()
+    components = []
+    counter = 0
+    for root in adjacency:
+        if root in index:
+            continue
+        work = [(root, iter(adjacency.get(root, ())))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(adjacency.get(successor, ()))))
+                    advanced = True
+                    break
+                if successor in on_stack:
+                    low[node] = min(low[node], index[successor])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+class ReachabilityIndex:
+    def __init__(self, component, closure=None):
+        """
+        Constant-time reachability between nodes. `component` maps each node to a
+        component id. Undirected graphs need nothing else; for directed graphs `closure[c]`
+        is an integer bitset of the components reachable from component c.
+        """
+        self.component = component
+        self.closure = closure
+
+    @property
+    def directed(self):
+        return self.closure is not None
+
+    @classmethod
+    def from_edges(cls, nodes, edges, directed=False):
+        """
+        Union-find over undirected edges; for directed ones, SCC condensation with the
+        transitive closure of the condensed DAG accumulated in reverse topological order.
+        """
+        if not directed:
+            sets = UnionFind(nodes)
+            for source, target in edges:
+                sets.union(source, target)
+            roots = {}
+            component = {node: roots.setdefault(sets.find(node), len(roots)) for node in sets.parent}
+            return cls(component)
+
+        adjacency = {node: set() for node in nodes}
+        for source, target in edges:
+            adjacency.setdefault(source, set()).add(target)
+            adjacency.setdefault(target, set())
+        components = strongly_connected_components(adjacency)
+        component = {node: number for number, members in enumerate(components) for node in members}
+        closure = []
+        for number, members in enumerate(components):
+            reach = 1 << number
+            for node in members:
+                for successor in adjacency[node]:
+                    if component[successor] != number:
+                        reach |= closure[component[successor]]
+            closure.append(reach)
+        return cls(component, closure)
+
+    def __contains__(self, node):
+        return node in self.component
+
+    def component_of(self, node):
+        return self.component.get(node)
+
+    def reachable(self, source, target):
+        """True when a path exists; nodes missing from the index are unreachable."""
+        if source not in self.component or target not in self.component:
+            return False
+        a, b = self.component[source], self.component[target]
+        if self.closure is None:
+            return a == b
+        return bool(self.closure[a] >> b & 1)
+
+    def sizes(self):
+        counts = {}
+        for number in self.component.values():
+            counts[number] = counts.get(number, 0) + 1
+        return counts
+
+    # --------------------------------------
+    # Persistence
+    # --------------------------------------
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        closure = None if self.closure is None else [format(reach, "x") for reach in self.closure]
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"component": self.component, "closure": closure}, file)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as file:
+            stored = json.load(file)
+        closure = stored["closure"]
+        return cls(stored["component"], None if closure is None else [int(reach, 16) for reach in closure])
@@ -0,0 +1,200 @@
+import heapq
+import json
+import os
+
+
+class ContractionHierarchy:
+    def __init__(self, rank, upward):
+        """
+        Contraction hierarchy over an undirected weighted graph.
+        `rank` is each node's contraction order; `upward[node]` maps every higher ranked
+        neighbour (original edges and shortcuts) to (weight, middle node or None).
+        """
+        self.rank = rank
+        self.upward = upward
+
+    def __len__(self):
+        return len(self.rank)
+
+    # --------------------------------------
+    # Preprocessing
+    # --------------------------------------
+    @classmethod
+    def build(cls, adjacency, settle_limit=60):
+        """
+        Contract nodes in order of edge difference, contracted neighbours and hierarchy
+        level, re-evaluated lazily. A shortcut u-w through v is added unless a witness search from u (bounded
+        to `settle_limit` settled nodes) finds a path of at most the same cost avoiding v.
+        """
+        graph = {node: {} for node in adjacency}
+        for node, neighbours in adjacency.items():
+            for neighbour, weight in neighbours.items():
+                if neighbour == node:
+                    continue
+                graph.setdefault(neighbour, {})
+                if weight < graph[node].get(neighbour, float("inf")):
+                    graph[node][neighbour] = weight
+                    graph[neighbour][node] = weight
+
+        middle = {}
+        contracted_neighbours = {node: 0 for node in graph}
+        level = {node: 0 for node in graph}
+        rank, upward = {}, {}
+
+        def witness(source, excluded, limit):
+            best = {source: 0.0}
+            heap = [(0.0, source)]
+            settled = 0
+            while heap and settled < settle_limit:
+                cost, node = heapq.heappop(heap)
+                if cost > best.get(node, float("inf")) or cost > limit:
+                    if cost > limit:
+                        break
+                    continue
+                settled += 1
+                for neighbour, weight in graph[node].items():
+                    if neighbour == excluded:
+                        continue
+                    new_cost = cost + weight
+                    if new_cost < best.get(neighbour, float("inf")):
+                        best[neighbour] = new_cost
+                        heapq.heappush(heap, (new_cost, neighbour))
+            return best
+
+        def shortcuts(node):
+            neighbours = list(graph[node].items())
+            needed = []
+            for i, (u, weight_u) in enumerate(neighbours):
+                targets = neighbours[i + 1:]
+                if not targets:
+                    continue
+                limit = weight_u + max(weight for _, weight in targets)
+                reached = witness(u, node, limit)
+                for w, weight_w in targets:
+                    cost = weight_u + weight_w
+                    if reached.get(w, float("inf")) > cost:
+                        needed.append((u, w, cost))
+            return needed
+
+        def priority(node):
+            return 2 * (len(shortcuts(node)) - len(graph[node])) + contracted_neighbours[node] + level[node]
+
+        heap = [(priority(node), node) for node in graph]
+        heapq.heapify(heap)
+        while heap:
+            _, node = heapq.heappop(heap)
+            if node in rank:
+                continue
+            current = priority(node)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, node))
+                continue
+
+            for u, w, cost in shortcuts(node):
+                if cost < graph[u].get(w, float("inf")):
+                    graph[u][w] = graph[w][u] = cost
+                    middle[(u, w) if u < w else (w, u)] = node
+            rank[node] = len(rank)
+            upward[node] = {
+                neighbour: (weight, middle.get((node, neighbour) if node < neighbour else (neighbour, node)))
+                for neighbour, weight in graph[node].items()
+            }
+            for neighbour in graph[node]:
+                del graph[neighbour][node]
+                contracted_neighbours[neighbour] += 1
+                level[neighbour] = max(level[neighbour], level[node] + 1)
+            del graph[node]
+        return cls(rank, upward)
+
+    # --------------------------------------
+    # Queries
+    # --------------------------------------
+    def _search(self, source):
+        return {source: 0.0}, {source: None}, [(0.0, source)]
+
+    def shortest_path(self, source, target):
+        """
+        Bidirectional Dijkstra restricted to upward edges from both ends, then shortcut
+        unpacking. Returns (path, cost) or (None, None).
+        """
+        if source not in self.rank or target not in self.rank:
+            return None, None
+        if source == target:
+            return [source], 0.0
+
+        forward, backward = self._search(source), self._search(target)
+        best, meeting = float("inf"), None
+        while forward[2] or backward[2]:
+            for (distances, parents, heap), (other, _, _) in ((forward, backward), (backward, forward)):
+                if not heap:
+                    continue
+                cost, node = heapq.heappop(heap)
+                if cost > distances.get(node, float("inf")):
+                    continue
+                if node in other and cost + other[node] < best:
+                    best, meeting = cost + other[node], node
+                for neighbour, (weight, _) in self.upward[node].items():
+                    new_cost = cost + weight
+                    if new_cost < distances.get(neighbour, float("inf")):
+                        distances[neighbour] = new_cost
+                        parents[neighbour] = node
+                        heapq.heappush(heap, (new_cost, neighbour))
+            if min(forward[2][0][0] if forward[2] else float("inf"),
+                   backward[2][0][0] if backward[2] else float("inf")) >= best:
+                break
+
+        if meeting is None:
+            return None, None
+        up_path = self._chain(forward[1], meeting)[::-1]
+        down_path = self._chain(backward[1], meeting)
+        hops = up_path + down_path[1:]
+        path = [hops[0]]
+        for a, b in zip(hops, hops[1:]):
+            path.extend(self._unpack(a, b)[1:])
+        return path, best
+
+    @staticmethod
+    def _chain(parents, node):
+        chain = [node]
+        while parents[node] is not None:
+            node = parents[node]
+            chain.append(node)
+        return chain
+
+    def _unpack(self, a, b):
+        """Expand a (possibly shortcut) edge into the original nodes it stands for."""
+        stack, path = [(a, b)], [a]
+        while stack:
+            u, w = stack.pop()
+            lower, higher = (u, w) if self.rank[u] < self.rank[w] else (w, u)
+            mid = self.upward[lower][higher][1]
+            if mid is None:
+                path.append(w)
+            else:
+                stack.append((mid, w))
+                stack.append((u, mid))
+        return path
+
+    # --------------------------------------
+    # Persistence
+    # --------------------------------------
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        edges = [
+            [node, neighbour, weight, mid]
+            for node, neighbours in self.upward.items()
+            for neighbour, (weight, mid) in neighbours.items()
+        ]
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"rank": self.rank, "edges": edges}, file)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as file:
+            stored = json.load(file)
+        upward = {node: {} for node in stored["rank"]}
+        for node, neighbour, weight, mid in stored["edges"]:
+            upward[node][neighbour] = (weight, mid)
+        return cls(stored["rank"], upward)
@@ -1,7 +1,8 @@
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
-import streamlit as st
+
+from utils.facilities import FacilityIndex
+from utils.streaming_stats import StatsReportStore
 
 
 class IrishTransportData:
@@ -90,10 +91,27 @@ class IrishTransportData:
         else:
             print("Dataset not loaded.")
 
+    def streaming_statistics(self, csv_file_path, chunksize=50000, workers=1):
+        """
+        Compute describe/nunique/corr for a CSV in one chunked pass, without loading it.
+        The report is cached under data/stats until the file changes.
+        """
+        store = StatsReportStore(os.path.join(self.PROJECT_ROOT, "data", "stats"), chunksize, workers)
+        report = store.report(csv_file_path)
+        summary = pd.DataFrame(report["columns"]).T
+        print(f"Basic Statistics ({report['rows']} rows):")
+        print(summary)
+        if report["numeric_columns"]:
+            print("\nCorrelation Matrix:")
+            print(pd.DataFrame(report["correlation"]))
+        return report
+
     def plot_weekend_operational(self, data):
         """
         Plot graph for stations operational on weekends.
         """
+        import matplotlib.pyplot as plt
+
         if "Weekend Working" in data.columns:
             counts = data["Weekend Working"].value_counts()
             fig, ax = plt.subplots(figsize=(8, 6))
@@ -108,16 +126,17 @@ class IrishTransportData:
 
     def plot_station_facilities(self, data):
         """
-        Plot graph for stations with specific facilities.
+        Plot graph for stations with specific facilities. Answers are matched
+        case-insensitively, so raw "Yes" values count as well as cleaned "yes" ones.
         """
+        import matplotlib.pyplot as plt
+
         facility_columns = [
             "ATM", "Wi-Fi & Internet Access", "Refreshments",
             "Phone Charging", "Ticket Vending Machine", "Smart Card Enabled"
         ]
-        facility_counts = {}
-        for facility in facility_columns:
-            if facility in data.columns:
-                facility_counts[facility] = data[facility].value_counts().get('yes', 0)
+        counts = FacilityIndex.from_frame(data).column_counts()
+        facility_counts = {facility: counts[facility] for facility in facility_columns if facility in data.columns}
 
         fig, ax = plt.subplots(figsize=(11, 7))
         ax.bar(facility_counts.keys(), facility_counts.values(), color="coral")
@@ -131,6 +150,8 @@ class IrishTransportData:
         """
         Plot graph for most common stations in routes serviced.
         """
+        import matplotlib.pyplot as plt
+
         if "Routes Serviced" in data.columns:
             all_routes = data["Routes Serviced"].str.split(",").explode()
             station_counts = all_routes.value_counts()
@@ -149,6 +170,8 @@ class IrishTransportData:
         """
         Perform correlation analysis between numeric columns.
         """
+        import matplotlib.pyplot as plt
+
         if data is not None:
             numeric_data = data.select_dtypes(include=['number'])
             if not numeric_data.empty:
@@ -169,4 +192,4 @@ class IrishTransportData:
             else:
                 print("No numeric columns found for correlation analysis.")
         else:
-            print("Dataset not loaded.")
\ No newline at end of file
+            print("Dataset not loaded.")
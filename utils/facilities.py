@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Bit assigned to each DART amenity; names follow the Station node properties
+FACILITY_BITS = {
+    "atm": ("ATM", "yes", 0),
+    "wifi": ("Wi-Fi & Internet Access", "yes", 1),
+    "refreshments": ("Refreshments", "yes", 2),
+    "phone_charging": ("Phone Charging", "yes", 3),
+    "ticket_machine": ("Ticket Vending Machine", "yes", 4),
+    "smart_card_enabled": ("Smart Card Enabled", "yes", 5),
+    "weekend_working": ("Weekend Working", "yes", 6),
+    "weekend_limited": ("Weekend Working", "limited", 7),
+}
+
+
+def facility_mask(names):
+    """Combine facility names (keys of FACILITY_BITS) into one bitmask."""
+    mask = 0
+    for name in names:
+        if name not in FACILITY_BITS:
+            raise ValueError(f"Unknown facility '{name}'")
+        mask |= 1 << FACILITY_BITS[name][2]
+    return mask
+
+
+def encode_facilities(df):
+    """
+    Pack the DART amenity columns of a DataFrame into a uint8 array, one bit per
+    facility. Values are compared case-insensitively, so raw and cleaned frames agree.
+    """
+    masks = np.zeros(len(df), dtype=np.uint8)
+    for column, value, bit in FACILITY_BITS.values():
+        if column in df.columns:
+            present = df[column].astype(str).str.strip().str.lower().eq(value).to_numpy()
+            masks |= present.astype(np.uint8) << np.uint8(bit)
+    return masks
+
+
+class FacilityIndex:
+    def __init__(self, names, masks):
+        """Station names aligned with their facility bitmasks."""
+        self.names = np.asarray(names, dtype=object)
+        self.masks = np.asarray(masks, dtype=np.uint8)
+
+    @classmethod
+    def from_frame(cls, df, name_column="StationName"):
+        return cls(df[name_column].to_numpy(), encode_facilities(df))
+
+    def __len__(self):
+        return len(self.names)
+
+    def select(self, required=(), excluded=()):
+        """Boolean array of stations having every `required` and none of the `excluded` facilities."""
+        required, excluded = facility_mask(required), facility_mask(excluded)
+        return ((self.masks & required) == required) & ((self.masks & excluded) == 0)
+
+    def filter(self, required=(), excluded=()):
+        """Names of the stations matching select()."""
+        return self.names[self.select(required, excluded)].tolist()
+
+    def bits(self):
+        """(stations x facilities) 0/1 matrix in FACILITY_BITS order."""
+        return np.unpackbits(self.masks[:, None], axis=1, bitorder="little")[:, :len(FACILITY_BITS)]
+
+    def counts(self):
+        """Number of stations offering each facility."""
+        return dict(zip(FACILITY_BITS, self.bits().sum(axis=0).tolist()))
+
+    def column_counts(self):
+        """Stations answering "Yes" per CSV amenity column, as the dashboard charts label them."""
+        counts = self.counts()
+        return {column: counts[name] for name, (column, value, _) in FACILITY_BITS.items() if value == "yes"}
+
+    def scores(self, weights=None):
+        """Weighted amenity score per station; every facility weighs 1 by default."""
+        vector = np.array([(weights or {}).get(name, 1.0) for name in FACILITY_BITS])
+        return self.bits() @ vector
+
+    def rank(self, centrality=None, required=(), excluded=(), weights=None,
+             facility_weight=1.0, centrality_weight=1.0, top=None):
+        """
+        Rank matching stations by a blend of amenity score and centrality
+        (e.g. degree or betweenness keyed by station name). Both parts are scaled
+        to [0, 1] by their maximum before weighting.
+        """
+        selected = self.select(required, excluded)
+        facility_scores = self.scores(weights)[selected]
+        names = self.names[selected]
+        central = pd.Series(names).map(centrality or {}).fillna(0.0).astype(float).to_numpy()
+
+        def scaled(values):
+            peak = values.max() if len(values) else 0.0
+            return values / peak if peak > 0 else values
+
+        combined = facility_weight * scaled(facility_scores) + centrality_weight * scaled(central)
+        ranking = pd.DataFrame({
+            "Station": names,
+            "Facility Score": facility_scores,
+            "Centrality": central,
+            "Score": combined,
+        }).sort_values(["Score", "Station"], ascending=[False, True], ignore_index=True)
+        return ranking.head(top) if top else ranking
@@ -0,0 +1,13 @@
+import hashlib
+import os
+
+
+def file_fingerprint(path):
+    """Content hash of a file, or a marker when it does not exist."""
+    if not os.path.exists(path):
+        return "missing"
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,181 @@
+from collections import deque
+
+
+class IncrementalPageRank:
+    def __init__(self, damping=0.85, tolerance=1e-9):
+        """
+        PageRank over an undirected graph kept up to date by residual pushing.
+
+        The invariant is rank + residual-propagation = exact PageRank, where the residual of
+        node v is (1 - d)/n + d * (sum of neighbours' rank / their degree) + d * M / n - rank[v]
+        and M is the rank held by isolated nodes (spread evenly, as utils.centrality.pagerank
+        does). An edge change only alters the residuals around its endpoints, so settle()
+        pushes from those nodes instead of iterating over the whole graph. Changes to the
+        uniform terms (node count, isolated mass) accumulate in `uniform` and are folded
+        into every residual only when they grow past the tolerance.
+        """
+        self.damping = damping
+        self.tolerance = tolerance
+        self.neighbours = {}
+        self.rank = {}
+        self.residual = {}
+        self.uniform = 0.0
+        self.isolated_mass = 0.0
+
+    @classmethod
+    def from_edges(cls, nodes, edges, damping=0.85, tolerance=1e-9):
+        """Build from scratch: every node starts with rank 0 and the full teleport residual."""
+        engine = cls(damping, tolerance)
+        engine.add_nodes(nodes)
+        for source, target in edges:
+            engine.add_edge(source, target)
+        engine.settle()
+        return engine
+
+    def _level(self, count, isolated_mass):
+        """The residual every node receives from teleport and isolated nodes."""
+        return ((1 - self.damping) + self.damping * isolated_mass) / count if count else 0.0
+
+    # --------------------------------------
+    # Graph changes
+    # --------------------------------------
+    def add_nodes(self, nodes):
+        new = [node for node in dict.fromkeys(nodes) if node not in self.neighbours]
+        if not new:
+            return
+        count = len(self.neighbours)
+        level = self._level(count + len(new), self.isolated_mass)
+        self.uniform += level - self._level(count, self.isolated_mass)
+        for node in new:
+            self.neighbours[node] = set()
+            self.rank[node] = 0.0
+            # New nodes are isolated with zero rank: their whole residual is the uniform level
+            self.residual[node] = level - self.uniform
+
+    def remove_nodes(self, nodes):
+        for node in [node for node in dict.fromkeys(nodes) if node in self.neighbours]:
+            for neighbour in list(self.neighbours[node]):
+                self.remove_edge(node, neighbour)
+            count = len(self.neighbours)
+            remaining_mass = self.isolated_mass - self.rank[node]
+            self.uniform += self._level(count - 1, remaining_mass) - self._level(count, self.isolated_mass)
+            self.isolated_mass = remaining_mass
+            del self.neighbours[node], self.rank[node], self.residual[node]
+
+    def _retarget(self, node, old, new):
+        """Move `node`'s rank contribution from the old neighbour set to the new one."""
+        share = self.damping * self.rank[node]
+        count = len(self.neighbours)
+        if old:
+            for neighbour in old:
+                self.residual[neighbour] -= share / len(old)
+        else:
+            self.isolated_mass -= self.rank[node]
+            self.uniform -= share / count
+        if new:
+            for neighbour in new:
+                self.residual[neighbour] += share / len(new)
+        else:
+            self.isolated_mass += self.rank[node]
+            self.uniform += share / count
+
+    def add_edge(self, source, target):
+        if source == target or target in self.neighbours[source]:
+            return
+        for node, other in ((source, target), (target, source)):
+            old = self.neighbours[node]
+            self._retarget(node, old, old | {other})
+        self.neighbours[source].add(target)
+        self.neighbours[target].add(source)
+
+    def remove_edge(self, source, target):
+        if target not in self.neighbours.get(source, ()):
+            return
+        for node, other in ((source, target), (target, source)):
+            old = self.neighbours[node]
+            self._retarget(node, old, old - {other})
+        self.neighbours[source].discard(target)
+        self.neighbours[target].discard(source)
+
+    # --------------------------------------
+    # Propagation
+    # --------------------------------------
+    def settle(self):
+        """
+        Push residuals until every one is within tolerance / n.
+        Returns the set of nodes whose rank changed.
+        """
+        count = len(self.neighbours)
+        if not count:
+            return set()
+        threshold = self.tolerance / count
+        changed = set()
+        queue = deque()
+        queued = set()
+
+        def enqueue(node):
+            if node not in queued and abs(self.residual[node]) > threshold:
+                queued.add(node)
+                queue.append(node)
+
+        def flush():
+            for node in self.residual:
+                self.residual[node] += self.uniform
+            self.uniform = 0.0
+            for node in self.residual:
+                enqueue(node)
+
+        if abs(self.uniform) > threshold:
+            flush()
+        else:
+            for node in self.residual:
+                enqueue(node)
+
+        while queue:
+            node = queue.popleft()
+            queued.discard(node)
+            amount = self.residual[node]
+            if abs(amount) <= threshold:
+                continue
+            self.residual[node] = 0.0
+            self.rank[node] += amount
+            changed.add(node)
+            neighbours = self.neighbours[node]
+            if neighbours:
+                share = self.damping * amount / len(neighbours)
+                for neighbour in neighbours:
+                    self.residual[neighbour] += share
+                    enqueue(neighbour)
+            else:
+                self.isolated_mass += amount
+                self.uniform += self.damping * amount / count
+                if abs(self.uniform) > threshold:
+                    flush()
+        return changed
+
+    # --------------------------------------
+    # Persistence
+    # --------------------------------------
+    def to_dict(self):
+        return {
+            "damping": self.damping,
+            "tolerance": self.tolerance,
+            "rank": self.rank,
+            "residual": self.residual,
+            "uniform": self.uniform,
+            "isolated_mass": self.isolated_mass,
+        }
+
+    @classmethod
+    def from_dict(cls, state, edges):
+        """Restore a saved engine; `edges` must be the simple edge set it was saved with."""
+        engine = cls(state["damping"], state["tolerance"])
+        engine.rank = dict(state["rank"])
+        engine.residual = dict(state["residual"])
+        engine.uniform = state["uniform"]
+        engine.isolated_mass = state["isolated_mass"]
+        engine.neighbours = {node: set() for node in engine.rank}
+        for source, target in edges:
+            engine.neighbours[source].add(target)
+            engine.neighbours[target].add(source)
+        return engine
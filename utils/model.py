@@ -0,0 +1,113 @@
+import csv
+import sys
+
+
+def intern_text(value):
+    """Strip and intern a string so repeated values (lines, zones, operators) share one object."""
+    if value is None:
+        return None
+    return sys.intern(value.strip())
+
+
+def intern_list(value, separator=","):
+    """Split a delimited CSV cell into a tuple of interned strings."""
+    return tuple(intern_text(item) for item in (value or "").split(separator) if item.strip())
+
+
+def to_float(value):
+    """Parse a CSV number, allowing thousands separators; None when it is not one."""
+    try:
+        return float(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+class Station:
+    __slots__ = ("station_id", "name", "network", "lines", "zone", "latitude", "longitude", "distance_km", "footfall")
+
+    def __init__(self, station_id, name, network, lines=(), zone=None,
+                 latitude=None, longitude=None, distance_km=None, footfall=None):
+        """A DART or LUAS station; `lines` holds the line or routes serviced."""
+        self.station_id = intern_text(station_id)
+        self.name = intern_text(name)
+        self.network = intern_text(network)
+        self.lines = tuple(lines)
+        self.zone = intern_text(zone)
+        self.latitude = latitude
+        self.longitude = longitude
+        self.distance_km = distance_km
+        self.footfall = footfall
+
+    def __repr__(self):
+        return f"Station({self.network}:{self.name})"
+
+
+class Route:
+    __slots__ = ("route_number", "origin", "destination", "route_type", "operator",
+                 "frequency", "duration", "peak_hours", "landmarks", "areas")
+
+    def __init__(self, route_number, origin, destination, route_type=None, operator=None,
+                 frequency=None, duration=None, peak_hours=None, landmarks=(), areas=()):
+        """A bus route; `areas` keeps the ordered Primary Areas Served."""
+        self.route_number = intern_text(route_number)
+        self.origin = intern_text(origin)
+        self.destination = intern_text(destination)
+        self.route_type = intern_text(route_type)
+        self.operator = intern_text(operator)
+        self.frequency = intern_text(frequency)
+        self.duration = intern_text(duration)
+        self.peak_hours = intern_text(peak_hours)
+        self.landmarks = tuple(landmarks)
+        self.areas = tuple(areas)
+
+    def __repr__(self):
+        return f"Route({self.route_number}: {self.origin} -> {self.destination})"
+
+
+# --------------------------------------
+# Loaders
+# --------------------------------------
+def _rows(csv_file_path):
+    with open(csv_file_path, mode='r', encoding='latin1') as file:
+        yield from csv.DictReader(file)
+
+
+def load_luas_stations(csv_file_path):
+    """Load LUAS stations as compact Station objects."""
+    return [
+        Station(
+            row["Station_ID"], row["Station Name"], "LUAS",
+            lines=(intern_text(row["Line"]),),
+            zone=row["Zone"],
+            latitude=to_float(row["Latitude"]),
+            longitude=to_float(row["Longitude"]),
+            footfall=to_float(row["Daily Footfall"]),
+        )
+        for row in _rows(csv_file_path)
+    ]
+
+
+def route_from_row(row):
+    """Build a Route from a BUS CSV row."""
+    return Route(
+        row["Route Number"], row["From"], row["To"],
+        route_type=row["Route Type"],
+        operator=row["Operator"],
+        frequency=row["Frequency"],
+        duration=row["Duration"],
+        peak_hours=row["Peak Hours"],
+        landmarks=intern_list(row["Key Landmarks"]),
+        areas=intern_list(row["Primary Areas Served"]),
+    )
+
+
+def compact_frame(df, max_unique_ratio=0.5):
+    """
+    Convert repetitive text columns of a DataFrame to pandas categoricals in place,
+    so each distinct value is stored once and rows hold small integer codes.
+    """
+    for column in df.select_dtypes(include=["object", "string"]).columns:
+        values = df[column]
+        if len(values) and values.nunique(dropna=True) / len(values) <= max_unique_ratio:
+            df[column] = values.astype("category")
+    return df
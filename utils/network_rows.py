@@ -0,0 +1,171 @@
+import re
+
+_NUMBER = re.compile(r"(\d+(?:\.\d+)?)")
+
+
+def parse_minutes(text):
+    """Parse '45 mins' into 45.0."""
+    match = _NUMBER.search(text or "")
+    return float(match.group(1)) if match else None
+
+
+def dart_station_properties(row):
+    """Map a DART CSV row to the Station node properties."""
+    return {
+        "name": row["StationName"],
+        "operational": row["Operational"],
+        "location": row["Location"],
+        "address": row["Station Address"],
+        "eircode": row["Eircode"],
+        "atm": row["ATM"],
+        "weekend_working": row["Weekend Working"],
+        "wifi": row["Wi-Fi & Internet Access"],
+        "refreshments": row["Refreshments"],
+        "phone_charging": row["Phone Charging"],
+        "ticket_machine": row["Ticket Vending Machine"],
+        "smart_card_enabled": row["Smart Card Enabled"],
+        "routes_serviced": row["Routes Serviced"],
+    }
+
+
+def dart_row_stream(rows):
+    """
+    Single pass over DART rows: yields ("station", properties) for every row and
+    ("edge", edge) linking it to the previous station of each route it services.
+    Only the last station seen on each route is kept in memory.
+    """
+    last_on_route = {}
+    for row in rows:
+        yield "station", dart_station_properties(row)
+        station_name = row["StationName"]
+        distance = float(row["Distance_km"])
+        for route in [r.strip() for r in row["Routes Serviced"].split(',')]:
+            if route in last_on_route:
+                previous, previous_distance = last_on_route[route]
+                yield "edge", {
+                    "Station1": previous,
+                    "Station2": station_name,
+                    "Route": route,
+                    "Distance": (previous_distance + distance) / 2,  # Average distance
+                }
+            last_on_route[route] = (station_name, distance)
+
+
+def dart_route_edges(rows):
+    """
+    Link consecutive stations on every route serviced.
+    Each edge carries the route name and the average Distance_km of its two stations.
+    """
+    return [edge for kind, edge in dart_row_stream(rows) if kind == "edge"]
+
+
+def luas_station_properties(row):
+    """Map a LUAS CSV row to the Station node properties."""
+    return {
+        "name": row["Station Name"],
+        "Line": row["Line"],
+        "Station_ID": row["Station_ID"],
+        "Location": row["Location"],
+        "Key_Features_Attractions": row["Key Features/Attractions"],
+        "Type": row["Type (Terminus/Regular)"],
+        "Interchange": row["Interchange"],
+        "Zone": row["Zone"],
+        "Daily_Footfall": row["Daily Footfall"],
+        "Facilities": row["Facilities"],
+        "Accessibility": row["Accessibility"],
+        "Latitude": row["Latitude"],
+        "Longitude": row["Longitude"],
+        "Parking_Availability": row["Parking Availability"],
+        "Nearby_Landmarks": row["Nearby Landmarks"],
+        "First_Tram_Time": row["First Tram Time"],
+        "Last_Tram_Time": row["Last Tram Time"],
+    }
+
+
+def luas_row_stream(rows):
+    """
+    Single pass over LUAS rows: yields ("station", properties) for every row and
+    ("edge", edge) linking it to the previous station on its line, in CSV order.
+    Only the last station seen on each line is kept in memory.
+    """
+    last_on_line = {}
+    for row in rows:
+        yield "station", luas_station_properties(row)
+        line = row["Line"]
+        if line in last_on_line:
+            yield "edge", {"Station1": last_on_line[line], "Station2": row["Station Name"], "Line": line}
+        last_on_line[line] = row["Station Name"]
+
+
+def luas_line_edges(rows):
+    """Link consecutive stations on each LUAS line, in CSV order."""
+    return [edge for kind, edge in luas_row_stream(rows) if kind == "edge"]
+
+
+def bus_route_stops(row):
+    """The ordered Primary Areas Served of a route, with consecutive repeats dropped."""
+    stops = []
+    for stop in row["Primary Areas Served"].split(","):
+        stop = stop.strip()
+        if stop and (not stops or stops[-1] != stop):
+            stops.append(stop)
+    return stops
+
+
+def bus_stop_edges(row):
+    """
+    Link consecutive stops of one route, in Primary Areas Served order. Duration is split
+    evenly across the segments, as the timetable does; routes without one get no edges.
+    """
+    stops = bus_route_stops(row)
+    duration = parse_minutes(row["Duration"])
+    if len(stops) < 2 or not duration:
+        return []
+    segment = round(duration / (len(stops) - 1), 1)
+    return [
+        {"source": source, "target": target, "route": row["Route Number"], "duration": segment}
+        for source, target in zip(stops, stops[1:])
+    ]
+
+
+def canonical_route_edges(routes):
+    """
+    Build one undirected edge per related Route pair, keyed so that source < target.
+    Candidate pairs come from inverted indexes on landmarks and termini, so routes
+    that share nothing are never compared.
+    """
+    landmarks, termini, areas = {}, {}, {}
+    by_landmark, by_terminus = {}, {}
+    for route in routes:
+        number = route.route_number
+        landmarks[number] = set(route.landmarks)
+        termini[number] = {t for t in (route.origin, route.destination) if t}
+        areas[number] = set(route.areas)
+        for landmark in landmarks[number]:
+            by_landmark.setdefault(landmark, []).append(number)
+        for terminus in termini[number]:
+            by_terminus.setdefault(terminus, []).append(number)
+
+    pairs = set()
+    for index in (by_landmark, by_terminus):
+        for members in index.values():
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    if members[i] != members[j]:
+                        pairs.add((min(members[i], members[j]), max(members[i], members[j])))
+
+    edges = []
+    for source, target in sorted(pairs):
+        shared_landmarks = len(landmarks[source] & landmarks[target])
+        shared_termini = len(termini[source] & termini[target])
+        union = areas[source] | areas[target]
+        area_overlap = len(areas[source] & areas[target]) / len(union) if union else 0.0
+        edges.append({
+            "source": source,
+            "target": target,
+            "shared_landmarks": shared_landmarks,
+            "shared_termini": shared_termini,
+            "area_overlap": round(area_overlap, 4),
+            "weight": round(shared_landmarks + shared_termini + area_overlap, 4),
+        })
+    return edges
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from utils.centrality import pagerank
+from utils.model import route_from_row, to_float
+from utils.network_rows import dart_route_edges, luas_line_edges, canonical_route_edges
+
+LAYOUT_VERSION = "1"
+# Node attribute each network can be clustered by
+GROUPINGS = {"DART": ["route"], "LUAS": ["line", "zone"], "BUS": ["route_type", "operator"]}
+
+
+def build_network(category, dart_rows=(), luas_rows=(), bus_rows=()):
+    """
+    Build the graph of one transport network as (nodes, edges): nodes maps an id to its
+    attributes (label, grouping attributes and coordinates where known), edges are
+    (source, target, weight) with parallel edges merged by count.
+    """
+    nodes, raw_edges = {}, []
+    if category == "DART":
+        for row in dart_rows:
+            routes = [route.strip() for route in row["Routes Serviced"].split(",") if route.strip()]
+            nodes[row["StationName"]] = {"label": row["StationName"], "route": routes[0] if routes else "Unknown"}
+        raw_edges = [(edge["Station1"], edge["Station2"], 1.0) for edge in dart_route_edges(dart_rows)]
+    elif category == "LUAS":
+        for row in luas_rows:
+            nodes[row["Station Name"]] = {
+                "label": row["Station Name"], "line": row["Line"], "zone": row["Zone"],
+                "latitude": to_float(row["Latitude"]), "longitude": to_float(row["Longitude"]),
+            }
+        raw_edges = [(edge["Station1"], edge["Station2"], 1.0) for edge in luas_line_edges(luas_rows)]
+    elif category == "BUS":
+        for row in bus_rows:
+            nodes[row["Route Number"]] = {
+                "label": f"Route {row['Route Number']}", "route_type": row["Route Type"], "operator": row["Operator"],
+            }
+        raw_edges = [
+            (edge["source"], edge["target"], edge["weight"])
+            for edge in canonical_route_edges([route_from_row(row) for row in bus_rows])
+        ]
+    else:
+        raise ValueError(f"Unknown transport category '{category}'")
+
+    edges = {}
+    for source, target, weight in raw_edges:
+        if source == target:
+            continue
+        key = (source, target) if source < target else (target, source)
+        edges[key] = edges.get(key, 0.0) + weight
+    return nodes, [(source, target, weight) for (source, target), weight in edges.items()]
+
+
+def adjacency_of(nodes, edges):
+    adjacency = {node: {} for node in nodes}
+    for source, target, weight in edges:
+        adjacency.setdefault(source, {})[target] = weight
+        adjacency.setdefault(target, {})[source] = weight
+    return adjacency
+
+
+def force_layout(nodes, edges, iterations=80, seed=0, block=512):
+    """
+    Fruchterman-Reingold layout in numpy, scaled to the unit square. Repulsion is
+    computed in row blocks so memory stays O(block * n) for thousands of nodes.
+    """
+    names = list(nodes)
+    count = len(names)
+    if count == 0:
+        return {}
+    index = {name: i for i, name in enumerate(names)}
+    rng = np.random.default_rng(seed)
+    positions = rng.random((count, 2))
+    sources = np.array([index[s] for s, t, _ in edges if s in index and t in index], dtype=int)
+    targets = np.array([index[t] for s, t, _ in edges if s in index and t in index], dtype=int)
+    k = 1.0 / np.sqrt(count)
+    temperature = 0.1
+
+    for _ in range(iterations):
+        displacement = np.zeros_like(positions)
+        for start in range(0, count, block):
+            delta = positions[start:start + block, None, :] - positions[None, :, :]
+            distance = np.maximum(np.linalg.norm(delta, axis=2), 1e-4)
+            displacement[start:start + block] += (delta * (k * k / distance ** 2)[:, :, None]).sum(axis=1)
+        if len(sources):
+            delta = positions[sources] - positions[targets]
+            distance = np.maximum(np.linalg.norm(delta, axis=1), 1e-4)
+            pull = delta * (distance / k)[:, None]
+            np.add.at(displacement, sources, -pull)
+            np.add.at(displacement, targets, pull)
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 1e-4)
+        positions += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature *= 0.95
+
+    return _normalise({name: positions[i] for name, i in index.items()})
+
+
+def geographic_layout(nodes):
+    """Use station coordinates as positions (longitude east, latitude north)."""
+    located = {
+        name: np.array([attrs["longitude"], -attrs["latitude"]])
+        for name, attrs in nodes.items()
+        if attrs.get("latitude") is not None and attrs.get("longitude") is not None
+    }
+    return _normalise(located) if len(located) == len(nodes) else None
+
+
+def _normalise(positions):
+    if not positions:
+        return {}
+    values = np.array(list(positions.values()), dtype=float)
+    low, span = values.min(axis=0), np.ptp(values, axis=0)
+    span[span == 0] = 1.0
+    return {name: [float(x) for x in (np.asarray(point) - low) / span] for name, point in positions.items()}
+
+
+class LayoutCache:
+    def __init__(self, directory):
+        """
+        Server-side store of precomputed node positions, one JSON file per network,
+        keyed by a hash of the graph so a changed network is laid out again.
+        """
+        self.directory = directory
+
+    @staticmethod
+    def graph_key(nodes, edges):
+        digest = hashlib.sha256(LAYOUT_VERSION.encode("utf-8"))
+        for name in sorted(nodes):
+            digest.update(name.encode("utf-8"))
+        for source, target, weight in sorted(edges):
+            digest.update(f"{source}|{target}|{weight}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def path(self, category):
+        return os.path.join(self.directory, f"{category.lower()}_layout.json")
+
+    def load(self, category, nodes, edges):
+        """Cached positions for this exact graph, or None."""
+        try:
+            with open(self.path(category), "r", encoding="utf-8") as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return stored["positions"] if stored.get("key") == self.graph_key(nodes, edges) else None
+
+    def compute(self, category, nodes, edges, iterations=80):
+        """Lay the network out (geographically when every node has coordinates) and store it."""
+        positions = geographic_layout(nodes) or force_layout(nodes, edges, iterations=iterations)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(category), "w", encoding="utf-8") as file:
+            json.dump({"key": self.graph_key(nodes, edges), "positions": positions}, file)
+        return positions
+
+    def get(self, category, nodes, edges):
+        return self.load(category, nodes, edges) or self.compute(category, nodes, edges)
+
+
+def level_of_detail(nodes, edges, positions, max_nodes=200, metric="degree", group_by=None):
+    """
+    Reduce a network to at most `max_nodes` visible nodes. The highest scoring nodes by
+    `metric` ("degree" or "pagerank") are kept; with `group_by` the rest are collapsed into
+    one cluster node per group at the group's centroid, otherwise they are culled. Edges
+    between the same pair of visible nodes are bundled into one edge carrying their count.
+    Returns (visible nodes, bundled edges).
+    """
+    adjacency = adjacency_of(nodes, edges)
+    if metric == "pagerank":
+        scores = pagerank(adjacency)
+    else:
+        scores = {node: len(neighbours) for node, neighbours in adjacency.items()}
+
+    ranked = sorted(nodes, key=lambda node: (-scores.get(node, 0), node))
+    group_of = lambda node: nodes[node].get(group_by) or "Unknown"
+    budget = max_nodes
+    clusters = 0
+    if group_by and len(ranked) > max_nodes:
+        # At most half of the visible nodes are clusters; the smallest groups share "Other"
+        distinct = len({group_of(node) for node in ranked[max_nodes // 2:]})
+        clusters = max(1, min(distinct, max_nodes // 2))
+        budget = max_nodes - clusters
+    kept = set(ranked[:budget])
+
+    visible, owner = {}, {}
+    for node in kept:
+        visible[node] = dict(nodes[node], x=positions[node][0], y=positions[node][1],
+                             score=scores.get(node, 0), size=1, cluster=False)
+        owner[node] = node
+    if clusters:
+        members = {}
+        for node in ranked[budget:]:
+            members.setdefault(group_of(node), []).append(node)
+        members = sorted(members.items(), key=lambda item: (-len(item[1]), item[0]))
+        if len(members) > clusters:
+            members = members[:clusters - 1] + [("Other", [name for _, names in members[clusters - 1:] for name in names])]
+        for group, names in members:
+            cluster = f"cluster:{group}"
+            centroid = np.mean([positions[name] for name in names], axis=0)
+            visible[cluster] = {
+                "label": f"{group} ({len(names)})", group_by: group,
+                "x": float(centroid[0]), "y": float(centroid[1]),
+                "score": sum(scores.get(name, 0) for name in names), "size": len(names), "cluster": True,
+            }
+            for name in names:
+                owner[name] = cluster
+
+    bundled = {}
+    for source, target, _ in edges:
+        a, b = owner.get(source), owner.get(target)
+        if a is None or b is None or a == b:
+            continue
+        key = (a, b) if a < b else (b, a)
+        bundled[key] = bundled.get(key, 0) + 1
+    return visible, [(a, b, count) for (a, b), count in bundled.items()]
+
+
+def to_pyvis_html(visible, bundled, group_by=None, height="650px", scale=1000):
+    """Render a reduced network with pyvis at its precomputed positions, physics disabled."""
+    from pyvis.network import Network
+
+    net = Network(height=height, width="100%", notebook=False, cdn_resources="remote")
+    net.toggle_physics(False)
+    for node, attrs in visible.items():
+        options = {"group": str(attrs.get(group_by, ""))} if group_by else {}
+        net.add_node(
+            node,
+            label=attrs["label"],
+            title=f"{attrs['label']} (score {attrs['score']:.3g})",
+            x=attrs["x"] * scale,
+            y=attrs["y"] * scale,
+            size=float(10 + 5 * np.log1p(attrs["size"])),
+            shape="diamond" if attrs["cluster"] else "dot",
+            physics=False,
+            **options,
+        )
+    for source, target, count in bundled:
+        net.add_edge(source, target, value=count, title=f"{count} connection(s)")
+    return net.generate_html()
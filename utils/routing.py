@@ -0,0 +1,77 @@
+import heapq
+
+
+def _build_path(parents, node):
+    path = [node]
+    while parents[node] is not None:
+        node = parents[node]
+        path.append(node)
+    return path[::-1]
+
+
+def astar_path(adjacency, start, goal, heuristic=None):
+    """
+    A* search over a weighted adjacency {node: {neighbour: weight}}.
+    With no heuristic this is plain Dijkstra. Returns (path, cost) or (None, None).
+    """
+    if start not in adjacency or goal not in adjacency:
+        return None, None
+    heuristic = heuristic or (lambda node: 0.0)
+
+    best = {start: 0.0}
+    parents = {start: None}
+    heap = [(heuristic(start), 0.0, start)]
+    closed = set()
+    while heap:
+        _, cost, node = heapq.heappop(heap)
+        if node in closed:
+            continue
+        if node == goal:
+            return _build_path(parents, node), cost
+        closed.add(node)
+        for neighbour, weight in adjacency[node].items():
+            new_cost = cost + weight
+            if neighbour not in closed and new_cost < best.get(neighbour, float("inf")):
+                best[neighbour] = new_cost
+                parents[neighbour] = node
+                heapq.heappush(heap, (new_cost + heuristic(neighbour), new_cost, neighbour))
+    return None, None
+
+
+def bidirectional_dijkstra(adjacency, start, goal):
+    """
+    Dijkstra from both ends of an undirected adjacency {node: {neighbour: weight}} at once,
+    always growing the smaller frontier. It stops once the two smallest queued costs add up
+    to the best meeting cost found, so it settles two balls of about half the radius
+    instead of one full one. Returns (path, cost) or (None, None).
+    """
+    if start not in adjacency or goal not in adjacency:
+        return None, None
+    if start == goal:
+        return [start], 0.0
+
+    best = ({start: 0.0}, {goal: 0.0})
+    parents = ({start: None}, {goal: None})
+    heaps = ([(0.0, start)], [(0.0, goal)])
+    closed = (set(), set())
+    shortest, meeting = float("inf"), None
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= shortest:
+            break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        cost, node = heapq.heappop(heaps[side])
+        if node in closed[side]:
+            continue
+        closed[side].add(node)
+        for neighbour, weight in adjacency[node].items():
+            new_cost = cost + weight
+            if new_cost < best[side].get(neighbour, float("inf")):
+                best[side][neighbour] = new_cost
+                parents[side][neighbour] = node
+                heapq.heappush(heaps[side], (new_cost, neighbour))
+                other = best[1 - side].get(neighbour)
+                if other is not None and new_cost + other < shortest:
+                    shortest, meeting = new_cost + other, neighbour
+    if meeting is None:
+        return None, None
+    return _build_path(parents[0], meeting) + _build_path(parents[1], meeting)[-2::-1], shortest
@@ -0,0 +1,130 @@
+import bisect
+import re
+import unicodedata
+
+# Preferred kind when two entries of a network resolve to the same score
+KIND_ORDER = {"station": 0, "stop": 0, "landmark": 1}
+
+
+def normalise_name(text):
+    """Case-fold, strip accents, apostrophes and punctuation and collapse whitespace."""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    text = text.replace("'", "").replace("\u2019", "")
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text).split())
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _split(value):
+    return [part.strip() for part in str(value or "").split(",") if part.strip() and part.strip() != "None"]
+
+
+class NameIndex:
+    def __init__(self):
+        """
+        In-memory search over station, stop and landmark names. Every entry carries the
+        canonical id the graph is keyed by (a landmark resolves to the station near it),
+        so a match can be passed straight to the path queries.
+        """
+        self.entries = []
+        self.postings = {}
+        self.prefixes = []
+
+    @classmethod
+    def from_rows(cls, dart_rows=(), luas_rows=(), bus_rows=()):
+        index = cls()
+        for row in dart_rows:
+            index.add("DART", "station", row["StationName"], row["StationName"])
+        for row in luas_rows:
+            station = row["Station Name"]
+            index.add("LUAS", "station", station, station)
+            for landmark in _split(row.get("Nearby Landmarks")) + _split(row.get("Key Features/Attractions")):
+                index.add("LUAS", "landmark", station, landmark)
+        # BUS stops are the Primary Areas Served, the keys of the stop graph
+        stops = {stop for row in bus_rows for stop in _split(row.get("Primary Areas Served"))}
+        for stop in sorted(stops):
+            index.add("BUS", "stop", stop, stop)
+        index.finish()
+        return index
+
+    def add(self, network, kind, canonical_id, label):
+        key = normalise_name(label)
+        if not key:
+            return
+        number = len(self.entries)
+        grams = trigrams(key)
+        self.entries.append({
+            "network": network, "kind": kind, "id": canonical_id, "label": label, "key": key, "grams": len(grams),
+        })
+        for gram in grams:
+            self.postings.setdefault(gram, []).append(number)
+        # Every word start is a prefix entry point, so "green" finds "St. Stephen's Green"
+        words = key.split(" ")
+        for i in range(len(words)):
+            self.prefixes.append((" ".join(words[i:]), number, i == 0))
+
+    def finish(self):
+        """Sort the prefix list; call after the last add()."""
+        self.prefixes.sort()
+
+    def _prefix_hits(self, query):
+        hits = {}
+        start = bisect.bisect_left(self.prefixes, (query,))
+        for text, number, whole in self.prefixes[start:]:
+            if not text.startswith(query):
+                break
+            hits[number] = hits.get(number, False) or whole
+        return hits
+
+    def search(self, query, network=None, limit=10):
+        """
+        Ranked suggestions for free text: exact matches first, then prefixes of the whole
+        name, then prefixes of a later word, then trigram (Dice) similarity for typos.
+        Returns dicts with id, label, kind, network and score in [0, 1]; one per canonical id.
+        """
+        text = normalise_name(query)
+        if not text:
+            return []
+        scores = {}
+        for number, whole in self._prefix_hits(text).items():
+            key = self.entries[number]["key"]
+            if key == text:
+                scores[number] = 1.0
+            else:
+                scores[number] = (0.9 if whole else 0.8) + 0.05 * len(text) / len(key)
+
+        grams = trigrams(text)
+        shared = {}
+        for gram in grams:
+            for number in self.postings.get(gram, ()):
+                shared[number] = shared.get(number, 0) + 1
+        for number, count in shared.items():
+            if number in scores:
+                continue
+            dice = 2 * count / (len(grams) + self.entries[number]["grams"])
+            scores[number] = 0.75 * dice
+
+        best = {}
+        for number, score in scores.items():
+            entry = self.entries[number]
+            if network and entry["network"] != network:
+                continue
+            rank = (score, -KIND_ORDER.get(entry["kind"], 2))
+            identity = (entry["network"], entry["id"])
+            if identity not in best or rank > best[identity][0]:
+                best[identity] = (rank, entry)
+        ranked = sorted(best.values(), key=lambda item: (-item[0][0], -item[0][1], item[1]["label"]))
+        return [
+            {"id": entry["id"], "label": entry["label"], "kind": entry["kind"],
+             "network": entry["network"], "score": round(rank[0], 4)}
+            for rank, entry in ranked[:limit]
+        ]
+
+    def resolve(self, query, network=None, min_score=0.5):
+        """The canonical id of the best match, or None when nothing is close enough."""
+        matches = self.search(query, network, limit=1)
+        return matches[0]["id"] if matches and matches[0]["score"] >= min_score else None
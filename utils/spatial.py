@@ -0,0 +1,163 @@
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two coordinates in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _to_cartesian(lat, lon):
+    """Project a coordinate onto the unit sphere so straight-line distance follows great-circle order."""
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def _chord_for_km(distance_km):
+    return 2 * math.sin(min(math.pi / 2, distance_km / (2 * EARTH_RADIUS_KM)))
+
+
+class _Node:
+    __slots__ = ("index", "axis", "left", "right")
+
+    def __init__(self, index, axis, left, right):
+        self.index = index
+        self.axis = axis
+        self.left = left
+        self.right = right
+
+
+class SpatialIndex:
+    def __init__(self, points):
+        """
+        Build a KD-tree over (key, latitude, longitude) tuples.
+        Rows with missing or invalid coordinates are skipped.
+        """
+        self.keys = []
+        self.coordinates = []
+        self.vectors = []
+        for key, lat, lon in points:
+            try:
+                lat, lon = float(lat), float(lon)
+            except (TypeError, ValueError):
+                continue
+            self.keys.append(key)
+            self.coordinates.append((lat, lon))
+            self.vectors.append(_to_cartesian(lat, lon))
+        self.positions = {key: index for index, key in enumerate(self.keys)}
+        self.root = self._build(list(range(len(self.keys))), 0)
+
+    @classmethod
+    def from_rows(cls, rows, key_column, lat_column="Latitude", lon_column="Longitude"):
+        """Build an index from CSV row dicts."""
+        return cls((row[key_column], row[lat_column], row[lon_column]) for row in rows)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _build(self, indices, depth):
+        if not indices:
+            return None
+        axis = depth % 3
+        indices.sort(key=lambda i: self.vectors[i][axis])
+        middle = len(indices) // 2
+        return _Node(
+            indices[middle],
+            axis,
+            self._build(indices[:middle], depth + 1),
+            self._build(indices[middle + 1:], depth + 1),
+        )
+
+    @staticmethod
+    def _squared(a, b):
+        return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+    def _distance_km(self, index, lat, lon):
+        station_lat, station_lon = self.coordinates[index]
+        return haversine_km(lat, lon, station_lat, station_lon)
+
+    def nearest(self, lat, lon, n=1):
+        """
+        Return the n closest entries as (key, distance_km), nearest first.
+        """
+        target = _to_cartesian(lat, lon)
+        best = []  # max-heap of (-squared chord, index)
+
+        def visit(node):
+            if node is None:
+                return
+            point = self.vectors[node.index]
+            squared = self._squared(point, target)
+            if len(best) < n:
+                heapq.heappush(best, (-squared, node.index))
+            elif squared < -best[0][0]:
+                heapq.heapreplace(best, (-squared, node.index))
+            diff = target[node.axis] - point[node.axis]
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            visit(near)
+            if len(best) < n or diff * diff < -best[0][0]:
+                visit(far)
+
+        if n > 0:
+            visit(self.root)
+        ordered = sorted(best, key=lambda item: -item[0])
+        return [(self.keys[index], self._distance_km(index, lat, lon)) for _, index in ordered]
+
+    def within_radius(self, lat, lon, radius_km):
+        """
+        Return every entry within radius_km as (key, distance_km), nearest first.
+        """
+        target = _to_cartesian(lat, lon)
+        limit = _chord_for_km(radius_km) ** 2
+        found = []
+
+        def visit(node):
+            if node is None:
+                return
+            point = self.vectors[node.index]
+            if self._squared(point, target) <= limit:
+                found.append(node.index)
+            diff = target[node.axis] - point[node.axis]
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            visit(near)
+            if diff * diff <= limit:
+                visit(far)
+
+        visit(self.root)
+        results = [(self.keys[index], self._distance_km(index, lat, lon)) for index in found]
+        return sorted(results, key=lambda item: item[1])
+
+    def pairs_within(self, radius_km):
+        """
+        Return every unordered pair of entries closer than radius_km as (key1, key2, distance_km).
+        """
+        pairs = []
+        for index, (lat, lon) in enumerate(self.coordinates):
+            for key, distance in self.within_radius(lat, lon, radius_km):
+                other = self.positions[key]
+                if other > index:
+                    pairs.append((self.keys[index], key, distance))
+        return pairs
+
+    def heuristic(self, goal):
+        """
+        Straight-line distance to `goal`, usable as an admissible A* heuristic
+        when edge weights are at least the great-circle distance.
+        """
+        if goal not in self.positions:
+            return lambda key: 0.0
+        goal_lat, goal_lon = self.coordinates[self.positions[goal]]
+
+        def estimate(key):
+            position = self.positions.get(key)
+            if position is None:
+                return 0.0
+            return self._distance_km(position, goal_lat, goal_lon)
+
+        return estimate
@@ -0,0 +1,339 @@
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.fingerprint import file_fingerprint
+
+STATS_VERSION = "1"
+
+
+class Moments:
+    def __init__(self):
+        """Count, mean, sum of squared deviations (Welford/Chan), min and max."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add_array(self, values):
+        """Fold in a block of finite values at once."""
+        if not len(values):
+            return
+        block = Moments()
+        block.count = len(values)
+        block.mean = float(values.mean())
+        block.m2 = float(((values - block.mean) ** 2).sum())
+        block.minimum = float(values.min())
+        block.maximum = float(values.max())
+        self.merge(block)
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    @property
+    def std(self):
+        """Sample standard deviation, as pandas.describe reports it."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+
+class HyperLogLog:
+    def __init__(self, precision=14, exact_limit=4096):
+        """
+        Approximate distinct count in 2**precision one-byte registers (about 0.8% standard
+        error at the default). Merging is a register-wise max, so partial sketches from
+        different chunks or processes combine exactly. Up to `exact_limit` distinct values
+        are also kept as a set, so small columns are counted exactly.
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.exact_limit = exact_limit
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+        self.exact = set()
+
+    def _trim(self):
+        if self.exact is not None and len(self.exact) > self.exact_limit:
+            self.exact = None
+
+    def add_series(self, values):
+        if not len(values):
+            return
+        if self.exact is not None:
+            self.exact.update(pd.unique(values.astype(str).to_numpy(dtype=object)))
+            self._trim()
+        hashes = pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy(dtype=np.uint64)
+        width = 64 - self.precision
+        buckets = (hashes >> np.uint64(width)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << width) - 1)
+        # frexp gives the exact bit length of integers below 2**53
+        _, bit_length = np.frexp(remainder.astype(np.float64))
+        ranks = (width - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        if self.exact is not None and other.exact is not None:
+            self.exact |= other.exact
+            self._trim()
+        else:
+            self.exact = None
+        return self
+
+    def count(self):
+        if self.exact is not None:
+            return len(self.exact)
+        size = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+
+class TopValues:
+    def __init__(self, capacity=32):
+        """Space-saving heavy hitters: the most frequent values with (over-)estimated counts."""
+        self.capacity = capacity
+        self.counts = {}
+
+    def add_series(self, values):
+        """
+        Fold in every value count of a chunk, most frequent first. Truncating to the chunk's
+        top values would lose a value that is frequent overall but never locally in the top.
+        """
+        self.add_counts(values.value_counts().to_dict())
+
+    def add_counts(self, counts):
+        for value, count in counts.items():
+            if value in self.counts:
+                self.counts[value] += count
+            elif len(self.counts) < self.capacity:
+                self.counts[value] = count
+            else:
+                smallest = min(self.counts, key=self.counts.get)
+                self.counts[value] = self.counts.pop(smallest) + count
+
+    def merge(self, other):
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        if len(self.counts) > self.capacity:
+            kept = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:self.capacity]
+            self.counts = dict(kept)
+        return self
+
+    def top(self):
+        return max(self.counts.items(), key=lambda item: item[1]) if self.counts else (None, 0)
+
+
+class CoMoments:
+    def __init__(self, columns):
+        """
+        Online pairwise co-moments: for every column pair, over the rows where both are
+        numeric, the count, means, squared deviations and cross deviations. This gives the
+        same pairwise-complete correlations as DataFrame.corr().
+        """
+        size = len(columns)
+        self.columns = list(columns)
+        self.count = np.zeros((size, size))
+        self.mean_x = np.zeros((size, size))
+        self.mean_y = np.zeros((size, size))
+        self.m2_x = np.zeros((size, size))
+        self.m2_y = np.zeros((size, size))
+        self.cross = np.zeros((size, size))
+
+    def add_block(self, matrix):
+        """`matrix` is rows x columns of floats with NaN for missing or non-numeric cells."""
+        block = CoMoments(self.columns)
+        present = ~np.isnan(matrix)
+        for i in range(len(self.columns)):
+            if not present[:, i].any():
+                continue
+            for j in range(i, len(self.columns)):
+                both = present[:, i] & present[:, j]
+                count = int(both.sum())
+                if not count:
+                    continue
+                x, y = matrix[both, i], matrix[both, j]
+                mean_x, mean_y = x.mean(), y.mean()
+                block.count[i, j] = count
+                block.mean_x[i, j], block.mean_y[i, j] = mean_x, mean_y
+                block.m2_x[i, j] = ((x - mean_x) ** 2).sum()
+                block.m2_y[i, j] = ((y - mean_y) ** 2).sum()
+                block.cross[i, j] = ((x - mean_x) * (y - mean_y)).sum()
+        self.merge(block)
+
+    def merge(self, other):
+        total = self.count + other.count
+        safe = np.where(total > 0, total, 1)
+        delta_x = other.mean_x - self.mean_x
+        delta_y = other.mean_y - self.mean_y
+        weight = self.count * other.count / safe
+        self.m2_x += other.m2_x + delta_x * delta_x * weight
+        self.m2_y += other.m2_y + delta_y * delta_y * weight
+        self.cross += other.cross + delta_x * delta_y * weight
+        self.mean_x += delta_x * other.count / safe
+        self.mean_y += delta_y * other.count / safe
+        self.count = total
+        return self
+
+    def correlation(self, columns):
+        """Correlation matrix {column: {column: r}} restricted to `columns`."""
+        index = {name: i for i, name in enumerate(self.columns)}
+        result = {}
+        for a in columns:
+            result[a] = {}
+            for b in columns:
+                i, j = sorted((index[a], index[b]))
+                denominator = math.sqrt(self.m2_x[i, j] * self.m2_y[i, j])
+                if self.count[i, j] < 2 or not denominator:
+                    result[a][b] = None
+                else:
+                    result[a][b] = float(self.cross[i, j] / denominator)
+        return result
+
+
+class DatasetProfile:
+    def __init__(self, columns):
+        """Mergeable summary of a table read as strings, one chunk at a time."""
+        self.columns = list(columns)
+        self.rows = 0
+        self.present = {name: 0 for name in self.columns}
+        self.non_numeric = {name: 0 for name in self.columns}
+        self.moments = {name: Moments() for name in self.columns}
+        self.distinct = {name: HyperLogLog() for name in self.columns}
+        self.top = {name: TopValues() for name in self.columns}
+        self.comoments = CoMoments(self.columns)
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        numeric = np.full((len(chunk), len(self.columns)), np.nan)
+        for i, name in enumerate(self.columns):
+            column = chunk[name].to_numpy(dtype=object)
+            present = ~pd.isna(column)
+            values = pd.Series(column[present], dtype=object)
+            parsed = pd.to_numeric(pd.Series(column, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+            self.present[name] += len(values)
+            self.non_numeric[name] += int((present & np.isnan(parsed)).sum())
+            self.moments[name].add_array(parsed[np.isfinite(parsed)])
+            numeric[:, i] = parsed
+            self.distinct[name].add_series(values)
+            self.top[name].add_series(values)
+        self.comoments.add_block(numeric)
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        for name in self.columns:
+            self.present[name] += other.present[name]
+            self.non_numeric[name] += other.non_numeric[name]
+            self.moments[name].merge(other.moments[name])
+            self.distinct[name].merge(other.distinct[name])
+            self.top[name].merge(other.top[name])
+        self.comoments.merge(other.comoments)
+        return self
+
+    def numeric_columns(self):
+        """Columns where every present value parsed as a number."""
+        return [name for name in self.columns if self.present[name] and not self.non_numeric[name]]
+
+    def report(self):
+        numeric = self.numeric_columns()
+        columns = {}
+        for name in self.columns:
+            top, freq = self.top[name].top()
+            entry = {
+                "count": self.present[name],
+                "missing": self.rows - self.present[name],
+                "distinct": min(self.distinct[name].count(), self.present[name]),
+                "top": top,
+                "freq": freq,
+            }
+            if name in numeric:
+                moments = self.moments[name]
+                entry.update(mean=moments.mean, std=None if math.isnan(moments.std) else moments.std,
+                             min=moments.minimum, max=moments.maximum)
+            columns[name] = entry
+        return {
+            "rows": self.rows,
+            "columns": columns,
+            "numeric_columns": numeric,
+            "correlation": self.comoments.correlation(numeric),
+        }
+
+
+def _profile_chunk(chunk):
+    return DatasetProfile(chunk.columns).update(chunk)
+
+
+def profile_csv(csv_file_path, chunksize=50000, workers=1, encoding="latin1"):
+    """
+    Profile a CSV in one chunked pass with bounded memory. Chunks are read as strings;
+    with `workers` > 1 they are summarised in worker processes (at most two chunks in
+    flight per worker) and the partial profiles merged as they finish. A column's top and
+    freq are exact while it has at most TopValues.capacity distinct values; beyond that
+    they are a space-saving estimate and freq may be overstated.
+    """
+    reader = pd.read_csv(csv_file_path, chunksize=chunksize, encoding=encoding, dtype=str)
+    profile = None
+    if workers <= 1:
+        for chunk in reader:
+            profile = _profile_chunk(chunk) if profile is None else profile.merge(_profile_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            running = set()
+            for chunk in reader:
+                if len(running) >= 2 * workers:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        profile = future.result() if profile is None else profile.merge(future.result())
+                running.add(pool.submit(_profile_chunk, chunk))
+            for future in running:
+                profile = future.result() if profile is None else profile.merge(future.result())
+    if profile is None:
+        profile = DatasetProfile(pd.read_csv(csv_file_path, nrows=0, encoding=encoding).columns)
+    return profile.report()
+
+
+class StatsReportStore:
+    def __init__(self, directory, chunksize=50000, workers=1):
+        """
+        Cache of profile_csv reports, one JSON artefact per dataset, rebuilt only when the
+        CSV content (or STATS_VERSION) changes.
+        """
+        self.directory = directory
+        self.chunksize = chunksize
+        self.workers = workers
+
+    def path(self, csv_file_path):
+        name = os.path.splitext(os.path.basename(csv_file_path))[0]
+        return os.path.join(self.directory, f"{name.lower()}_stats.json")
+
+    def report(self, csv_file_path):
+        fingerprint = [STATS_VERSION, file_fingerprint(csv_file_path)]
+        try:
+            with open(self.path(csv_file_path), "r", encoding="utf-8") as file:
+                stored = json.load(file)
+            if stored.get("fingerprint") == fingerprint:
+                return stored["report"]
+        except (OSError, ValueError):
+            pass
+        report = profile_csv(csv_file_path, self.chunksize, self.workers)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(csv_file_path), "w", encoding="utf-8") as file:
+            json.dump({"fingerprint": fingerprint, "report": report}, file, indent=2)
+        return report
@@ -0,0 +1,267 @@
+import heapq
+import math
+import re
+
+from utils.network_rows import bus_route_stops, parse_minutes
+from utils.spatial import haversine_km
+
+MINUTES_PER_DAY = 24 * 60
+
+# Assumptions for values the datasets do not carry
+LUAS_HEADWAYS = {"peak": 5, "off-peak": 10}
+LUAS_PEAK_WINDOWS = [(7 * 60, 9 * 60 + 30), (16 * 60 + 30, 19 * 60)]
+LUAS_SPEED_KMH = 20.0
+BUS_SERVICE_HOURS = (6 * 60, 23 * 60 + 30)
+BUS_OFF_PEAK_FACTOR = 2
+
+_CLOCK = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*([ap]\.?m\.?)?", re.IGNORECASE)
+
+
+def parse_clock(text):
+    """Parse '5:30 am', '7:00 AM' or '17:45' into minutes after midnight."""
+    match = _CLOCK.search(text or "")
+    if not match:
+        return None
+    hours, minutes, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+    if meridiem:
+        hours = hours % 12 + (12 if meridiem.lower().startswith("p") else 0)
+    return hours * 60 + minutes
+
+
+def parse_window(text):
+    """Parse '7:00 AM - 9:00 AM' into (start, end) minutes; windows past midnight end after 1440."""
+    parts = (text or "").split("-")
+    if len(parts) != 2:
+        return None
+    start, end = parse_clock(parts[0]), parse_clock(parts[1])
+    if start is None or end is None:
+        return None
+    if end <= start:
+        end += MINUTES_PER_DAY
+    return start, end
+
+
+def parse_frequency(text):
+    """Parse 'Every 10 mins (peak)' into (10.0, 'peak')."""
+    headway = parse_minutes(text)
+    label = re.search(r"\(([^)]+)\)", text or "")
+    return headway, (label.group(1).strip().lower() if label else "all-day")
+
+
+def format_clock(minutes):
+    """Format minutes after midnight as HH:MM, wrapping past midnight."""
+    minutes = int(round(minutes)) % MINUTES_PER_DAY
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class Headways:
+    __slots__ = ("off_peak", "peak", "peak_windows")
+
+    def __init__(self, off_peak, peak, peak_windows):
+        """Headway in minutes outside and inside the peak windows."""
+        self.off_peak = off_peak
+        self.peak = peak
+        self.peak_windows = peak_windows
+
+    def at(self, time):
+        for start, end in self.peak_windows:
+            if start <= time < end or start <= time + MINUTES_PER_DAY < end:
+                return self.peak
+        return self.off_peak
+
+
+class ServiceEdge:
+    __slots__ = ("target", "route", "travel", "first", "last", "headways")
+
+    def __init__(self, target, route, travel, first, last, headways):
+        """
+        One scheduled hop: vehicles of `route` leave between `first` and `last`
+        (minutes after midnight) at the given headways and take `travel` minutes.
+        """
+        self.target = target
+        self.route = route
+        self.travel = travel
+        self.first = first
+        self.last = last
+        self.headways = headways
+
+    def next_departure(self, time):
+        """
+        Earliest departure at or after `time`, or None once service has ended. Windows
+        that cross midnight end after MINUTES_PER_DAY, so a time before `first` that still
+        falls inside the previous evening's service is answered from that service.
+        """
+        if time < self.first and time + MINUTES_PER_DAY <= self.last:
+            departure = self.next_departure(time + MINUTES_PER_DAY)
+            if departure is not None:
+                return departure - MINUTES_PER_DAY
+            return self.first
+        if time <= self.first:
+            return self.first
+        if time > self.last:
+            return None
+        headway = self.headways.at(time)
+        departure = self.first + math.ceil((time - self.first) / headway) * headway
+        return departure if departure <= self.last else None
+
+
+class TimetableModel:
+    def __init__(self):
+        """Compact service graph: stop -> list of ServiceEdge."""
+        self.edges = {}
+
+    def add_edge(self, source, edge):
+        self.edges.setdefault(source, []).append(edge)
+        self.edges.setdefault(edge.target, [])
+
+    @property
+    def stops(self):
+        return list(self.edges)
+
+    # --------------------------------------
+    # Builders
+    # --------------------------------------
+    @classmethod
+    def from_luas_rows(cls, rows):
+        """
+        Build LUAS service edges from the station rows, in line order. Each edge
+        runs between the departing station's First and Last Tram Time; travel time
+        is the straight-line distance at LUAS_SPEED_KMH.
+        """
+        model = cls()
+        lines = {}
+        for row in rows:
+            lines.setdefault(row["Line"], []).append(row)
+
+        headways = Headways(LUAS_HEADWAYS["off-peak"], LUAS_HEADWAYS["peak"], LUAS_PEAK_WINDOWS)
+        for line, stations in lines.items():
+            for direction in (stations, stations[::-1]):
+                route = f"{line} to {direction[-1]['Station Name']}"
+                for current, following in zip(direction, direction[1:]):
+                    first = parse_clock(current["First Tram Time"])
+                    last = parse_clock(current["Last Tram Time"])
+                    if first is None or last is None:
+                        continue
+                    if last <= first:
+                        last += MINUTES_PER_DAY
+                    try:
+                        distance = haversine_km(
+                            float(current["Latitude"]), float(current["Longitude"]),
+                            float(following["Latitude"]), float(following["Longitude"]),
+                        )
+                    except (TypeError, ValueError):
+                        distance = 1.0
+                    travel = max(1.0, round(distance / LUAS_SPEED_KMH * 60, 1))
+                    model.add_edge(
+                        current["Station Name"],
+                        ServiceEdge(following["Station Name"], route, travel, first, last, headways),
+                    )
+        return model
+
+    @classmethod
+    def from_bus_rows(cls, rows):
+        """
+        Build BUS service edges along each route's ordered Primary Areas Served.
+        Duration is split evenly across the stops and the quoted Frequency applies to
+        its labelled period; night routes run only inside their Peak Hours window.
+        """
+        model = cls()
+        for row in rows:
+            stops = bus_route_stops(row)
+            duration = parse_minutes(row["Duration"])
+            headway, period = parse_frequency(row["Frequency"])
+            window = parse_window(row["Peak Hours"])
+            if len(stops) < 2 or not duration or not headway:
+                continue
+
+            peak_windows = [window] if window else []
+            if period == "night" and window:
+                service_start, service_end = window
+                headways = Headways(headway, headway, [])
+            else:
+                service_start, service_end = BUS_SERVICE_HOURS
+                if period == "peak":
+                    headways = Headways(headway * BUS_OFF_PEAK_FACTOR, headway, peak_windows)
+                else:
+                    headways = Headways(headway, headway, peak_windows)
+
+            segment = round(duration / (len(stops) - 1), 1)
+            for direction in (stops, stops[::-1]):
+                route = f"{row['Route Number']} to {direction[-1]}"
+                for position, (current, following) in enumerate(zip(direction, direction[1:])):
+                    offset = position * segment
+                    model.add_edge(
+                        current,
+                        ServiceEdge(following, route, segment, service_start + offset, service_end + offset, headways),
+                    )
+        return model
+
+    # --------------------------------------
+    # Queries
+    # --------------------------------------
+    def earliest_arrival(self, origin, destination, departure, transfer_minutes=2):
+        """
+        Time-dependent Dijkstra from `origin` leaving at `departure` (minutes after midnight).
+        Staying on the same route needs no wait; boarding or changing waits for the next
+        departure plus transfer_minutes when changing. Returns a journey dict or None.
+        """
+        if origin not in self.edges or destination not in self.edges:
+            return None
+
+        start = (origin, None)
+        best = {start: departure}
+        parents = {start: None}
+        heap = [(departure, 0, origin, None)]
+        counter = 1
+        while heap:
+            time, _, stop, route = heapq.heappop(heap)
+            if time > best.get((stop, route), float("inf")):
+                continue
+            if stop == destination:
+                return self._journey((stop, route), parents, departure, time)
+            for edge in self.edges[stop]:
+                if edge.route == route:
+                    board = time
+                else:
+                    ready = time + (transfer_minutes if route is not None else 0)
+                    board = edge.next_departure(ready)
+                    if board is None:
+                        continue
+                arrival = board + edge.travel
+                state = (edge.target, edge.route)
+                if arrival < best.get(state, float("inf")):
+                    best[state] = arrival
+                    parents[state] = ((stop, route), board, arrival)
+                    heapq.heappush(heap, (arrival, counter, edge.target, edge.route))
+                    counter += 1
+        return None
+
+    @staticmethod
+    def _journey(state, parents, departure, arrival):
+        """Rebuild the stop sequence and per-route legs of a journey."""
+        hops = []
+        while parents[state] is not None:
+            previous, board, hop_arrival = parents[state]
+            hops.append((previous[0], state[0], state[1], board, hop_arrival))
+            state = previous
+        hops.reverse()
+
+        legs = []
+        for source, target, route, board, hop_arrival in hops:
+            if legs and legs[-1]["route"] == route:
+                legs[-1]["to"] = target
+                legs[-1]["stops"].append(target)
+                legs[-1]["arrive"] = format_clock(hop_arrival)
+            else:
+                legs.append({
+                    "route": route, "from": source, "to": target, "stops": [source, target],
+                    "depart": format_clock(board), "arrive": format_clock(hop_arrival),
+                })
+        path = [hops[0][0]] + [hop[1] for hop in hops] if hops else [state[0]]
+        return {
+            "path": path,
+            "legs": legs,
+            "departure": format_clock(departure),
+            "arrival": format_clock(arrival),
+            "duration": round(arrival - departure, 1),
+        }
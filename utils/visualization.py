@@ -4,12 +4,15 @@ import streamlit as st
 import seaborn as sns
 import networkx as nx
 from pyvis.network import Network
+from utils.facilities import FacilityIndex
 
 class TransportVisualization:
-    def __init__(self, bus_data, dart_data, luas_data):
+    def __init__(self, bus_data, dart_data, luas_data, aggregates=None):
+        """`aggregates` comes from utils.aggregates; charts that have one skip the pandas groupby."""
         self.bus_data = bus_data
         self.dart_data = dart_data
         self.luas_data = luas_data
+        self.aggregates = aggregates
 
     # --------------------------------------
     # Visualizations for BUS_Dataset
@@ -77,7 +80,11 @@ class TransportVisualization:
             "ATM", "Wi-Fi & Internet Access", "Refreshments",
             "Phone Charging", "Ticket Vending Machine", "Smart Card Enabled"
         ]
-        facilities_count = {col: self.dart_data[col].value_counts().get("Yes", 0) for col in facility_columns}
+        if self.aggregates:
+            facilities_count = self.aggregates["dart_facilities"]
+        else:
+            facilities_count = FacilityIndex.from_frame(self.dart_data).column_counts()
+        facilities_count = {col: facilities_count[col] for col in facility_columns}
 
         fig, ax = plt.subplots(figsize=(10, 6))
         ax.bar(facilities_count.keys(), facilities_count.values(), color="green")
@@ -92,8 +99,13 @@ class TransportVisualization:
         Pie chart: Weekend Working Stations
         Dataset: DART_Dataset
         """
-        if "Weekend Working" in self.dart_data.columns:
+        if self.aggregates:
+            weekend_counts = pd.Series(self.aggregates["dart_weekend"])
+        elif "Weekend Working" in self.dart_data.columns:
             weekend_counts = self.dart_data["Weekend Working"].value_counts()
+        else:
+            weekend_counts = None
+        if weekend_counts is not None:
             fig, ax = plt.subplots(figsize=(8, 6))
             ax.pie(weekend_counts, labels=weekend_counts.index, autopct='%1.1f%%', colors=["skyblue", "coral"])
             ax.set_title("Weekend Working Stations", fontsize=14)
@@ -131,9 +143,11 @@ class TransportVisualization:
             "Phone Charging", "Ticket Vending Machine", "Smart Card Enabled"
         ]
 
-        facilities_count = {
-            col: self.dart_data[col].value_counts().get("Yes", 0) for col in facility_columns
-        }
+        if self.aggregates:
+            facilities_count = self.aggregates["dart_facilities"]
+        else:
+            facilities_count = FacilityIndex.from_frame(self.dart_data).column_counts()
+        facilities_count = {col: facilities_count[col] for col in facility_columns}
         if facilities_count:
             import plotly.express as px
             treemap_data = pd.DataFrame(list(facilities_count.items()), columns=["Facility", "Count"])
@@ -149,10 +163,14 @@ class TransportVisualization:
         Bar chart: Footfall by Line
         Dataset: LUAS_Dataset
         """
-        if "Line" in self.luas_data.columns and "Daily Footfall" in self.luas_data.columns:
+        if self.aggregates:
+            footfall = pd.Series({line: values["total_footfall"] for line, values in self.aggregates["luas_lines"].items()})
+        elif "Line" in self.luas_data.columns and "Daily Footfall" in self.luas_data.columns:
             self.luas_data["Daily Footfall"] = self.luas_data["Daily Footfall"].str.replace(",", "").astype(float)
             footfall = self.luas_data.groupby("Line")["Daily Footfall"].sum()
-
+        else:
+            footfall = None
+        if footfall is not None:
             fig, ax = plt.subplots(figsize=(10, 6))
             footfall.plot(kind="bar", color="gold", ax=ax)
             ax.set_title("Footfall by Line", fontsize=14)
@@ -240,10 +258,14 @@ class TransportVisualization:
         Bar chart: LUAS Station Name grouped by Zone
         Dataset: LUAS_Dataset
         """
-        if "Station Name" in self.luas_data.columns and "Zone" in self.luas_data.columns:
+        if self.aggregates:
+            zone_station_counts = pd.Series(self.aggregates["luas_zones"], name="Station Name").rename_axis("Zone")
+        elif "Station Name" in self.luas_data.columns and "Zone" in self.luas_data.columns:
             # Group data by Zone
             zone_station_counts = self.luas_data.groupby("Zone")["Station Name"].count().sort_values(ascending=False)
-
+        else:
+            zone_station_counts = None
+        if zone_station_counts is not None:
             # Create the plot
             fig, ax = plt.subplots(figsize=(12, 6))
             zone_station_counts.plot(kind="bar", color="purple", ax=ax)
@@ -267,7 +289,7 @@ class TransportVisualization:
         if "Accessibility" in self.luas_data.columns and "Zone" in self.luas_data.columns:
             import plotly.express as px
             fig = px.sunburst(
-                self.luas_data,
+                self.luas_data.astype({"Zone": str, "Accessibility": str}),
                 path=["Zone", "Accessibility"],
                 title="Accessibility Distribution by Zone",
                 color="Zone",